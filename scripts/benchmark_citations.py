@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Citation Extraction Benchmark for Herd AI
+
+Builds a large synthetic corpus of prose mixed with APA, MLA, Chicago and
+IEEE in-text citations, reference entries and DOIs, then times the previous
+extractor (one re.findall pass per style, reproduced below) against the
+single-pass scanner in herd_ai.citations, both on the whole text and fed in
+streamed chunks. Checks that all three produce the same citations.
+
+Usage:
+    python scripts/benchmark_citations.py [--megabytes N] [--density D] [--chunk-kb K] [--styles apa,mla,...]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from herd_ai.citations import extract_citations_from_chunks, extract_citations_from_text
+
+SURNAMES = ["Smith", "Garcia", "Nguyen", "Okafor", "Lindqvist", "Brown", "Tanaka", "Rossi", "Kowalski", "Haddad"]
+WORDS = ("the of and to in results suggest that model data analysis shows significant effect across "
+         "samples were measured using standard methods while prior work has argued otherwise").split()
+
+def legacy_extract(text, styles=None):
+    """The previous extract_citations_from_text: a separate findall pass per style."""
+    if styles is None:
+        styles = ['apa']
+    citations = []
+    if 'apa' in styles:
+        for citation in re.findall(r'\(([A-Za-z]+(?:[ ,&]+[A-Za-z]+)*,? \d{4}[a-z]?(?:, p\. \d+)?)+\)', text):
+            parts = citation.split(',')
+            if len(parts) >= 2:
+                year_match = re.search(r'(\d{4})', parts[1])
+                citations.append({"type": "in-text", "style": "apa", "authors": parts[0].strip(),
+                                  "year": year_match.group(1) if year_match else "", "raw": citation})
+    if 'mla' in styles:
+        for citation in re.findall(r'\([A-Za-z\-]+(?:\s+(?:and|&)\s+[A-Za-z\-]+)*\s+\d+(?:-\d+)?\)', text):
+            citations.append({"type": "in-text", "style": "mla", "raw": citation})
+    if 'chicago' in styles:
+        for citation in re.findall(r'\([A-Za-z\-]+\s+\d{4},\s*\d+(?:-\d+)?\)', text):
+            citations.append({"type": "in-text", "style": "chicago", "raw": citation})
+    if 'ieee' in styles or 'vancouver' in styles:
+        for citation in re.findall(r'\[\d+\]', text):
+            citations.append({"type": "in-text", "style": "ieee", "raw": citation})
+    if 'apa' in styles or 'mla' in styles or 'chicago' in styles:
+        for entry in re.findall(r'([A-Za-z]+, [A-Z]\. [A-Z]\.(?:, & [A-Za-z]+, [A-Z]\. [A-Z]\.)*) \((\d{4})\)\. (.*?)\. (.*?)(?: |$)', text):
+            citations.append({"type": "reference", "style": "apa", "authors": entry[0], "year": entry[1],
+                              "title": entry[2], "source": entry[3], "raw": " ".join(entry)})
+    for doi in re.findall(r'\b(10\.\d{4,}(?:\.\d+)*\/(?:(?!["\'\s])[-_;()/:a-zA-Z0-9])+)', text):
+        citations.append({"type": "doi", "style": "doi", "doi": doi, "raw": doi})
+    return citations
+
+def build_corpus(megabytes: float, density: float, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    def name():
+        return rng.choice(SURNAMES)
+    makers = [
+        lambda: f"({name()}, {rng.randint(1950, 2024)})",
+        lambda: f"({name()} & {name()}, {rng.randint(1950, 2024)}, p. {rng.randint(1, 300)})",
+        lambda: f"({name()} {rng.randint(1, 400)})",
+        lambda: f"({name()} and {name()} {rng.randint(1, 40)}-{rng.randint(41, 90)})",
+        lambda: f"({name()} {rng.randint(1950, 2024)}, {rng.randint(1, 300)})",
+        lambda: f"[{rng.randint(1, 120)}]",
+        lambda: f"doi 10.{rng.randint(1000, 99999)}/j.{rng.randint(100, 999)}.{rng.randint(1000, 9999)}",
+        lambda: f"{name()}, {rng.choice('ABCDEFGH')}. {rng.choice('JKLMNPRS')}. ({rng.randint(1950, 2024)}). "
+                f"A study of {rng.choice(WORDS)} {rng.choice(WORDS)}. Journal of {rng.choice(WORDS).title()}, 12 ",
+    ]
+    target = int(megabytes * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+        if rng.random() < density:
+            sentence += " " + rng.choice(makers)()
+        sentence += ". "
+        if rng.random() < 0.1:
+            sentence += "\n"
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def key(citations):
+    return sorted(tuple(sorted(c.items())) for c in citations)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark citation extraction")
+    parser.add_argument('--megabytes', type=float, default=20, help='Corpus size in MiB (default: 20)')
+    parser.add_argument('--density', type=float, default=0.3, help='Fraction of sentences carrying a citation (default: 0.3)')
+    parser.add_argument('--chunk-kb', type=int, default=256, help='Chunk size for the streamed run in KiB (default: 256)')
+    parser.add_argument('--styles', default='apa,mla,chicago,ieee', help='Comma-separated styles (default: apa,mla,chicago,ieee)')
+    args = parser.parse_args()
+    styles = [s.strip() for s in args.styles.split(',') if s.strip()]
+
+    print(f"Building a {args.megabytes:g} MiB corpus...")
+    text = build_corpus(args.megabytes, args.density)
+    chunk = args.chunk_kb * 1024
+    chunks = [text[i:i + chunk] for i in range(0, len(text), chunk)]
+
+    legacy, legacy_time = timed(lambda: legacy_extract(text, styles))
+    single, single_time = timed(lambda: extract_citations_from_text(text, styles))
+    streamed, streamed_time = timed(lambda: extract_citations_from_chunks(chunks, styles))
+
+    mb = len(text) / (1024 * 1024)
+    print(f"{'Per-style findall (previous)':<32} {legacy_time:8.2f} s {mb / legacy_time:8.1f} MiB/s {len(legacy):>9} citations")
+    print(f"{'Single-pass scanner':<32} {single_time:8.2f} s {mb / single_time:8.1f} MiB/s {len(single):>9} citations")
+    print(f"{'Single-pass, streamed chunks':<32} {streamed_time:8.2f} s {mb / streamed_time:8.1f} MiB/s {len(streamed):>9} citations")
+    print(f"Speedup: {legacy_time / single_time:.1f}x")
+
+    if single != legacy:
+        print("Single-pass results differ from the previous extractor")
+        return 1
+    if key(streamed) != key(legacy):
+        print("Streamed results differ from the previous extractor")
+        return 1
+    print("All three extractors returned identical citations.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
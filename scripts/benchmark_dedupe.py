@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Dedupe Worker Benchmark for Herd AI
+
+Builds a synthetic tree of binary, text and near-duplicate files in a
+temporary directory and times DuplicateDetector.scan_directory with 1, 4 and
+16 workers. The persistent hash store is disabled so every run hashes from
+disk. Results are also checked to be identical across worker counts.
+
+Usage:
+    python scripts/benchmark_dedupe.py [--files N] [--size-kb K] [--workers 1 4 16]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from herd_ai.utils.dedupe import DuplicateDetector
+
+def build_tree(root: Path, files: int, size_kb: int) -> None:
+    """Write a mix of exact duplicates, same-size decoys and similar text."""
+    rng = random.Random(42)
+    words = [f"word{i}" for i in range(500)]
+    for i in range(files):
+        sub = root / f"dir{i % 8}"
+        sub.mkdir(exist_ok=True)
+        if i % 3 == 0:
+            data = rng.randbytes(size_kb * 1024) if hasattr(rng, 'randbytes') else os.urandom(size_kb * 1024)
+            (sub / f"blob{i}.bin").write_bytes(data)
+            (sub / f"blob{i}_copy.bin").write_bytes(data)
+            decoy = bytearray(data)
+            decoy[len(decoy) // 2] ^= 0xFF
+            (sub / f"blob{i}_decoy.bin").write_bytes(bytes(decoy))
+        else:
+            paragraphs = ["\n".join(" ".join(rng.choice(words) for _ in range(12)) for _ in range(4))
+                          for _ in range(6)]
+            text = "\n\n".join(paragraphs)
+            (sub / f"note{i}.md").write_text(text)
+            (sub / f"note{i}_edit.md").write_text(text.replace("word1 ", "wordX ", 1))
+
+def summarize(results):
+    return (
+        sorted(tuple(g['files']) for g in results['exact_duplicates']),
+        sorted(tuple(g['files']) for g in results['similar_text_groups']),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dedupe scans across worker counts")
+    parser.add_argument('--files', type=int, default=300, help='Number of synthetic source files (default: 300)')
+    parser.add_argument('--size-kb', type=int, default=1024, help='Size of each binary file in KiB (default: 1024)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16], help='Worker counts to compare')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_tree(root, args.files, args.size_kb)
+        total = sum(p.stat().st_size for p in root.rglob('*') if p.is_file())
+        print(f"Synthetic tree: {sum(1 for p in root.rglob('*') if p.is_file())} files, {total / 1024 / 1024:.1f} MiB")
+
+        baseline = None
+        base_time = None
+        for workers in args.workers:
+            detector = DuplicateDetector(root, recursive=True, use_hash_store=False, workers=workers)
+            start = time.perf_counter()
+            results = detector.scan_directory()
+            elapsed = time.perf_counter() - start
+            summary = summarize(results)
+            if baseline is None:
+                baseline, base_time = summary, elapsed
+            same = "same" if summary == baseline else "DIFFERENT"
+            print(f"workers={workers:>3}  {elapsed:8.3f}s  speedup x{base_time / elapsed:5.2f}  results {same}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark for Herd AI
+
+Measures cold-start cost with `python -X importtime` in fresh interpreters:
+importing the herd_ai package, importing herd_ai.config and
+herd_ai.utils.cache on their own, and running `herd --help` (herd_ai.herd).
+Modules the bare interpreter already loads are not counted. Each target is
+run several times and the fastest run is reported, with its heaviest
+imports.
+
+Exits non-zero when a target exceeds its time budget, or when it loads a
+module that should only be imported on first use (rich, Pillow, requests,
+NumPy or one of the subcommand modules for the package; Pillow and the file
+utilities for the cache used by `herd --clear-cache`), so the script can
+guard against startup regressions in CI.
+
+Usage:
+    python scripts/benchmark_import.py [--runs N] [--scale X] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# (label, interpreter arguments, budget in milliseconds)
+TARGETS = [
+    ("import herd_ai", ["-c", "import herd_ai"], 25),
+    ("import herd_ai.config", ["-c", "import herd_ai.config"], 40),
+    ("import herd_ai.utils.cache", ["-c", "import herd_ai.utils.cache"], 40),
+    ("herd --help", ["-m", "herd_ai.herd", "--help"], 250),
+]
+
+# Modules each target must not load, by target label.
+DEFERRED = {
+    "import herd_ai": [
+        "rich", "PIL", "requests", "numpy",
+        "herd_ai.cli", "herd_ai.rename", "herd_ai.snippets", "herd_ai.idealize", "herd_ai.docs",
+        "herd_ai.citations", "herd_ai.image_processor", "herd_ai.utils.analysis", "herd_ai.utils.file",
+    ],
+    "import herd_ai.utils.cache": [
+        "rich", "PIL", "requests", "numpy", "herd_ai.utils.file", "herd_ai.utils.image_metadata",
+    ],
+}
+
+def importtime(args):
+    """
+    Run the interpreter with -X importtime and return the top-level imports
+    as {module: cumulative microseconds} and every imported module name.
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, env=env, cwd=str(SRC.parent),
+    )
+    top_level, loaded = {}, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        loaded.add(name.strip())
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative)
+    return top_level, loaded
+
+def measure(args, baseline, runs):
+    """Fastest of `runs` cold starts, in ms, with its top-level imports and loaded modules."""
+    best = None
+    for _ in range(runs):
+        top_level, loaded = importtime(args)
+        counted = {name: us for name, us in top_level.items() if name not in baseline}
+        total = sum(counted.values()) / 1000
+        if best is None or total < best[0]:
+            best = (total, counted, loaded)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Herd AI import time")
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per target; the fastest counts (default: 5)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, for slow machines (default: 1.0)')
+    parser.add_argument('--top', type=int, default=5, help='Heaviest imports to list per target (default: 5)')
+    args = parser.parse_args()
+
+    _, baseline = importtime(["-c", "pass"])
+    failures = []
+
+    for label, target_args, budget in TARGETS:
+        total, counted, loaded = measure(target_args, baseline, max(1, args.runs))
+        budget *= args.scale
+        status = "ok" if total <= budget else "OVER BUDGET"
+        print(f"{label:<28} {total:8.1f} ms  (budget {budget:6.0f} ms)  {status}")
+        for name, us in sorted(counted.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+        if total > budget:
+            failures.append(f"{label} took {total:.1f} ms (budget {budget:.0f} ms)")
+        eager = [name for name in DEFERRED.get(label, []) if name in loaded]
+        if eager:
+            failures.append(f"{label} loaded " + ", ".join(eager))
+
+    if failures:
+        print("\nStartup regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nAll targets within budget.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,29 +14,60 @@ __version__ = "0.2.0"
 __package_name__ = "herd-ai"
 __command_name__ = "herd"
 
-# Export main functions from each module
-from .cli import main 
-from .config import OLLAMA_MODEL
-
-# Core functionalities
-from .rename import process_renames
-from .snippets import process_snippets
-from .idealize import process_ideal
-from .docs import generate_docs, export_document_summary
-from .image_processor import process_images_cli
-
-# Optional citations functionality (requires bibtexparser)
-try:
-    from .citations import process_directory
-except ImportError:
-    # Provide a fallback function when bibtexparser is not available
-    def process_directory(*args, **kwargs):
-        print("Citations functionality requires bibtexparser. Install with: pip install bibtexparser")
-        return {"success": False, "error": "bibtexparser not available"}
-
-# Utilities
-from .utils.analysis import analyze_documents, generate_document_summary
-from .utils.cache import clear_cache
+# Public names, resolved on first access (PEP 562) so that importing the
+# package - or any of its submodules, such as herd_ai.config - does not load
+# rich, Pillow, requests and every subcommand. Maps name -> (module, attribute).
+_LAZY_ATTRIBUTES = {
+    "main": (".cli", "main"),
+    "OLLAMA_MODEL": (".config", "OLLAMA_MODEL"),
+    # Core functionalities
+    "process_renames": (".rename", "process_renames"),
+    "process_snippets": (".snippets", "process_snippets"),
+    "process_ideal": (".idealize", "process_ideal"),
+    "generate_docs": (".docs", "generate_docs"),
+    "export_document_summary": (".docs", "export_document_summary"),
+    "process_images_cli": (".image_processor", "process_images_cli"),
+    "process_directory": (".citations", "process_directory"),
+    # Utilities
+    "analyze_documents": (".utils.analysis", "analyze_documents"),
+    "generate_document_summary": (".utils.analysis", "generate_document_summary"),
+    "clear_cache": (".utils.cache", "clear_cache"),
+    # Further subcommands of the herd command line (herd.py)
+    "process_file_or_directory": (".citations", "process_file_or_directory"),
+    "process_images": (".image_processor", "process_directory"),
+    "scramble_directory": (".utils.scrambler", "scramble_directory"),
+    "generate_sample_files": (".utils.scrambler", "generate_sample_files"),
+    "dedupe_files": (".utils.dedupe", "dedupe_files"),
+    "log_action": (".utils.undo_log", "log_action"),
+    "undo_last_action": (".utils.undo_log", "undo_last_action"),
+    "list_undo_actions": (".utils.undo_log", "list_undo_actions"),
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+def _citations_unavailable(*args, **kwargs):
+    # Fallback when the citations module cannot be imported (requires bibtexparser)
+    print("Citations functionality requires bibtexparser. Install with: pip install bibtexparser")
+    return {"success": False, "error": "bibtexparser not available"}
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    try:
+        value = getattr(import_module(module_name, __name__), attribute)
+    except ImportError:
+        if name != "process_directory":
+            raise
+        value = _citations_unavailable
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 # Compatibility layer for transition from llamacleaner to herd-ai
 import warnings
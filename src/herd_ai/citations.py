@@ -25,8 +25,10 @@ import json
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple, Union
 import re
+import math
+from collections import Counter
 from datetime import datetime
 import csv
 import argparse
@@ -84,23 +86,27 @@ if str(root_dir) not in sys.path:
 try:
     try:
         # First try standard package imports
-        from herd_ai.utils.file import get_file_text, is_ignored_file
-        from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS
+        from herd_ai.utils.file import get_file_text, iter_file_text, is_ignored_file, scan_files
+        from herd_ai.utils.crossref import fetch_doi_metadata, fetch_many
+        from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, MAX_TEXT_BYTES
     except ImportError:
         try:
             # Then try legacy package imports
-            from llamacleaner.utils.file import get_file_text, is_ignored_file
-            from llamacleaner.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS
+            from llamacleaner.utils.file import get_file_text, iter_file_text, is_ignored_file, scan_files
+            from llamacleaner.utils.crossref import fetch_doi_metadata, fetch_many
+            from llamacleaner.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, MAX_TEXT_BYTES
         except ImportError:
             try:
                 # Then try relative imports
-                from utils.file import get_file_text, is_ignored_file
-                from config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS
+                from utils.file import get_file_text, iter_file_text, is_ignored_file, scan_files
+                from utils.crossref import fetch_doi_metadata, fetch_many
+                from config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, MAX_TEXT_BYTES
             except ImportError:
                 # Last resort - direct imports using file path
                 sys.path.insert(0, str(Path(__file__).resolve().parent))
-                from herd_ai.utils.file import get_file_text, is_ignored_file
-                from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS
+                from herd_ai.utils.file import get_file_text, iter_file_text, is_ignored_file, scan_files
+                from herd_ai.utils.crossref import fetch_doi_metadata, fetch_many
+                from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, MAX_TEXT_BYTES
 except Exception as e:
     print(f"Warning: Some dependencies not available in citations.py: {e}")
     print("Citations module will work with limited functionality.")
@@ -112,8 +118,24 @@ except Exception as e:
             return Path(path).read_text(encoding='utf-8', errors='ignore')
         except:
             return ""
+    def iter_file_text(path, chunk_size=None, max_bytes=None):
+        yield get_file_text(path)
+    MAX_TEXT_BYTES = None
     def is_ignored_file(path):
         return Path(path).name.startswith('.') or Path(path).name.startswith('|_')
+    def scan_files(directory, recursive=True, extensions=None):
+        walker = Path(directory).rglob("*") if recursive else Path(directory).glob("*")
+        return sorted(p for p in walker if p.is_file()
+                      and (extensions is None or p.suffix.lower() in extensions))
+    def fetch_doi_metadata(doi):
+        import requests
+        response = requests.get(f"https://api.crossref.org/works/{doi}", headers={"Accept": "application/json"}, timeout=10)
+        return response.json().get("message", {}) if response.status_code == 200 else None
+    def fetch_many(dois, workers=None):
+        results = {doi: fetch_doi_metadata(doi) for doi in dict.fromkeys(dois)}
+        found = sum(1 for m in results.values() if m)
+        return {"results": results, "stats": {"unique": len(results), "cached": 0, "cached_missing": 0,
+                                               "fetched": found, "missing": len(results) - found, "errors": 0}}
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -133,8 +155,184 @@ SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS.union(DOCUMENT_EXTENSIONS)
 SUPPORTED_STYLES = ['apa', 'mla', 'chicago', 'ieee', 'vancouver']
 
 # =============================================================================
-# Modular citation extraction for each style
+# Single-pass citation extraction
+# -----------------------------------------------------------------------------
+# Every style pattern is compiled once at import. One trigger scan walks the
+# text and stops only where a citation can begin: "(" for APA/MLA/Chicago
+# in-text citations, "[" for IEEE, "10." for DOIs and the start of a
+# "Surname, A. B." run for reference entries. At each trigger only the
+# relevant patterns are tried, anchored at that position. Per-kind end offsets
+# keep each kind's matches non-overlapping, exactly as a separate findall pass
+# per kind would, so results match the per-style scans they replace.
+#
+# CitationScanner accepts text in chunks. Matches that reach the end of the
+# buffered text are held back until more text (or the end of input) arrives,
+# so citations that straddle chunk boundaries are still found.
 # =============================================================================
+_APA_IN_TEXT_RE = re.compile(r'\(([A-Za-z]+(?:[ ,&]+[A-Za-z]+)*,? \d{4}[a-z]?(?:, p\. \d+)?)+\)')
+_MLA_IN_TEXT_RE = re.compile(r'\([A-Za-z\-]+(?:\s+(?:and|&)\s+[A-Za-z\-]+)*\s+\d+(?:-\d+)?\)')
+_CHICAGO_IN_TEXT_RE = re.compile(r'\([A-Za-z\-]+\s+\d{4},\s*\d+(?:-\d+)?\)')
+_IEEE_IN_TEXT_RE = re.compile(r'\[\d+\]')
+_REFERENCE_RE = re.compile(r'([A-Za-z]+, [A-Z]\. [A-Z]\.(?:, & [A-Za-z]+, [A-Z]\. [A-Z]\.)*) \((\d{4})\)\. (.*?)\. (.*?)(?: |$)')
+_DOI_RE = re.compile(r'\b(10\.\d{4,}(?:\.\d+)*\/(?:(?!["\'\s])[-_;()/:a-zA-Z0-9])+)')
+_YEAR_RE = re.compile(r'(\d{4})')
+# Literal-led alternatives only, so the scan stays in the regex engine's fast
+# path; a reference entry is found by its ", A. B." and walked back to the
+# start of the surname.
+_TRIGGER_RE = re.compile(r'[(\[]|10\.|, [A-Z]\. [A-Z]\.')
+_LETTERS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
+
+# Output order of extract_citations_from_text: one group per kind.
+CITATION_KINDS = ('apa', 'mla', 'chicago', 'ieee', 'reference', 'doi')
+# Longest citation the streaming scanner is guaranteed to see whole, and the
+# longest surname it can walk back over across a chunk boundary.
+CITATION_MAX_LENGTH = 4096
+_MAX_SURNAME = 256
+
+def _citation_kinds(styles: Optional[List[str]]) -> List[str]:
+    styles = styles or ['apa']
+    kinds = [k for k in ('apa', 'mla', 'chicago') if k in styles]
+    if 'ieee' in styles or 'vancouver' in styles:
+        kinds.append('ieee')
+    if 'apa' in styles or 'mla' in styles or 'chicago' in styles:
+        kinds.append('reference')
+    kinds.append('doi')
+    return kinds
+
+def _citation_record(kind: str, match: re.Match) -> Optional[Dict[str, str]]:
+    if kind == 'apa':
+        citation = match.group(1)
+        parts = citation.split(',')
+        if len(parts) < 2:
+            return None
+        year_match = _YEAR_RE.search(parts[1])
+        return {
+            "type": "in-text",
+            "style": "apa",
+            "authors": parts[0].strip(),
+            "year": year_match.group(1) if year_match else "",
+            "raw": citation
+        }
+    if kind in ('mla', 'chicago', 'ieee'):
+        return {"type": "in-text", "style": kind, "raw": match.group(0)}
+    if kind == 'reference':
+        entry = match.groups()
+        return {
+            "type": "reference",
+            "style": "apa",
+            "authors": entry[0],
+            "year": entry[1],
+            "title": entry[2],
+            "source": entry[3],
+            "raw": " ".join(entry)
+        }
+    doi = match.group(1)
+    return {"type": "doi", "style": "doi", "doi": doi, "raw": doi}
+
+_KIND_PATTERNS = {
+    'apa': _APA_IN_TEXT_RE, 'mla': _MLA_IN_TEXT_RE, 'chicago': _CHICAGO_IN_TEXT_RE,
+    'ieee': _IEEE_IN_TEXT_RE, 'reference': _REFERENCE_RE, 'doi': _DOI_RE,
+}
+
+class CitationScanner:
+    """
+    Incremental single-pass citation extractor.
+
+    feed() text chunks in order and collect the records it returns, then call
+    close() for the rest. Records are (kind, citation) pairs in document
+    order, where kind is one of CITATION_KINDS.
+    """
+
+    def __init__(self, styles: Optional[List[str]] = None):
+        self.kinds = set(_citation_kinds(styles))
+        self._trigger_kinds = {
+            '(': tuple(k for k in ('apa', 'mla', 'chicago') if k in self.kinds),
+            '[': tuple(k for k in ('ieee',) if k in self.kinds),
+            '1': ('doi',),
+            ',': tuple(k for k in ('reference',) if k in self.kinds),
+        }
+        self._buffer = ""
+        self._pos = 0
+        self._last_end = {kind: 0 for kind in self.kinds}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, str]]]:
+        self._buffer += chunk
+        return self._scan(final=False)
+
+    def close(self) -> List[Tuple[str, Dict[str, str]]]:
+        records = self._scan(final=True)
+        self._buffer = ""
+        self._pos = 0
+        return records
+
+    def _scan(self, final: bool) -> List[Tuple[str, Dict[str, str]]]:
+        buf = self._buffer
+        size = len(buf)
+        # Triggers this close to the end wait for more text
+        limit = size if final else size - CITATION_MAX_LENGTH
+        records = []
+        resume = max(self._pos, limit)
+        last_end = self._last_end
+        for trigger in _TRIGGER_RE.finditer(buf, self._pos):
+            position = start = trigger.start()
+            if position >= limit:
+                break
+            first = buf[position]
+            kinds = self._trigger_kinds[first]
+            if first == ',':
+                while start > 0 and buf[start - 1] in _LETTERS:
+                    start -= 1
+                if start == position:
+                    continue
+            deferred = False
+            for kind in kinds:
+                if start < last_end[kind]:
+                    continue
+                match = _KIND_PATTERNS[kind].match(buf, start)
+                if match is None:
+                    continue
+                if not final and match.end() >= size - 1:
+                    # May continue past the buffered text
+                    deferred = True
+                    break
+                last_end[kind] = match.end()
+                record = _citation_record(kind, match)
+                if record is not None:
+                    records.append((kind, record))
+            if deferred:
+                resume = position
+                break
+        if final:
+            return records
+        # Keep enough text before the resume point for \b and for walking
+        # back from a reference trigger to the start of its surname
+        keep = max(0, resume - _MAX_SURNAME)
+        self._buffer = buf[keep:]
+        self._pos = resume - keep
+        for kind in self._last_end:
+            self._last_end[kind] = max(0, self._last_end[kind] - keep)
+        return records
+
+def iter_citations(chunks: Iterable[str], styles: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Yield (kind, citation) records in document order from streamed text
+    chunks (e.g. iter_file_text()), walking the text once.
+    """
+    scanner = CitationScanner(styles)
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+    yield from scanner.close()
+
+def extract_citations_from_chunks(chunks: Iterable[str], styles: Optional[List[str]] = None) -> List[Dict[str, str]]:
+    """
+    Extract citations from streamed text chunks, grouped by kind in the same
+    order as extract_citations_from_text.
+    """
+    groups: Dict[str, List[Dict[str, str]]] = {kind: [] for kind in CITATION_KINDS}
+    for kind, record in iter_citations(chunks, styles):
+        groups[kind].append(record)
+    return [record for kind in CITATION_KINDS for record in groups[kind]]
+
 def extract_citations_from_text(text: str, styles: Optional[List[str]] = None) -> List[Dict[str, str]]:
     """
     Extract citations from text content for the requested styles.
@@ -144,83 +342,51 @@ def extract_citations_from_text(text: str, styles: Optional[List[str]] = None) -
     Returns:
         List of dictionaries containing citation information
     """
-    if styles is None:
-        styles = ['apa']
-        
-    citations = []
-    # APA
-    if 'apa' in styles:
-        apa_in_text = re.findall(r'\(([A-Za-z]+(?:[ ,&]+[A-Za-z]+)*,? \d{4}[a-z]?(?:, p\. \d+)?)+\)', text)
-        for citation in apa_in_text:
-            parts = citation.split(',')
-            if len(parts) >= 2:
-                authors = parts[0].strip()
-                year_match = re.search(r'(\d{4})', parts[1])
-                year = year_match.group(1) if year_match else ""
-                citations.append({
-                    "type": "in-text",
-                    "style": "apa",
-                    "authors": authors,
-                    "year": year,
-                    "raw": citation
-                })
-    # MLA
-    if 'mla' in styles:
-        mla_in_text = re.findall(r'\([A-Za-z\-]+(?:\s+(?:and|&)\s+[A-Za-z\-]+)*\s+\d+(?:-\d+)?\)', text)
-        for citation in mla_in_text:
-            citations.append({
-                "type": "in-text",
-                "style": "mla",
-                "raw": citation
-            })
-    # Chicago
-    if 'chicago' in styles:
-        chicago_in_text = re.findall(r'\([A-Za-z\-]+\s+\d{4},\s*\d+(?:-\d+)?\)', text)
-        for citation in chicago_in_text:
-            citations.append({
-                "type": "in-text",
-                "style": "chicago",
-                "raw": citation
-            })
-    # IEEE/Vancouver
-    if 'ieee' in styles or 'vancouver' in styles:
-        ieee_in_text = re.findall(r'\[\d+\]', text)
-        for citation in ieee_in_text:
-            citations.append({
-                "type": "in-text",
-                "style": "ieee",
-                "raw": citation
-            })
-    # Reference entries (APA-like)
-    if 'apa' in styles or 'mla' in styles or 'chicago' in styles:
-        reference_entries = re.findall(r'([A-Za-z]+, [A-Z]\. [A-Z]\.(?:, & [A-Za-z]+, [A-Z]\. [A-Z]\.)*) \((\d{4})\)\. (.*?)\. (.*?)(?: |$)', text)
-        for entry in reference_entries:
-            if len(entry) >= 4:
-                authors, year, title, source = entry[0], entry[1], entry[2], entry[3]
-                citations.append({
-                    "type": "reference",
-                    "style": "apa",
-                    "authors": authors,
-                    "year": year,
-                    "title": title,
-                    "source": source,
-                    "raw": " ".join(entry)
-                })
-    # DOIs
-    doi_pattern = r'\b(10\.\d{4,}(?:\.\d+)*\/(?:(?!["\'\s])[-_;()/:a-zA-Z0-9])+)'
-    dois = re.findall(doi_pattern, text)
-    for doi in dois:
-        citations.append({
-            "type": "doi",
-            "style": "doi",
-            "doi": doi,
-            "raw": doi
-        })
-    return citations
+    return extract_citations_from_chunks([text], styles)
 
 # =============================================================================
-# DOI enrichment (unchanged)
+# DOI enrichment
+# -----------------------------------------------------------------------------
+# Metadata comes from utils.crossref, which caches lookups (including DOIs
+# CrossRef does not know) across runs and fetches batches concurrently.
 # =============================================================================
+def citation_from_crossref(doi: str, message: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build a citation record from a CrossRef works "message".
+    """
+    title = message.get("title", [])
+    title = title[0] if title and isinstance(title, list) else ""
+    authors = []
+    for author in message.get("author", []):
+        given = author.get("given", "")
+        family = author.get("family", "")
+        if given and family:
+            authors.append(f"{family}, {given[0]}.")
+    date_parts = message.get("published", {}).get("date-parts", [[]])
+    year = str(date_parts[0][0]) if date_parts and date_parts[0] else ""
+    container = message.get("container-title", [])
+    container = container[0] if container and isinstance(container, list) else ""
+    volume = message.get("volume", "")
+    issue = message.get("issue", "")
+    page = message.get("page", "")
+    url_val = message.get("URL", "")
+    author_string = ", ".join(authors)
+    if author_string:
+        author_string += "."
+    return {
+        "type": "doi",
+        "authors": author_string,
+        "year": year,
+        "title": title,
+        "source": container,
+        "volume": volume,
+        "issue": issue,
+        "pages": page,
+        "doi": doi,
+        "url": url_val,
+        "raw": f"{author_string} ({year}). {title}. {container}, {volume}({issue}), {page}. {doi}"
+    }
+
 def extract_citations_from_doi(doi: str, log_callback: Optional[Any] = None, provider: str = None) -> Optional[Dict[str, str]]:
     """
     Extract citation information from a DOI using CrossRef.
@@ -232,54 +398,17 @@ def extract_citations_from_doi(doi: str, log_callback: Optional[Any] = None, pro
         Dictionary containing citation information, or None if extraction failed
     """
     try:
-        import requests
-        url = f"https://api.crossref.org/works/{doi}"
         if log_callback:
             log_callback(f"[dim]Fetching metadata for DOI: {doi}[/dim]")
             if provider:
                 log_callback(f"[dim]Using provider: {provider}[/dim]")
-        response = requests.get(url, headers={"Accept": "application/json"}, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            message = data.get("message", {})
-            title = message.get("title", [])
-            title = title[0] if title and isinstance(title, list) else ""
-            authors = []
-            for author in message.get("author", []):
-                given = author.get("given", "")
-                family = author.get("family", "")
-                if given and family:
-                    authors.append(f"{family}, {given[0]}.")
-            date_parts = message.get("published", {}).get("date-parts", [[]])
-            year = str(date_parts[0][0]) if date_parts and date_parts[0] else ""
-            container = message.get("container-title", [])
-            container = container[0] if container and isinstance(container, list) else ""
-            volume = message.get("volume", "")
-            issue = message.get("issue", "")
-            page = message.get("page", "")
-            url_val = message.get("URL", "")
-            author_string = ", ".join(authors)
-            if author_string:
-                author_string += "."
-            citation = {
-                "type": "doi",
-                "authors": author_string,
-                "year": year,
-                "title": title,
-                "source": container,
-                "volume": volume,
-                "issue": issue,
-                "pages": page,
-                "doi": doi,
-                "url": url_val,
-                "raw": f"{author_string} ({year}). {title}. {container}, {volume}({issue}), {page}. {doi}"
-            }
+        message = fetch_doi_metadata(doi)
+        if message is not None:
             if log_callback:
                 log_callback(f"[green]DOI metadata fetched for {doi}[/green]")
-            return citation
-        else:
-            if log_callback:
-                log_callback(f"[yellow]DOI lookup failed for {doi}: HTTP {response.status_code}[/yellow]")
+            return citation_from_crossref(doi, message)
+        if log_callback:
+            log_callback(f"[yellow]DOI lookup failed for {doi}[/yellow]")
     except Exception as e:
         msg = f"[red]Error extracting citation from DOI {doi}: {e}[/red]"
         logger.error(msg)
@@ -287,21 +416,210 @@ def extract_citations_from_doi(doi: str, log_callback: Optional[Any] = None, pro
             log_callback(msg)
     return None
 
+def enrich_doi_citations(citations: List[Dict[str, Any]], log_callback: Optional[Any] = None, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Fill in CrossRef metadata for every DOI citation in place. Each distinct
+    DOI is looked up once, from the cache where possible and otherwise on a
+    bounded pool of concurrent, rate-limited requests.
+    Returns the lookup statistics from fetch_many.
+    """
+    doi_citations = [c for c in citations if c.get("type") == "doi" and c.get("doi")]
+    if not doi_citations:
+        return {}
+    lookup = fetch_many([c["doi"] for c in doi_citations], workers=workers)
+    for c in doi_citations:
+        message = lookup["results"].get(c["doi"])
+        if message is not None:
+            c.update(citation_from_crossref(c["doi"], message))
+    stats = lookup["stats"]
+    if log_callback:
+        log_callback(
+            f"[dim]DOI enrichment: {stats['unique']} unique DOIs, "
+            f"{stats['cached'] + stats['cached_missing']} from cache, {stats['fetched']} fetched, "
+            f"{stats['missing']} not found, {stats['errors']} failed[/dim]"
+        )
+    return stats
+
 # =============================================================================
-# Deduplication utility
+# Deduplication
+# -----------------------------------------------------------------------------
+# Exact duplicates are dropped by DOI or by normalized raw text. Records that
+# carry a title (reference entries and DOI-enriched citations) are then
+# matched fuzzily: they are blocked by (year, first-author surname), and only
+# records within a block are compared, by Jaccard similarity of their title
+# word shingles. Records with identical shingles are grouped first, and only
+# groups that share a shingle near the start of their rarest-first shingle
+# list are compared (prefix filtering), so large blocks stay close to linear
+# without missing any pair above the threshold. Matches are merged with
+# union-find, keeping the record with the most populated fields and filling
+# its gaps from the others.
 # =============================================================================
-def dedupe_citations(citations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+TITLE_SIMILARITY_THRESHOLD = 0.7
+
+_SURNAME_SPLIT_RE = re.compile(r'\s*(?:,|&|\band\b|;)\s*')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_INITIALS_RE = re.compile(r'^(?:[A-Z]\.\s*)+$|^[A-Z]$')
+
+def _normalize_raw(raw: str) -> str:
+    return " ".join(_WORD_RE.findall(raw.lower()))
+
+def citation_surnames(authors: str) -> List[str]:
+    """
+    Lowercased surnames from an author string such as
+    "Smith, J. K., & Jones, A. B." or "Smith and Jones", skipping initials.
+    """
+    surnames = []
+    for part in _SURNAME_SPLIT_RE.split(authors or ""):
+        part = part.strip()
+        if not part or _INITIALS_RE.match(part):
+            continue
+        words = _WORD_RE.findall(part.lower())
+        if words:
+            # "Smith" or, for "Jane Smith", the last word
+            surnames.append(words[-1])
+    return surnames
+
+def title_shingles(title: str, size: int = 2) -> Set[str]:
+    """Word shingles of a normalized title (the whole title if it is shorter)."""
+    words = _WORD_RE.findall((title or "").lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def citation_block_key(citation: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(year, first-author surname) for a titled citation, or None if it cannot be blocked."""
+    if not citation.get("title"):
+        return None
+    surnames = citation_surnames(citation.get("authors", ""))
+    year = str(citation.get("year") or "").strip()
+    if not surnames or not year:
+        return None
+    return (year, surnames[0])
+
+def _candidate_pairs(sets: List[Set[str]], threshold: float) -> List[Tuple[int, int]]:
     """
-    Deduplicate citations by their 'raw' field or DOI.
+    Index pairs (i, j), i < j, of non-empty shingle sets that may have a
+    Jaccard similarity of at least `threshold`, in sorted order.
+
+    Two such sets of sizes n and m share at least ceil(threshold * max(n, m))
+    shingles, so with shingles ordered rarest first they share one among the
+    first n - ceil(threshold * n) + 1 of each. Only those are indexed.
+    """
+    if threshold <= 0:
+        filled = [i for i, shingles in enumerate(sets) if shingles]
+        return [(a, b) for pos, a in enumerate(filled) for b in filled[pos + 1:]]
+    frequency = Counter(shingle for shingles in sets for shingle in shingles)
+    postings: Dict[str, List[int]] = {}
+    pairs: Set[Tuple[int, int]] = set()
+    for i, shingles in enumerate(sets):
+        ordered = sorted(shingles, key=lambda shingle: (frequency[shingle], shingle))
+        prefix = len(ordered) - math.ceil(threshold * len(ordered) - 1e-9) + 1
+        for shingle in ordered[:prefix]:
+            seen = postings.setdefault(shingle, [])
+            pairs.update((j, i) for j in seen)
+            seen.append(i)
+    return sorted(pairs)
+
+def _richness(citation: Dict[str, Any]) -> Tuple[int, int]:
+    filled = [v for v in citation.values() if v not in (None, "", [], {})]
+    return (len(filled), sum(len(str(v)) for v in filled))
+
+def merge_citations(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge duplicate records: start from the one with the most populated
+    fields and fill any empty fields from the rest, in order.
     """
-    seen = set()
-    deduped = []
+    primary = max(records, key=_richness)
+    merged = dict(primary)
+    for record in records:
+        for field, value in record.items():
+            if merged.get(field) in (None, "", [], {}) and value not in (None, "", [], {}):
+                merged[field] = value
+    return merged
+
+def dedupe_citations(
+    citations: List[Dict[str, Any]],
+    fuzzy: bool = True,
+    threshold: float = TITLE_SIMILARITY_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Deduplicate citations by DOI or normalized 'raw' text and, with fuzzy
+    matching, merge titled records whose titles are at least `threshold`
+    similar within the same (year, first author) block. Records whose DOIs
+    differ are never merged, not even through a third record without a DOI.
+    Output keeps first-occurrence order.
+    """
+    groups: List[List[Dict[str, Any]]] = []
+    by_key: Dict[str, int] = {}
     for c in citations:
-        key = c.get('doi') or c.get('raw')
-        if key and key not in seen:
-            deduped.append(c)
-            seen.add(key)
-    return deduped
+        doi = (c.get('doi') or "").strip().lower()
+        key = f"doi:{doi}" if doi else (f"raw:{_normalize_raw(c['raw'])}" if c.get('raw') else None)
+        if not key:
+            continue
+        if key in by_key:
+            groups[by_key[key]].append(c)
+        else:
+            by_key[key] = len(groups)
+            groups.append([c])
+    if not fuzzy:
+        return [merge_citations(group) if len(group) > 1 else group[0] for group in groups]
+
+    representatives = [merge_citations(group) if len(group) > 1 else group[0] for group in groups]
+    parent = list(range(len(groups)))
+    # DOI of each component, kept at its root: union-find is transitive, so a
+    # record without a DOI must not join two components with different DOIs
+    component_doi = [(rep.get("doi") or "").strip().lower() or None for rep in representatives]
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def link(a: int, b: int) -> bool:
+        """Join the components of a and b unless their DOIs differ."""
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            return True
+        doi_a, doi_b = component_doi[ra], component_doi[rb]
+        if doi_a and doi_b and doi_a != doi_b:
+            return False
+        root = min(ra, rb)
+        parent[max(ra, rb)] = root
+        component_doi[root] = doi_a or doi_b
+        return True
+
+    blocks: Dict[Tuple[str, str], List[int]] = {}
+    for i, rep in enumerate(representatives):
+        block = citation_block_key(rep)
+        if block is not None:
+            blocks.setdefault(block, []).append(i)
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        # Records with identical titles always match: link each to the first
+        # record of its title it may join. Several heads remain per title
+        # only when their DOIs differ.
+        heads: Dict[frozenset, List[int]] = {}
+        for i in members:
+            shingles = frozenset(title_shingles(representatives[i]["title"]))
+            if not shingles:
+                continue
+            title_heads = heads.setdefault(shingles, [])
+            if not any(link(head, i) for head in title_heads):
+                title_heads.append(i)
+        titles = list(heads)
+        for a, b in _candidate_pairs(titles, threshold):
+            sa, sb = titles[a], titles[b]
+            if len(sa & sb) / len(sa | sb) >= threshold:
+                for head_a in heads[sa]:
+                    for head_b in heads[sb]:
+                        link(head_a, head_b)
+
+    merged: Dict[int, List[Dict[str, Any]]] = {}
+    for i, group in enumerate(groups):
+        merged.setdefault(find(i), []).extend(group)
+    return [merge_citations(records) if len(records) > 1 else records[0] for records in merged.values()]
 
 # =============================================================================
 # Save master JSON
@@ -625,8 +943,8 @@ def process_directory(directory: Path, recursive: bool = True, styles: List[str]
             return {"error": f"Directory not found: {directory}", "success": False}
             
         # Find relevant files
-        files = [p for p in (directory.rglob("*") if recursive else directory.glob("*")) 
-                if p.is_file() and not is_ignored_file(p) and p.suffix.lower() in SUPPORTED_EXTENSIONS]
+        files = [p for p in scan_files(directory, recursive, SUPPORTED_EXTENSIONS)
+                if not is_ignored_file(p)]
                 
         # Log the number of files found
         log_callback(f"[cyan]Found {len(files)} files to process for citations[/cyan]")
@@ -641,20 +959,17 @@ def process_directory(directory: Path, recursive: bool = True, styles: List[str]
         
         for file in files:
             try:
-                text = get_file_text(file)
-                if not text or not text.strip():
+                # Scan chunk by chunk so large documents are never fully in memory
+                has_text = False
+                def chunks():
+                    nonlocal has_text
+                    for chunk in iter_file_text(file, max_bytes=MAX_TEXT_BYTES):
+                        has_text = has_text or bool(chunk.strip())
+                        yield chunk
+                citations = extract_citations_from_chunks(chunks(), styles)
+                if not has_text:
                     continue
-                    
-                citations = extract_citations_from_text(text, styles)
                 processed_files += 1
-                
-                # Enrich DOIs if found
-                for c in citations:
-                    if c.get("type") == "doi" and "doi" in c:
-                        enriched = extract_citations_from_doi(c["doi"], log_callback=log_callback, provider=provider)
-                        if enriched:
-                            c.update(enriched)
-                            
                 all_citations.extend(citations)
                 
                 # Log progress periodically
@@ -664,6 +979,9 @@ def process_directory(directory: Path, recursive: bool = True, styles: List[str]
             except Exception as e:
                 log_callback(f"[red]Error processing {file}: {e}[/red]")
                 
+        # Enrich DOIs across all files at once, so each DOI is fetched at most once
+        doi_stats = enrich_doi_citations(all_citations, log_callback=log_callback)
+                
         # Deduplicate citations
         deduped = dedupe_citations(all_citations)
         log_callback(f"[green]Deduplicating {len(all_citations)} citations to {len(deduped)} unique citations[/green]")
@@ -687,6 +1005,7 @@ def process_directory(directory: Path, recursive: bool = True, styles: List[str]
             "unique_citations": len(deduped),
             "outputs": output_files,
             "json_path": str(json_path),
+            "doi_lookups": doi_stats,
             "success": True
         }
         
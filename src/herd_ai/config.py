@@ -12,26 +12,6 @@
 import os
 from pathlib import Path
 
-# --- Herd AI Utility Imports (robust, fallback style) ---
-try:
-    from herd_ai.utils import dedupe, analysis, file, scrambler, undo_log
-except ImportError:
-    try:
-        from llamacleaner.utils import dedupe, analysis, file, scrambler, undo_log
-    except ImportError:
-        try:
-            import utils.dedupe as dedupe
-            import utils.analysis as analysis
-            import utils.file as file
-            import utils.scrambler as scrambler
-            import utils.undo_log as undo_log
-        except ImportError:
-            dedupe = None
-            analysis = None
-            file = None
-            scrambler = None
-            undo_log = None
-
 # =============================================================================
 # Directory and Path Configuration
 # -----------------------------------------------------------------------------
@@ -45,6 +25,16 @@ CACHE_DIR = os.environ.get("LLAMACLEANER_CACHE_DIR", str(Path(BASE_DIR) / "cache
 Path(BASE_DIR).mkdir(exist_ok=True)
 Path(CACHE_DIR).mkdir(exist_ok=True)
 
+# Document cache limits (SQLite store in CACHE_DIR). Zero disables a limit.
+CACHE_MAX_BYTES = int(os.environ.get("LLAMACLEANER_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+CACHE_MAX_AGE_DAYS = float(os.environ.get("LLAMACLEANER_CACHE_MAX_AGE_DAYS", "90"))
+CACHE_FLUSH_EVERY = int(os.environ.get("LLAMACLEANER_CACHE_FLUSH_EVERY", "64"))
+
+# Opt-in cache of AI responses keyed by provider, model, prompts and file
+# content (enable with LLAMACLEANER_AI_CACHE=1 or `herd --ai-cache`).
+AI_CACHE_MAX_BYTES = int(os.environ.get("LLAMACLEANER_AI_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+AI_CACHE_MAX_AGE_DAYS = float(os.environ.get("LLAMACLEANER_AI_CACHE_MAX_AGE_DAYS", "30"))
+
 # =============================================================================
 # File Extension Groupings
 # -----------------------------------------------------------------------------
@@ -100,10 +90,15 @@ IMAGE_EXTENSIONS = {
     '.webp', '.bmp', '.tiff', '.svg'
 }
 
+MEDIA_EXTENSIONS = {
+    '.mp4', '.avi', '.mov', '.wmv', '.mkv', '.flv', '.webm', '.m4v',
+    '.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a'
+}
+
 SNIPPET_EXTENSIONS = CODE_EXTENSIONS
 IDEALIZE_EXTENSIONS = CODE_EXTENSIONS.keys() | TEXT_EXTENSIONS
 CITATION_EXTENSIONS = TEXT_EXTENSIONS | DOCUMENT_EXTENSIONS
-PROCESS_EXTENSIONS = CODE_EXTENSIONS.keys() | TEXT_EXTENSIONS | DOCUMENT_EXTENSIONS
+PROCESS_EXTENSIONS = CODE_EXTENSIONS.keys() | TEXT_EXTENSIONS | DOCUMENT_EXTENSIONS | MEDIA_EXTENSIONS
 SUPPORTED_EXTENSIONS = CODE_EXTENSIONS.keys() | TEXT_EXTENSIONS | DOCUMENT_EXTENSIONS | IMAGE_EXTENSIONS
 
 EXCLUDE_PATTERNS = {
@@ -168,6 +163,46 @@ PROVIDER_DISPLAY_NAMES = {
     "mistral": "Mistral AI (API)"
 }
 
+# Per-provider request limits for concurrent batch jobs: requests per minute
+# and estimated tokens per minute. Zero means unlimited. Each can be
+# overridden with LLAMACLEANER_<PROVIDER>_RPM / LLAMACLEANER_<PROVIDER>_TPM.
+_DEFAULT_PROVIDER_RPM = {
+    "ollama": 0, "xai": 60, "openai": 60, "anthropic": 50,
+    "gemini": 60, "groq": 30, "cohere": 20, "mistral": 60, "perplexity": 50,
+    "crossref": 300,
+}
+_DEFAULT_PROVIDER_TPM = {
+    "ollama": 0, "xai": 100000, "openai": 100000, "anthropic": 80000,
+    "gemini": 250000, "groq": 30000, "cohere": 40000, "mistral": 100000, "perplexity": 50000,
+}
+PROVIDER_RATE_LIMITS = {
+    name: int(os.environ.get(f"LLAMACLEANER_{name.upper()}_RPM", str(rpm)))
+    for name, rpm in _DEFAULT_PROVIDER_RPM.items()
+}
+PROVIDER_TOKEN_BUDGETS = {
+    name: int(os.environ.get(f"LLAMACLEANER_{name.upper()}_TPM", str(tpm)))
+    for name, tpm in _DEFAULT_PROVIDER_TPM.items()
+}
+
+# Pooled HTTP sessions shared by provider clients: keep-alive connections per
+# provider, default connect/read timeouts in seconds, and retries (with
+# jittered exponential backoff) for connection errors, 429 and 5xx responses.
+HTTP_POOL_SIZE = int(os.environ.get("LLAMACLEANER_HTTP_POOL_SIZE", "16"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("LLAMACLEANER_HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.environ.get("LLAMACLEANER_HTTP_READ_TIMEOUT", "120"))
+HTTP_MAX_RETRIES = int(os.environ.get("LLAMACLEANER_HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = float(os.environ.get("LLAMACLEANER_HTTP_BACKOFF_SECONDS", "1.0"))
+
+# CrossRef DOI enrichment for citations: API base URL (point it at a local
+# stand-in for tests), contact address for CrossRef's polite pool, concurrent
+# lookups, and how long found and not-found DOIs stay cached. The request rate
+# is limited by PROVIDER_RATE_LIMITS["crossref"].
+CROSSREF_API_URL = os.environ.get("LLAMACLEANER_CROSSREF_API_URL", "https://api.crossref.org/works")
+CROSSREF_MAILTO = os.environ.get("LLAMACLEANER_CROSSREF_MAILTO", "")
+DOI_WORKERS = int(os.environ.get("LLAMACLEANER_DOI_WORKERS", "4"))
+DOI_CACHE_MAX_AGE_DAYS = float(os.environ.get("LLAMACLEANER_DOI_CACHE_MAX_AGE_DAYS", "180"))
+DOI_NEGATIVE_CACHE_DAYS = float(os.environ.get("LLAMACLEANER_DOI_NEGATIVE_CACHE_DAYS", "7"))
+
 # =============================================================================
 # Logging and Processing Settings
 # -----------------------------------------------------------------------------
@@ -176,6 +211,40 @@ PROVIDER_DISPLAY_NAMES = {
 LOG_LEVEL = os.environ.get("LLAMACLEANER_LOG_LEVEL", "INFO")
 BATCH_SIZE = int(os.environ.get("LLAMACLEANER_BATCH_SIZE", "100"))
 MAX_FILE_SIZE = int(os.environ.get("LLAMACLEANER_MAX_FILE_SIZE", str(1024 * 1024)))
+# Cap on text extracted from a single document when streaming it in chunks.
+MAX_TEXT_BYTES = int(os.environ.get("LLAMACLEANER_MAX_TEXT_BYTES", str(64 * 1024 * 1024)))
+# Concurrent alt-text requests and how often (in completed images) the
+# alt-text cache is written back to disk.
+IMAGE_WORKERS = int(os.environ.get("LLAMACLEANER_IMAGE_WORKERS", "4"))
+IMAGE_CACHE_FLUSH_EVERY = int(os.environ.get("LLAMACLEANER_IMAGE_CACHE_FLUSH_EVERY", "25"))
+# Processes used to extract snippets from code files (1 disables the pool).
+SNIPPET_WORKERS = int(os.environ.get("LLAMACLEANER_SNIPPET_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Batched rename prompts: files packed into one request, estimated prompt
+# tokens allowed per request, concurrent requests, and characters of each
+# file sent as its content sample.
+RENAME_BATCH_SIZE = int(os.environ.get("LLAMACLEANER_RENAME_BATCH_SIZE", "8"))
+RENAME_BATCH_TOKENS = int(os.environ.get("LLAMACLEANER_RENAME_BATCH_TOKENS", "6000"))
+RENAME_WORKERS = int(os.environ.get("LLAMACLEANER_RENAME_WORKERS", "4"))
+RENAME_SAMPLE_CHARS = int(os.environ.get("LLAMACLEANER_RENAME_SAMPLE_CHARS", "1000"))
+# Map-reduce documentation: concurrent summary requests, characters of each
+# file summarized, and estimated prompt tokens per directory summary request.
+DOCS_WORKERS = int(os.environ.get("LLAMACLEANER_DOCS_WORKERS", "4"))
+DOCS_SAMPLE_CHARS = int(os.environ.get("LLAMACLEANER_DOCS_SAMPLE_CHARS", "4000"))
+DOCS_REDUCE_TOKENS = int(os.environ.get("LLAMACLEANER_DOCS_REDUCE_TOKENS", "6000"))
+# Processes used to tokenize documents for corpus analytics (1 disables the pool).
+CORPUS_WORKERS = int(os.environ.get("LLAMACLEANER_CORPUS_WORKERS", str(min(8, os.cpu_count() or 1))))
+# Threads used by idealize to extract text from files and to rewrite them.
+IDEALIZE_WORKERS = int(os.environ.get("LLAMACLEANER_IDEALIZE_WORKERS", "4"))
+# Longest piece of a document (in characters) idealized in one request;
+# longer documents are split at headings and paragraphs.
+IDEALIZE_CHUNK_CHARS = int(os.environ.get("LLAMACLEANER_IDEALIZE_CHUNK_CHARS", "8000"))
+# Media metadata: ffprobe executable, concurrent ffprobe processes, seconds
+# allowed per probe, and probe results written to the media index
+# (CACHE_DIR/media_index.sqlite3) per transaction.
+FFPROBE_PATH = os.environ.get("LLAMACLEANER_FFPROBE_PATH", "ffprobe")
+MEDIA_PROBE_WORKERS = int(os.environ.get("LLAMACLEANER_MEDIA_PROBE_WORKERS", str(min(8, 2 * (os.cpu_count() or 1)))))
+MEDIA_PROBE_TIMEOUT = float(os.environ.get("LLAMACLEANER_MEDIA_PROBE_TIMEOUT", "60"))
+MEDIA_INDEX_FLUSH_EVERY = int(os.environ.get("LLAMACLEANER_MEDIA_INDEX_FLUSH_EVERY", "200"))
 
 # =============================================================================
 # UI Theming and Accessibility
@@ -235,6 +304,14 @@ RENAME_TEMPLATE = (
     "Example: descriptive_name_for_file_without_extension_six_to_twelve_words"
 )
 
+RENAME_BATCH_TEMPLATE = (
+    RENAME_TEMPLATE[:RENAME_TEMPLATE.index("Respond with ONLY")] +
+    "You will receive several files, each with an id, its current name and a content sample. "
+    "Suggest a filename for every file following the rules above. "
+    "Respond with ONLY a JSON array and no extra text, one object per file, in this exact structure:\n"
+    "[{\"id\": 1, \"filename\": \"descriptive_name_for_file_without_extension\"}, ...]"
+)
+
 IMAGE_ALT_TEXT_TEMPLATE = (
     "You are an AI specializing in describing images for accessibility purposes. "
     "Write comprehensive alt text for this image, as though for a blind engineer who needs "
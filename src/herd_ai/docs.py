@@ -7,9 +7,12 @@
 # and integrates with the rest of the herd_ai ecosystem.
 # =============================================================================
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
 from pathlib import Path
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -19,12 +22,15 @@ from rich.panel import Panel
 # Import configuration and utility functions with fallbacks for various contexts
 # =============================================================================
 try:
-    from herd_ai.utils.file import get_file_text
+    from herd_ai.utils.file import get_file_text, scan_files
     from herd_ai.utils.ai_provider import process_with_ai
-    from herd_ai.rename import generate_description
+    from herd_ai.rename import generate_description, read_rename_sample
+    from herd_ai.utils.cache import get_doc_cache
+    from herd_ai.utils.ratelimit import get_rate_limiter, estimate_tokens
     from herd_ai.citations import extract_citations_from_text
     from herd_ai.utils.analysis import generate_document_summary
     from herd_ai.config import DEFAULT_AI_PROVIDER, CODE_EXTENSIONS, TEXT_EXTENSIONS
+    from herd_ai.config import DOCS_WORKERS, DOCS_SAMPLE_CHARS, DOCS_REDUCE_TOKENS, get_model_for_file
     from herd_ai.utils import config as herd_config
 except Exception as e:
     print(f"Error importing modules in docs.py: {e}")
@@ -32,13 +38,266 @@ except Exception as e:
 
 console = Console()
 
+# =============================================================================
+# Map-reduce summaries
+# -----------------------------------------------------------------------------
+# Large projects are documented hierarchically instead of in one prompt:
+# every file is summarized on its own (concurrently, DOCS_WORKERS at a time),
+# each directory is summarized from its files' and subdirectories' summaries,
+# deepest first, and the root directory's summary is the project summary the
+# README is written from. Summaries live in the shared document cache: a file
+# is keyed by a hash of its content and a directory by the keys of its
+# children, so after editing a few files only they and their ancestor
+# directories are summarized again.
+# =============================================================================
+# Bump when the prompts change so cached summaries are regenerated.
+SUMMARY_VERSION = 1
+
+FILE_SUMMARY_PROMPT = (
+    "You summarize source files for project documentation. In 2-3 sentences, "
+    "state what the file does, its main classes or functions, and how it fits "
+    "into the project. Respond with ONLY the summary."
+)
+DIRECTORY_SUMMARY_PROMPT = (
+    "You summarize parts of a software project for its documentation. Given "
+    "summaries of the files and subdirectories in one directory, write 3-5 "
+    "sentences describing the directory's purpose and its main components. "
+    "Respond with ONLY the summary."
+)
+README_SYSTEM_PROMPT = (
+    "You are a technical documentation expert. Generate a professional README.md file "
+    "based on the file descriptions provided. Include the following sections: "
+    "Overview, Installation, Usage, Features, and Project Structure. "
+    "Format with proper Markdown and use concise, clear language."
+)
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+def _content_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _response_text(raw: Any) -> str:
+    if isinstance(raw, dict):
+        return (raw.get("text") or "").strip()
+    return (raw or "").strip()
+
+def _ask(prompt: str, system_prompt: str, provider: str, placeholder: Path) -> str:
+    """One summary request under the provider's rate limit; our own cache replaces the response cache."""
+    limiter = get_rate_limiter(provider)
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(prompt) + estimate_tokens(system_prompt))
+    return _response_text(process_with_ai(
+        placeholder, prompt, provider=provider, custom_system_prompt=system_prompt, use_cache=False
+    ))
+
+def summarize_file(path: Path, rel: Path, provider: str) -> str:
+    """AI summary of one file's leading DOCS_SAMPLE_CHARS characters ("" on failure)."""
+    sample = read_rename_sample(path, DOCS_SAMPLE_CHARS)
+    if not sample.strip():
+        return ""
+    prompt = f"File: {rel.as_posix()}\n\nContent:\n{sample}"
+    return _ask(prompt, FILE_SUMMARY_PROMPT, provider, path)
+
+def reduce_summaries(
+    label: str,
+    items: List[Tuple[str, str]],
+    provider: str,
+    placeholder: Path,
+    token_budget: Optional[int] = None
+) -> str:
+    """
+    Summarize (name, summary) items into one summary of `label`. Item lists
+    over `token_budget` estimated tokens are summarized in groups first and
+    the group summaries reduced again, so no request outgrows the budget.
+    """
+    token_budget = token_budget or DOCS_REDUCE_TOKENS
+    lines = [f"- {name}: {summary}" for name, summary in items if summary]
+    if not lines:
+        return ""
+    groups: List[List[str]] = [[]]
+    tokens = 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        # At least two items per group, so every round at least halves the list
+        if len(groups[-1]) >= 2 and tokens + cost > token_budget:
+            groups.append([])
+            tokens = 0
+        groups[-1].append(line)
+        tokens += cost
+    if len(groups) > 1:
+        partials = [
+            (f"part {i}", _ask(f"Directory: {label} (part {i} of {len(groups)})\n\n" + "\n".join(group),
+                               DIRECTORY_SUMMARY_PROMPT, provider, placeholder))
+            for i, group in enumerate(groups, 1)
+        ]
+        return reduce_summaries(label, partials, provider, placeholder, token_budget)
+    return _ask(f"Directory: {label}\n\n" + "\n".join(groups[0]), DIRECTORY_SUMMARY_PROMPT, provider, placeholder)
+
+def map_reduce_summaries(
+    directory: Path,
+    files: List[Path],
+    provider: str,
+    log: Callable[[str], None],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """
+    Summarize files, then directories bottom-up, reusing cached summaries.
+
+    Returns:
+        {"files": {relative path: summary}, "directories": {relative dir: summary},
+         "project": root summary, "key": cache key of the root,
+         "stats": {"files_summarized", "files_cached", "directories_summarized",
+                   "directories_cached", "errors"}}
+    """
+    workers = max(1, workers or DOCS_WORKERS)
+    cache = get_doc_cache()
+    placeholder = directory / "README.md.tmp"
+    try:
+        model = get_model_for_file(placeholder, provider)
+    except Exception:
+        model = None
+    stats = {"files_summarized": 0, "files_cached": 0, "directories_summarized": 0,
+             "directories_cached": 0, "errors": 0}
+    keys: Dict[Path, str] = {}
+    summaries: Dict[Path, str] = {}
+    children: Dict[Path, List[Path]] = {Path("."): []}
+
+    # Map: one summary per file, from the cache where the content is unchanged
+    pending = []
+    for p in files:
+        rel = p.relative_to(directory)
+        chain = []
+        node = rel.parent
+        while node not in children:
+            chain.append(node)
+            node = node.parent
+        for new_dir in chain:
+            children[new_dir] = []
+        for new_dir in chain:
+            children[new_dir.parent].append(new_dir)
+        children[rel.parent].append(rel)
+        try:
+            keys[rel] = "docsum:" + _digest(SUMMARY_VERSION, provider, model, "file", rel.name, _content_digest(p))
+        except OSError as e:
+            log(f"[red]Error reading {rel}: {e}[/red]")
+            stats["errors"] += 1
+            keys[rel] = ""
+            summaries[rel] = ""
+            continue
+        cached = cache.get(keys[rel])
+        if cached is not None:
+            summaries[rel] = cached
+            stats["files_cached"] += 1
+            if progress:
+                progress()
+        else:
+            pending.append((p, rel))
+    if pending:
+        log(f"[dim]Summarizing {len(pending)} files ({stats['files_cached']} cached) with {min(workers, len(pending))} workers[/dim]")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(summarize_file, p, rel, provider): (p, rel) for p, rel in pending}
+        for future in as_completed(futures):
+            p, rel = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                log(f"[red]Error summarizing {rel}: {e}[/red]")
+                summary = ""
+            if summary:
+                cache.set(keys[rel], summary)
+                stats["files_summarized"] += 1
+            else:
+                # Not cached, so the file is retried on the next run
+                summary = generate_description(p, provider=provider)[:200]
+                stats["errors"] += 1
+            summaries[rel] = summary
+            if progress:
+                progress()
+
+        # Reduce: directories deepest first, one depth level at a time
+        by_depth: Dict[int, List[Path]] = {}
+        for rel_dir in children:
+            by_depth.setdefault(len(rel_dir.parts), []).append(rel_dir)
+        for depth in sorted(by_depth, reverse=True):
+            level = []
+            for rel_dir in by_depth[depth]:
+                members = sorted(children[rel_dir])
+                keys[rel_dir] = "docsum:" + _digest(
+                    SUMMARY_VERSION, provider, model, "dir", rel_dir.as_posix(), [keys[m] for m in members]
+                )
+                cached = cache.get(keys[rel_dir])
+                if cached is not None:
+                    summaries[rel_dir] = cached
+                    stats["directories_cached"] += 1
+                else:
+                    items = [(m.name + ("/" if m in children else ""), summaries.get(m, "")) for m in members]
+                    label = directory.name if rel_dir == Path(".") else rel_dir.as_posix()
+                    level.append((rel_dir, pool.submit(reduce_summaries, label, items, provider, placeholder)))
+            for rel_dir, future in level:
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    log(f"[red]Error summarizing directory {rel_dir}: {e}[/red]")
+                    summary = ""
+                if summary:
+                    cache.set(keys[rel_dir], summary)
+                    stats["directories_summarized"] += 1
+                else:
+                    stats["errors"] += 1
+                summaries[rel_dir] = summary
+    cache.flush()
+    root = Path(".")
+    return {
+        "files": {rel.as_posix(): summaries.get(rel, "") for rel in keys if rel not in children},
+        "directories": {rel.as_posix(): summaries.get(rel, "") for rel in children},
+        "project": summaries.get(root, ""),
+        "key": keys[root],
+        "stats": stats,
+    }
+
+def build_readme_prompt(tree: Dict[str, Any], token_budget: Optional[int] = None) -> str:
+    """README prompt from map_reduce_summaries() output, kept within about `token_budget` tokens."""
+    token_budget = token_budget or DOCS_REDUCE_TOKENS
+    prompt = "Write a comprehensive README.md for this project.\n\nProject summary:\n" + tree["project"] + "\n"
+    used = estimate_tokens(prompt)
+    sections = [
+        ("Directories", sorted((d, s) for d, s in tree["directories"].items() if d != "." and s)),
+        ("Files", sorted((f, s[:200]) for f, s in tree["files"].items() if s)),
+    ]
+    for title, entries in sections:
+        if not entries:
+            continue
+        lines = []
+        for name, summary in entries:
+            line = f"- **{name}**: {summary}"
+            if used + estimate_tokens(line) > token_budget:
+                lines.append(f"- ... and {len(entries) - len(lines)} more")
+                break
+            lines.append(line)
+            used += estimate_tokens(line)
+        prompt += f"\n{title}:\n" + "\n".join(lines) + "\n"
+    return prompt
+
 # =============================================================================
 # generate_docs
 # -----------------------------------------------------------------------------
 # Generates a comprehensive README.md for a project directory by summarizing
 # all files and leveraging an LLM for professional documentation output.
 # =============================================================================
-def generate_docs(directory: Path, recursive: bool, provider: Optional[str] = None, log_callback: Optional[Any] = None):
+def generate_docs(
+    directory: Path,
+    recursive: bool,
+    provider: Optional[str] = None,
+    log_callback: Optional[Any] = None,
+    map_reduce: bool = True,
+    workers: Optional[int] = None
+):
     """
     Generate a full README.md by summarizing project files with rich feedback.
     Args:
@@ -46,6 +305,10 @@ def generate_docs(directory: Path, recursive: bool, provider: Optional[str] = No
         recursive: If True, scan subdirectories recursively.
         provider: AI provider to use for generation (e.g., "ollama", "xai", "gemini").
         log_callback: Optional callback for logging/progress feedback.
+        map_reduce: Summarize files, directories and the project hierarchically
+            with cached summaries (see map_reduce_summaries); False sends one
+            prompt built from each file's opening text.
+        workers: Concurrent summary requests (default DOCS_WORKERS).
     Returns:
         Dictionary with results of the documentation generation process
     """
@@ -90,14 +353,16 @@ def generate_docs(directory: Path, recursive: bool, provider: Optional[str] = No
             log(f"[yellow]Could not load extension list from config, using defaults. Error: {e}[/yellow]")
             
         entries = []
-        walker = directory.rglob('*') if recursive else directory.glob('*')
         log(f"[dim]Scanning directory: {directory}, recursive={recursive}[/dim]")
         
-        files = [p for p in walker if p.is_file() 
+        # The README this command writes (and its placeholder) are outputs, not
+        # inputs; summarizing them would change the tree on every run
+        outputs = {(directory / "README.md").resolve(), (directory / "README.md.tmp").resolve()}
+        files = [p for p in scan_files(directory, recursive, valid_exts)
+                                  if p.resolve() not in outputs
                                   and not p.name.startswith('.') 
                                   and not p.name.startswith('|_')
-                                  and not any(part.startswith('.') or part.startswith('|_') for part in p.parts)
-                                  and p.suffix.lower() in valid_exts]
+                                  and not any(part.startswith('.') or part.startswith('|_') for part in p.parts)]
                                   
         log(f"[dim]Found {len(files)} code and Markdown files to analyze[/dim]")
         
@@ -110,41 +375,61 @@ def generate_docs(directory: Path, recursive: bool, provider: Optional[str] = No
             
         processed_files = 0
         error_files = 0
+        tree = None
         
         with Progress(SpinnerColumn(), TextColumn("{task.description}"), console=console if not log_callback else None) as progress:
             task = progress.add_task("Analyzing files...", total=len(files))
             
-            for p in files:
-                try:
-                    log(f"[dim]Generating description for {p.name}[/dim]")
-                    desc = generate_description(p, provider=provider)
-                    rel = p.relative_to(directory)
-                    entries.append(f"- **{rel}**: {desc[:200]}")
-                    processed_files += 1
-                except Exception as e:
-                    log(f"[red]Error analyzing {p.name}: {e}[/red]")
-                    error_files += 1
+            if map_reduce:
+                tree = map_reduce_summaries(
+                    directory, files, provider, log, workers=workers,
+                    progress=lambda: progress.update(task, advance=1)
+                )
+                stats = tree["stats"]
+                processed_files = len(files)
+                result.update(stats)
+                log(f"[dim]Summaries: {stats['files_summarized']} files and {stats['directories_summarized']} "
+                    f"directories generated, {stats['files_cached']} files and {stats['directories_cached']} "
+                    f"directories cached[/dim]")
+            else:
+                for p in files:
+                    try:
+                        log(f"[dim]Generating description for {p.name}[/dim]")
+                        desc = generate_description(p, provider=provider)
+                        rel = p.relative_to(directory)
+                        entries.append(f"- **{rel}**: {desc[:200]}")
+                        processed_files += 1
+                    except Exception as e:
+                        log(f"[red]Error analyzing {p.name}: {e}[/red]")
+                        error_files += 1
                     
-                progress.update(task, advance=1)
+                    progress.update(task, advance=1)
                 
-        log(f"[dim]Generated {len(entries)} file descriptions[/dim]")
-        
-        files_block = "\n".join(entries)
-        prompt = "Write a comprehensive README.md:\n\n" + files_block
+        if tree is not None:
+            prompt = build_readme_prompt(tree)
+        else:
+            log(f"[dim]Generated {len(entries)} file descriptions[/dim]")
+            files_block = "\n".join(entries)
+            prompt = "Write a comprehensive README.md:\n\n" + files_block
         log(f"[dim]Sending prompt to {provider} for README generation[/dim]")
         
-        system_prompt = (
-            "You are a technical documentation expert. Generate a professional README.md file "
-            "based on the file descriptions provided. Include the following sections: "
-            "Overview, Installation, Usage, Features, and Project Structure. "
-            "Format with proper Markdown and use concise, clear language."
-        )
-        
         # Use a placeholder file path since we're not processing a specific file
         placeholder_file = directory / "README.md.tmp"
         log(f"[dim]Using placeholder file: {placeholder_file}[/dim]")
         
-        resp = process_with_ai(placeholder_file, prompt, provider=provider, custom_system_prompt=system_prompt)
+        readme_key = None
+        resp = None
+        if tree is not None:
+            readme_key = "docsum:" + _digest(SUMMARY_VERSION, provider, "readme", tree["key"], README_SYSTEM_PROMPT)
+            resp = get_doc_cache().get(readme_key)
+            result["readme_cached"] = resp is not None
+        if resp is None:
+            resp = process_with_ai(placeholder_file, prompt, provider=provider, custom_system_prompt=README_SYSTEM_PROMPT)
+            if isinstance(resp, dict):
+                resp = resp.get("text", "")
+            if readme_key and resp and resp.strip():
+                get_doc_cache().set(readme_key, resp)
+                get_doc_cache().flush()
         readme_path = directory / "README.md"
         
         # Ensure output directory exists
@@ -61,6 +61,18 @@ except ImportError:
 
 console = Console()
 
+def _commands():
+    """
+    The package whose attributes are the subcommands (process_renames,
+    generate_docs, dedupe_files, ...). Each is imported on first access.
+    """
+    try:
+        import herd_ai
+        return herd_ai
+    except ImportError:
+        import llamacleaner
+        return llamacleaner
+
 def main():
     """
     Main entry point for the Herd AI CLI.
@@ -83,63 +95,21 @@ def main():
     sys.path.insert(0, str(parent_dir))
     sys.path.insert(0, str(current_dir))
     os.environ['PYTHONPATH'] = str(parent_dir) + os.pathsep + str(current_dir) + os.pathsep + os.environ.get('PYTHONPATH', '')
-    # Import CLI entry points
+    # Only the configuration is needed to build the parser. Subcommands are
+    # attributes of the package that import their module on first use, so
+    # `herd --help` or `herd --clear-cache` does not load every tool.
     try:
-        from herd_ai.cli import main as cli_main
-        from herd_ai.snippets import process_snippets
-        from herd_ai.rename import process_renames
-        from herd_ai.idealize import process_ideal
-        from herd_ai.docs import generate_docs
-        from herd_ai.citations import process_file_or_directory
-        from herd_ai.image_processor import process_images_cli, process_directory as process_images
-        from herd_ai.utils.scrambler import scramble_directory, generate_sample_files
-        from herd_ai.utils.cache import clear_cache
-        from herd_ai.utils.dedupe import dedupe_files
         from herd_ai.config import AI_PROVIDERS, DEFAULT_AI_PROVIDER
-        from herd_ai.utils.undo_log import log_action, undo_last_action, list_undo_actions
     except ImportError:
         try:
             # Fallback to llamacleaner legacy imports
-            from llamacleaner.cli import main as cli_main
-            from llamacleaner.snippets import process_snippets
-            from llamacleaner.rename import process_renames
-            from llamacleaner.idealize import process_ideal
-            from llamacleaner.docs import generate_docs
-            from llamacleaner.citations import process_file_or_directory
-            from llamacleaner.image_processor import process_images_cli, process_directory as process_images
-            from llamacleaner.utils.scrambler import scramble_directory, generate_sample_files
-            from llamacleaner.utils.cache import clear_cache
-            from llamacleaner.utils.dedupe import dedupe_files
             from llamacleaner.config import AI_PROVIDERS, DEFAULT_AI_PROVIDER
-            # Fallback - undo log might not exist in legacy version
-            try:
-                from llamacleaner.utils.undo_log import log_action, undo_last_action, list_undo_actions
-            except ImportError:
-                def log_action(*args, **kwargs): pass
-                def undo_last_action(*args, **kwargs): console.print("[yellow]Undo functionality not available in legacy version[/yellow]")
-                def list_undo_actions(*args, **kwargs): return []
         except ImportError:
             # Final fallback to direct relative imports
             sys.path.insert(0, str(current_dir.parent.parent))
-            from herd_ai.cli import main as cli_main
-            from herd_ai.snippets import process_snippets
-            from herd_ai.rename import process_renames
-            from herd_ai.idealize import process_ideal
-            from herd_ai.docs import generate_docs
-            from herd_ai.citations import process_file_or_directory
-            from herd_ai.image_processor import process_images_cli, process_directory as process_images
-            from herd_ai.utils.scrambler import scramble_directory, generate_sample_files
-            from herd_ai.utils.cache import clear_cache
-            from herd_ai.utils.dedupe import dedupe_files
             from herd_ai.config import AI_PROVIDERS, DEFAULT_AI_PROVIDER
-            # Fallback - undo log might not exist in direct imports
-            try:
-                from herd_ai.utils.undo_log import log_action, undo_last_action, list_undo_actions
-            except ImportError:
-                def log_action(*args, **kwargs): pass
-                def undo_last_action(*args, **kwargs): console.print("[yellow]Undo functionality not available[/yellow]")
-                def list_undo_actions(*args, **kwargs): return []
-                
+    commands = _commands()
+
     # --- Argument Parsing ---
     parser = argparse.ArgumentParser(description="Herd AI - Document & Code Intelligence")
     parser.add_argument('--dir', '-d', type=str, default=os.getcwd(), help='Project directory (default: current directory)')
@@ -150,15 +120,23 @@ def main():
     parser.add_argument('--idealize', action='store_true', help='Rewrite or enhance content for clarity and accessibility')
     parser.add_argument('--citations', action='store_true', help='Extract and format citations from documents')
     parser.add_argument('--dedupe', action='store_true', help='Deduplicate files based on content similarity')
+    parser.add_argument('--hash-algorithm', type=str, choices=['sha256', 'blake2b', 'xxhash'], default='sha256',
+                       help='Hash algorithm for exact duplicate detection (default: sha256)')
     parser.add_argument('--scramble', action='store_true', help='Randomize filenames for privacy/testing')
     parser.add_argument('--sample', action='store_true', help='Generate sample files for testing')
     parser.add_argument('--clear-cache', action='store_true', help='Remove cached analysis data')
+    parser.add_argument('--ai-cache', action='store_true',
+                       help='Reuse cached AI responses for unchanged files and prompts (same as LLAMACLEANER_AI_CACHE=1)')
     parser.add_argument('--process-all', action='store_true', help='Run all processing tasks in sequence (can choose which to include)')
     parser.add_argument('--undo', action='store_true', help='Undo the last operation')
     parser.add_argument('--gui', action='store_true', help='Launch the Herd AI GUI web application')
     parser.add_argument('--provider', type=str, choices=AI_PROVIDERS, default=DEFAULT_AI_PROVIDER,
                        help=f'AI provider to use (default: {DEFAULT_AI_PROVIDER})')
     parser.add_argument('--batch-size', type=int, default=50, help='Batch size for processing (default: 50)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of parallel workers (default: 1 for dedupe, LLAMACLEANER_IMAGE_WORKERS for images, LLAMACLEANER_SNIPPET_WORKERS for snippets, LLAMACLEANER_DOCS_WORKERS for docs)')
+    parser.add_argument('--image-similarity', type=float, default=0.9,
+                       help='Perceptual hash similarity (0-1) for duplicate images (default: 0.9)')
     parser.add_argument('--api-key', type=str, help='API key for selected provider (if needed)')
     parser.add_argument('--recursive', '-r', action='store_true', help='Process subdirectories recursively')
     parser.add_argument('--non-interactive', '-n', action='store_true', help='Run in non-interactive mode')
@@ -171,6 +149,8 @@ def main():
     # Update environment with API key if provided
     if args.provider == "xai" and args.api_key:
         os.environ["XAI_API_KEY"] = args.api_key
+    if args.ai_cache:
+        os.environ["LLAMACLEANER_AI_CACHE"] = "1"
     
     root = Path(args.dir).resolve()
     
@@ -219,7 +199,7 @@ def main():
     # Handle undo operation if requested
     if args.undo:
         console.print(f"[cyan]Attempting to undo the last operation in {root}[/cyan]")
-        undo_last_action(root)
+        commands.undo_last_action(root)
         return
     
     # If any action flag is present, run the corresponding function(s) and exit
@@ -245,7 +225,7 @@ def main():
     if args.snippets:
         if confirm_action("extracting code snippets"):
             console.print(f"[cyan]Extracting code snippets from {root} using {args.provider}[/cyan]")
-            process_snippets(root, recursive=recursive, exclude_ext=set(), batch_size=args.batch_size, provider=args.provider)
+            commands.process_snippets(root, recursive=recursive, exclude_ext=set(), batch_size=args.batch_size, provider=args.provider, workers=args.workers)
             ran_any = True
         else:
             console.print("[yellow]Skipped code snippet extraction.[/yellow]")
@@ -253,7 +233,7 @@ def main():
     if args.docs:
         if confirm_action("generating documentation"):
             console.print(f"[cyan]Generating documentation from {root} using {args.provider}[/cyan]")
-            generate_docs(root, recursive=recursive, provider=args.provider)
+            commands.generate_docs(root, recursive=recursive, provider=args.provider, workers=args.workers)
             ran_any = True
         else:
             console.print("[yellow]Skipped documentation generation.[/yellow]")
@@ -276,13 +256,14 @@ def main():
                 override_md = Confirm.ask("Override existing markdown file check?", default=True)
             
             # Process images with user preferences
-            process_images_cli(
+            commands.process_images_cli(
                 root, 
                 recursive=recursive, 
                 force=force_reprocess,
                 rename=rename_images, 
                 override_md=override_md,
-                provider=args.provider
+                provider=args.provider,
+                workers=args.workers
             )
             ran_any = True
         else:
@@ -291,7 +272,7 @@ def main():
     if args.rename:
         if confirm_action("renaming files"):
             console.print(f"[cyan]Renaming files in {root} using {args.provider}[/cyan]")
-            process_renames(root, recursive=recursive, exclude_ext=set(), provider=args.provider)
+            commands.process_renames(root, recursive=recursive, exclude_ext=set(), provider=args.provider)
             ran_any = True
         else:
             console.print("[yellow]Skipped file renaming.[/yellow]")
@@ -299,7 +280,7 @@ def main():
     if args.idealize:
         if confirm_action("idealizing content"):
             console.print(f"[cyan]Idealizing content in {root} using {args.provider}[/cyan]")
-            process_ideal(root, recursive=recursive, provider=args.provider)
+            commands.process_ideal(root, recursive=recursive, provider=args.provider)
             ran_any = True
         else:
             console.print("[yellow]Skipped content idealization.[/yellow]")
@@ -307,7 +288,7 @@ def main():
     if args.citations:
         if confirm_action("extracting citations"):
             console.print(f"[cyan]Extracting citations from {root} using {args.provider}[/cyan]")
-            process_file_or_directory(root, recursive=recursive, provider=args.provider)
+            commands.process_file_or_directory(root, recursive=recursive, provider=args.provider)
             ran_any = True
         else:
             console.print("[yellow]Skipped citation extraction.[/yellow]")
@@ -316,13 +297,16 @@ def main():
         if confirm_action("deduplicating files"):
             interactive = not args.non_interactive
             console.print(f"[cyan]Deduplicating files in {root}[/cyan]")
-            dedupe_files(
+            commands.dedupe_files(
                 directory=root, 
                 recursive=recursive,
                 interactive=interactive,
                 delete_duplicates=False,  # Always ask the user first in CLI mode
                 merge_similar=False,      # Always ask the user first in CLI mode
-                output_dir=args.output
+                output_dir=args.output,
+                hash_algorithm=args.hash_algorithm,
+                workers=args.workers,
+                image_similarity=args.image_similarity
             )
             ran_any = True
         else:
@@ -331,7 +315,7 @@ def main():
     if args.scramble:
         if confirm_action("scrambling filenames"):
             console.print(f"[cyan]Scrambling filenames in {root}[/cyan]")
-            scramble_directory(root)
+            commands.scramble_directory(root)
             ran_any = True
         else:
             console.print("[yellow]Skipped filename scrambling.[/yellow]")
@@ -339,7 +323,7 @@ def main():
     if args.sample:
         if confirm_action("generating sample files"):
             console.print(f"[cyan]Generating sample files in {root}[/cyan]")
-            generate_sample_files(root)
+            commands.generate_sample_files(root)
             ran_any = True
         else:
             console.print("[yellow]Skipped sample file generation.[/yellow]")
@@ -347,7 +331,7 @@ def main():
     if args.clear_cache:
         if confirm_action("clearing cache"):
             console.print(f"[cyan]Clearing cache in {root}[/cyan]")
-            clear_cache(root)
+            commands.clear_cache(root)
             ran_any = True
         else:
             console.print("[yellow]Skipped cache clearing.[/yellow]")
@@ -355,7 +339,7 @@ def main():
     # If no action flag is present, launch the interactive CLI
     if not ran_any:
         console.print(f"Starting Herd AI from {root}")
-        cli_main(str(root))
+        commands.main(str(root))
 
     # Handle code executor CLI if requested
     if getattr(args, 'exec', False):
@@ -380,6 +364,7 @@ def main():
 
 def run_process_all(root, args):
     """Run all processing tasks in sequence, allowing user to toggle which to include"""
+    commands = _commands()
     tasks = {
         "dedupe": {"enabled": True, "description": "Deduplicate files"},
         "rename": {"enabled": True, "description": "Rename files based on content"},
@@ -429,39 +414,42 @@ def run_process_all(root, args):
     if tasks["dedupe"]["enabled"]:
         console.print("[cyan]Step 1: Deduplicating files[/cyan]")
         interactive = not args.non_interactive
-        dedupe_files(
+        commands.dedupe_files(
             directory=root, 
             recursive=recursive,
             interactive=interactive,
             delete_duplicates=False,
             merge_similar=False,
-            output_dir=args.output
+            output_dir=args.output,
+            hash_algorithm=args.hash_algorithm,
+            workers=args.workers,
+            image_similarity=args.image_similarity
         )
-        log_action(root, "dedupe", {"recursive": recursive})
+        commands.log_action(root, "dedupe", {"recursive": recursive})
     
     # Rename files if enabled
     if tasks["rename"]["enabled"]:
         console.print("[cyan]Step 2: Renaming files based on content[/cyan]")
-        process_renames(root, recursive=recursive, exclude_ext=set(), provider=args.provider)
-        log_action(root, "rename", {"recursive": recursive, "provider": args.provider})
+        commands.process_renames(root, recursive=recursive, exclude_ext=set(), provider=args.provider)
+        commands.log_action(root, "rename", {"recursive": recursive, "provider": args.provider})
     
     # Process snippets if enabled
     if tasks["snippets"]["enabled"]:
         console.print("[cyan]Step 3: Extracting code snippets[/cyan]")
-        process_snippets(root, recursive=recursive, exclude_ext=set(), batch_size=args.batch_size, provider=args.provider)
-        log_action(root, "snippets", {"recursive": recursive, "provider": args.provider})
+        commands.process_snippets(root, recursive=recursive, exclude_ext=set(), batch_size=args.batch_size, provider=args.provider, workers=args.workers)
+        commands.log_action(root, "snippets", {"recursive": recursive, "provider": args.provider})
     
     # Extract citations if enabled
     if tasks["citations"]["enabled"]:
         console.print("[cyan]Step 4: Extracting citations[/cyan]")
-        process_file_or_directory(root, recursive=recursive, provider=args.provider)
-        log_action(root, "citations", {"recursive": recursive, "provider": args.provider})
+        commands.process_file_or_directory(root, recursive=recursive, provider=args.provider)
+        commands.log_action(root, "citations", {"recursive": recursive, "provider": args.provider})
     
     # Idealize content if enabled
     if tasks["idealize"]["enabled"]:
         console.print("[cyan]Step 5: Idealizing content[/cyan]")
-        process_ideal(root, recursive=recursive, provider=args.provider)
-        log_action(root, "idealize", {"recursive": recursive, "provider": args.provider})
+        commands.process_ideal(root, recursive=recursive, provider=args.provider)
+        commands.log_action(root, "idealize", {"recursive": recursive, "provider": args.provider})
     
     # Process images if enabled
     if tasks["images"]["enabled"]:
@@ -481,15 +469,16 @@ def run_process_all(root, args):
             override_md = Confirm.ask("Override existing markdown file check?", default=True)
         
         # Process images with appropriate options
-        process_images_cli(
+        commands.process_images_cli(
             root, 
             recursive=recursive, 
             force=force_reprocess,
             rename=rename_images, 
             override_md=override_md,
-            provider=args.provider
+            provider=args.provider,
+            workers=args.workers
         )
-        log_action(root, "images", {
+        commands.log_action(root, "images", {
             "recursive": recursive, 
             "provider": args.provider,
             "generate_md": generate_md,
@@ -501,8 +490,8 @@ def run_process_all(root, args):
     # Generate documentation if enabled
     if tasks["docs"]["enabled"]:
         console.print("[cyan]Step 7: Generating documentation[/cyan]")
-        generate_docs(root, recursive=recursive, provider=args.provider)
-        log_action(root, "docs", {"recursive": recursive, "provider": args.provider})
+        commands.generate_docs(root, recursive=recursive, provider=args.provider, workers=args.workers)
+        commands.log_action(root, "docs", {"recursive": recursive, "provider": args.provider})
     
     console.print("[bold green]Comprehensive processing completed![/bold green]")
     console.print("Use 'herd --undo' to revert the last operation if needed.")
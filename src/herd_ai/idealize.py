@@ -6,11 +6,16 @@
 # logging, and batch processing. Integrates with project config and utilities.
 ###############################################################################
 
+import hashlib
 import json
+import re
+import threading
+import zlib
 from json import JSONDecodeError
 from pathlib import Path
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Set, Dict, Any, Optional, Callable, Union, Tuple
 
 from rich.console import Console
@@ -24,20 +29,29 @@ from rich.panel import Panel
 ###############################################################################
 try:
     try:
-        from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER
+        from herd_ai.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER, IDEALIZE_WORKERS, IDEALIZE_CHUNK_CHARS, get_model_for_file
         from herd_ai.utils.file import get_file_text, clean_filename
         from herd_ai.utils.ai_provider import process_with_ai
+        from herd_ai.utils.minhash import MinHasher, LSHIndex, shingle_hashes
+        from herd_ai.utils.cache import get_doc_cache
+        from herd_ai.utils.ratelimit import get_rate_limiter, estimate_tokens
         from herd_ai.utils import config as herd_config
     except ImportError:
         try:
-            from llamacleaner.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER
+            from llamacleaner.config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER, IDEALIZE_WORKERS, IDEALIZE_CHUNK_CHARS, get_model_for_file
             from llamacleaner.utils.file import get_file_text, clean_filename
             from llamacleaner.utils.ai_provider import process_with_ai
+            from llamacleaner.utils.minhash import MinHasher, LSHIndex, shingle_hashes
+            from llamacleaner.utils.cache import get_doc_cache
+            from llamacleaner.utils.ratelimit import get_rate_limiter, estimate_tokens
             from llamacleaner.utils import config as herd_config
         except ImportError:
-            from config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER
+            from config import TEXT_EXTENSIONS, DOCUMENT_EXTENSIONS, DEFAULT_AI_PROVIDER, IDEALIZE_WORKERS, IDEALIZE_CHUNK_CHARS, get_model_for_file
             from utils.file import get_file_text, clean_filename
             from utils.ai_provider import process_with_ai
+            from utils.minhash import MinHasher, LSHIndex, shingle_hashes
+            from utils.cache import get_doc_cache
+            from utils.ratelimit import get_rate_limiter, estimate_tokens
             from utils import config as herd_config
 except Exception as e:
     print(f"Error importing modules in idealize.py: {e}")
@@ -45,16 +59,198 @@ except Exception as e:
     TEXT_EXTENSIONS = {".txt", ".md", ".rst", ".log", ".json", ".xml", ".yaml", ".yml", ".ini", ".cfg", ".conf"}
     DOCUMENT_EXTENSIONS = {".pdf", ".docx", ".doc", ".rtf", ".odt"}
     DEFAULT_AI_PROVIDER = "xai"
+    IDEALIZE_WORKERS = 4
+    IDEALIZE_CHUNK_CHARS = 8000
     herd_config = None
+    def get_doc_cache():
+        return None
+    def get_rate_limiter(provider):
+        return None
+    def estimate_tokens(text):
+        return len(text) // 4
+    def get_model_for_file(file_path, provider="ollama"):
+        return None
 
 console = Console()
 
+###############################################################################
+# Chunked idealization
+#
+# Documents longer than IDEALIZE_CHUNK_CHARS are idealized in pieces. The text
+# is cut between paragraphs, preferring Markdown headings; other cut points
+# are content-defined (after a paragraph whose CRC is divisible by 8), so an
+# edit only moves the boundaries next to it. Pieces are rewritten
+# concurrently and stitched back together in order. Each piece's result is
+# cached by a hash of the provider, model, prompts and piece text, so after
+# editing one section only that section is sent again.
+###############################################################################
+IDEALIZE_SYSTEM_PROMPT = (
+    "You are an expert content editor specializing in enhancement and optimization. "
+    "Your task is to create an idealized version of the provided content. "
+    "Clean it up, fix errors, improve clarity, and enhance the overall quality. "
+    "Maintain the original meaning and intent, but make it more concise, clear, and polished. "
+    "Respond only with the improved content, no explanations needed."
+)
+
+_HEADING_RE = re.compile(r'#{1,6}\s')
+# A paragraph and the blank lines after it (or the rest of the text). Blank
+# lines at the start of the text belong to the first paragraph.
+_PARAGRAPH_RE = re.compile(r'\s*.*?(?:\n[ \t]*\n\s*|\Z)', re.DOTALL)
+# Serializes choosing output names, backups and undo log updates across threads.
+_write_lock = threading.Lock()
+
+def _paragraphs(text: str, max_chars: int):
+    for match in _PARAGRAPH_RE.finditer(text):
+        unit = match.group(0)
+        while len(unit) > max_chars:
+            # Cut after a line that leaves text on both sides, so that no
+            # piece is only whitespace
+            first, last = len(unit) - len(unit.lstrip()), len(unit.rstrip())
+            end = min(max_chars, last - 1)
+            cut = unit.rfind("\n", first, end) + 1 or (end if end > first else max_chars)
+            yield unit[:cut]
+            unit = unit[cut:]
+        if unit:
+            yield unit
+
+def split_sections(text: str, max_chars: Optional[int] = None) -> List[str]:
+    """
+    Split text into pieces of at most `max_chars` characters (default
+    IDEALIZE_CHUNK_CHARS). Text that fits is returned whole. The pieces join
+    back to the text, and none is only whitespace unless the text has a
+    whitespace run longer than `max_chars`.
+    """
+    max_chars = max_chars or IDEALIZE_CHUNK_CHARS
+    if len(text) <= max_chars:
+        return [text]
+    chunks: List[str] = []
+    current = ""
+    boundary = False
+    for unit in _paragraphs(text, max_chars):
+        if current and (
+            len(current) + len(unit) > max_chars
+            or (len(current) >= max_chars // 4 and (boundary or _HEADING_RE.match(unit)))
+        ):
+            chunks.append(current)
+            current = ""
+        current += unit
+        boundary = zlib.crc32(unit.encode("utf-8")) % 8 == 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _response_text(raw: Any) -> str:
+    if isinstance(raw, dict):
+        return raw.get("text", "") or ""
+    return raw or ""
+
+def _ask(file_path: Path, prompt: str, provider: str, slots: Optional[threading.Semaphore],
+         system_prompt: Optional[str] = None) -> str:
+    """One AI request, holding a request slot and passing the provider's rate limiter."""
+    if slots is not None:
+        slots.acquire()
+    try:
+        limiter = get_rate_limiter(provider)
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(prompt))
+        return _response_text(process_with_ai(
+            file_path, prompt, provider=provider, custom_system_prompt=system_prompt, use_cache=False
+        ))
+    finally:
+        if slots is not None:
+            slots.release()
+
+def idealize_chunk(
+    chunk: str,
+    file_path: Path,
+    provider: str,
+    whole: bool = True,
+    slots: Optional[threading.Semaphore] = None
+) -> Tuple[str, bool]:
+    """
+    Idealized text for one piece of a document ("" on failure), and whether
+    it came from the cache. `whole` marks a document sent in one piece.
+    """
+    if whole:
+        prompt = (
+            f"Create an idealized version of this content from: {file_path.name}\n\n"
+            f"```\n{chunk}\n```\n\n"
+            "Clean it up, fix errors, improve clarity, and enhance the overall quality."
+        )
+    else:
+        prompt = (
+            f"Create an idealized version of this section of a longer document ({file_path.name}). "
+            "Keep its headings and structure; it will be joined with the other sections.\n\n"
+            f"```\n{chunk}\n```\n\n"
+            "Clean it up, fix errors, improve clarity, and enhance the overall quality."
+        )
+    try:
+        model = get_model_for_file(file_path, provider)
+    except Exception:
+        model = None
+    key = "ideal:" + hashlib.sha256(
+        json.dumps([provider, model, IDEALIZE_SYSTEM_PROMPT, prompt]).encode("utf-8")
+    ).hexdigest()
+    cache = get_doc_cache()
+    if cache is not None:
+        cached = cache.get(key)
+        if cached:
+            return cached, True
+    text = _ask(file_path, prompt, provider, slots, IDEALIZE_SYSTEM_PROMPT).strip()
+    if text and cache is not None:
+        cache.set(key, text)
+    return text, False
+
+def idealize_text(
+    content: str,
+    file_path: Path,
+    provider: str,
+    workers: Optional[int] = None,
+    slots: Optional[threading.Semaphore] = None,
+    log: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Idealize a document piece by piece (see split_sections) on up to
+    `workers` threads. `slots` bounds requests in flight when several files
+    are idealized at once.
+
+    Returns:
+        {"text": stitched result, or None if any piece failed,
+         "chunks": pieces, "cached": pieces answered from the cache, "failed": pieces}
+    """
+    workers = max(1, workers or IDEALIZE_WORKERS)
+    chunks = split_sections(content)
+    results = [""] * len(chunks)
+    cached = 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = {
+            pool.submit(idealize_chunk, chunk, file_path, provider, len(chunks) == 1, slots): i
+            for i, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i], hit = future.result()
+                cached += hit
+            except Exception as e:
+                if log:
+                    log(f"[red]Error idealizing section {i + 1}/{len(chunks)} of {file_path.name}: {e}[/]")
+    failed = sum(1 for text in results if not text)
+    # Successful pieces stay cached, so a retry only resends the failed ones
+    return {
+        "text": None if failed else "\n\n".join(results),
+        "chunks": len(chunks),
+        "cached": cached,
+        "failed": failed,
+    }
+
 ###############################################################################
 # process_single_file
 #
 # Processes a single file for idealization:
 # - Validates file type and content
-# - Uses LLM to generate an idealized version
+# - Uses LLM to generate an idealized version, in concurrent pieces for long
+#   documents (see idealize_text)
 # - Writes the idealized file to a designated directory
 # - Backs up the original file
 # - Logs the operation for undo functionality
@@ -64,7 +260,9 @@ def process_single_file(
     file_path: Path,
     omni_paths: Dict[str, Any],
     log_callback: Optional[Callable[[str], None]] = None,
-    provider: Optional[str] = None
+    provider: Optional[str] = None,
+    workers: Optional[int] = None,
+    slots: Optional[threading.Semaphore] = None
 ) -> Dict[str, Any]:
     result = {
         "file": str(file_path),
@@ -108,26 +306,19 @@ def process_single_file(
             log(f"[yellow]Empty file: {file_path}[/]")
             return result
 
-        system_prompt = (
-            "You are an expert content editor specializing in enhancement and optimization. "
-            "Your task is to create an idealized version of the provided content. "
-            "Clean it up, fix errors, improve clarity, and enhance the overall quality. "
-            "Maintain the original meaning and intent, but make it more concise, clear, and polished. "
-            "Respond only with the improved content, no explanations needed."
-        )
-
-        prompt = (
-            f"Create an idealized version of this content from: {file_path.name}\n\n"
-            f"```\n{content}\n```\n\n"
-            "Clean it up, fix errors, improve clarity, and enhance the overall quality."
-        )
-
         log(f"[cyan]Generating idealized content for: {file_path.name}[/]")
-        resp = process_with_ai(file_path, prompt, provider=provider, custom_system_prompt=system_prompt)
+        outcome = idealize_text(content, file_path, provider, workers=workers, slots=slots, log=log)
+        result["chunks"] = outcome["chunks"]
+        result["chunks_cached"] = outcome["cached"]
+        if outcome["chunks"] > 1:
+            log(f"[dim]{file_path.name}: {outcome['chunks']} sections, {outcome['cached']} cached[/dim]")
+        resp = outcome["text"]
 
         if not resp or not resp.strip():
             result["error"] = "No response from LLM"
-            log(f"[yellow]No response from LLM for: {file_path.name}[/]")
+            if outcome["failed"] and outcome["chunks"] > 1:
+                result["error"] = f"No response from LLM for {outcome['failed']} of {outcome['chunks']} sections"
+            log(f"[yellow]{result['error']} for: {file_path.name}[/]")
             return result
 
         name_prompt = (
@@ -136,8 +327,27 @@ def process_single_file(
             f"{resp[:1000] if len(resp) > 1000 else resp}"
         )
 
-        name_raw = process_with_ai(file_path, name_prompt, provider=provider)
+        name_raw = _ask(file_path, name_prompt, provider, slots)
         filename = clean_filename(name_raw) if name_raw else f"ideal_{file_path.stem}"
+        with _write_lock:
+            return _write_idealized(file_path, resp, filename, ideal_dir, backup_dir, base_dir, omni_paths, result, log)
+    except Exception as e:
+        result["error"] = str(e)
+        log(f"[red]Error processing {file_path.name}: {e}[/]")
+        return result
+
+def _write_idealized(
+    file_path: Path,
+    resp: str,
+    filename: str,
+    ideal_dir: Path,
+    backup_dir: Path,
+    base_dir: Path,
+    omni_paths: Dict[str, Any],
+    result: Dict[str, Any],
+    log: Callable[[str], None]
+) -> Dict[str, Any]:
+    try:
         ideal_path = ideal_dir / f"{filename}{file_path.suffix}"
 
         if ideal_path.exists():
@@ -200,15 +410,18 @@ def process_single_file(
 ###############################################################################
 # batch_process_files
 #
-# Processes a list of files in batches for idealization. Tracks statistics
-# for total, idealized, backed up, and error counts. Uses process_single_file.
+# Processes a list of files for idealization, up to batch_size files at a
+# time on threads, with at most `workers` AI requests in flight across all of
+# them. Tracks statistics for total, idealized, backed up, and error counts.
+# Uses process_single_file.
 ###############################################################################
 def batch_process_files(
     files: List[Path],
     omni_paths: Dict[str, Any],
     log_callback: Optional[Callable[[str], None]] = None,
     batch_size: int = 10,
-    provider: Optional[str] = None
+    provider: Optional[str] = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     def log(msg: str) -> None:
         if log_callback:
@@ -236,58 +449,117 @@ def batch_process_files(
         "errors": 0
     }
 
-    batches = [files[i:i+batch_size] for i in range(0, len(files), batch_size)]
-    log(f"[cyan]Processing {len(files)} files in {len(batches)} batches[/]")
-
-    for batch_idx, batch in enumerate(batches, 1):
-        log(f"[cyan]Processing batch {batch_idx}/{len(batches)} ({len(batch)} files)[/]")
-        for file_idx, file_path in enumerate(batch, 1):
-            log(f"[cyan]Processing file {file_idx}/{len(batch)} in batch {batch_idx}: {file_path.name}[/]")
-            result = process_single_file(file_path, omni_paths, log_callback, provider=provider)
-            if result["idealized"]:
-                stats["idealized"] += 1
-            if result["backed_up"]:
-                stats["backed_up"] += 1
-            if result["error"]:
-                stats["errors"] += 1
+    # One pool of request slots is shared by every file and every section, so
+    # long documents and many small files both keep `workers` requests in flight
+    workers = max(1, workers or IDEALIZE_WORKERS)
+    slots = threading.BoundedSemaphore(workers)
+    batch_size = max(1, batch_size)
+    log(f"[cyan]Processing {len(files)} files, {workers} requests at a time[/]")
+
+    def record(result: Dict[str, Any]) -> None:
+        if result["idealized"]:
+            stats["idealized"] += 1
+        if result["backed_up"]:
+            stats["backed_up"] += 1
+        if result["error"]:
+            stats["errors"] += 1
+
+    # At most batch_size files are read and in progress at once
+    with ThreadPoolExecutor(max_workers=min(batch_size, len(files))) as pool:
+        pending = set()
+        for file_idx, file_path in enumerate(files, 1):
+            if len(pending) >= batch_size:
+                done = next(as_completed(pending))
+                pending.remove(done)
+                record(done.result())
+            log(f"[cyan]Processing file {file_idx}/{len(files)}: {file_path.name}[/]")
+            pending.add(pool.submit(
+                process_single_file, file_path, omni_paths, log_callback,
+                provider=provider, workers=workers, slots=slots
+            ))
+        for future in as_completed(pending):
+            record(future.result())
 
     return stats
 
 ###############################################################################
 # group_similar_files
 #
-# Groups files by content similarity using difflib's SequenceMatcher.
-# Returns a list of groups, each group being a list of Path objects.
+# Groups files by content similarity. Each file's text is extracted once, on
+# IDEALIZE_WORKERS threads, and reduced to its set of word 3-shingles. MinHash
+# signatures over those sets are bucketed with banded LSH, so only files that
+# share a bucket are compared, by the exact Jaccard similarity of their
+# shingle sets. Files whose similarity reaches `threshold` are joined with
+# union-find, so groups are transitive. Returns a list of groups (singletons
+# included), each a list of Path objects, in the order files were given.
 ###############################################################################
-def group_similar_files(files: List[Path]) -> List[List[Path]]:
-    from difflib import SequenceMatcher
+# Jaccard similarity of word 3-shingles at which files are grouped.
+GROUP_SIMILARITY_THRESHOLD = 0.5
+# LSH threshold, kept below GROUP_SIMILARITY_THRESHOLD so near-threshold
+# pairs are still proposed as candidates.
+GROUP_LSH_THRESHOLD = 0.35
 
-    groups = []
-    used = set()
+def _read_text(path: Path) -> str:
+    try:
+        return get_file_text(path) or ""
+    except Exception as e:
+        console.print(f"[yellow]Could not read {path}: {e}[/yellow]")
+        return ""
 
-    for i, file1 in enumerate(files):
-        if file1 in used:
+def group_similar_files(
+    files: List[Path],
+    threshold: float = GROUP_SIMILARITY_THRESHOLD,
+    workers: Optional[int] = None
+) -> List[List[Path]]:
+    if not files:
+        return []
+    workers = max(1, workers or IDEALIZE_WORKERS)
+    hasher = MinHasher()
+
+    def signature(path: Path) -> Tuple[Set[int], Optional[Tuple[int, ...]]]:
+        hashes = shingle_hashes(_read_text(path))
+        return hashes, hasher.signature_from_hashes(hashes) if hashes else None
+
+    # NumPy releases the GIL while hashing, so signatures are built on the same threads
+    with ThreadPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        shingles, signatures = zip(*pool.map(signature, files))
+
+    parent = list(range(len(files)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # Identical shingle sets (including empty files) need no LSH
+    first_seen: Dict[frozenset, int] = {}
+    index = LSHIndex(min(threshold, GROUP_LSH_THRESHOLD), hasher.num_perm)
+    for i, hashes in enumerate(shingles):
+        key = frozenset(hashes)
+        if key in first_seen:
+            union(first_seen[key], i)
             continue
+        first_seen[key] = i
+        if signatures[i] is not None:
+            index.add(i, signatures[i])
 
-        group = [file1]
-        used.add(file1)
-        content1 = get_file_text(file1)
-
-        for file2 in files[i+1:]:
-            if file2 in used:
-                continue
-
-            content2 = get_file_text(file2)
-            similarity = SequenceMatcher(None, content1, content2).quick_ratio()
-
-            if similarity > 0.7:
-                group.append(file2)
-                used.add(file2)
-
-        if len(group) >= 1:
-            groups.append(group)
-
-    return groups
+    for i, j in index.candidate_pairs():
+        if find(i) == find(j):
+            continue
+        a, b = shingles[i], shingles[j]
+        if len(a & b) >= threshold * len(a | b):
+            union(i, j)
+
+    groups: Dict[int, List[Path]] = {}
+    for i, path in enumerate(files):
+        groups.setdefault(find(i), []).append(path)
+    return list(groups.values())
 
 ###############################################################################
 # process_ideal
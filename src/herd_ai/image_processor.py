@@ -13,9 +13,7 @@
 
 import os
 import logging
-import base64
 import tempfile
-import io
 import gc
 import json
 import re
@@ -23,6 +21,8 @@ import shutil
 import time
 import sys
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Union, Any, List, Set, Callable
 
@@ -36,7 +36,7 @@ from rich.prompt import Prompt
 # PIL Import and Fallback Handling
 ###############################################################################
 try:
-    from PIL import Image, ExifTags, ImageFile
+    from PIL import ExifTags, ImageFile
     ImageFile.LOAD_TRUNCATED_IMAGES = True
     PIL_AVAILABLE = True
 except ImportError:
@@ -47,26 +47,43 @@ except ImportError:
 ###############################################################################
 try:
     try:
-        from herd_ai.config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE
+        from herd_ai.config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE, IMAGE_WORKERS, IMAGE_CACHE_FLUSH_EVERY
         from herd_ai.utils.file import extract_text_from_image, get_image_dimensions, embed_alt_text_into_image
         from herd_ai.utils.ai_provider import process_with_ai
-        from herd_ai.utils.file import clean_filename, get_cache_key
+        from herd_ai.utils.file import clean_filename, get_cache_key, scan_files
+        from herd_ai.utils.ratelimit import get_rate_limiter, estimate_tokens
+        from herd_ai.utils.sessions import get_http_stats
+        from herd_ai.utils.imaging import DecodedImage
+        from herd_ai.utils.image_metadata import embed_alt_text_bulk
+        from herd_ai.utils.file import read_alt_text
     except ImportError:
         try:
-            from llamacleaner.config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE
+            from llamacleaner.config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE, IMAGE_WORKERS, IMAGE_CACHE_FLUSH_EVERY
             from llamacleaner.utils.file import extract_text_from_image, get_image_dimensions, embed_alt_text_into_image
             from llamacleaner.utils.ai_provider import process_with_ai
-            from llamacleaner.utils.file import clean_filename, get_cache_key
+            from llamacleaner.utils.file import clean_filename, get_cache_key, scan_files
+            from llamacleaner.utils.ratelimit import get_rate_limiter, estimate_tokens
+            from llamacleaner.utils.sessions import get_http_stats
+            from llamacleaner.utils.imaging import DecodedImage
+            from llamacleaner.utils.image_metadata import embed_alt_text_bulk
+            from llamacleaner.utils.file import read_alt_text
         except ImportError:
-            from config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE
+            from config import IMAGE_EXTENSIONS, DEFAULT_AI_PROVIDER, IMAGE_ALT_TEXT_TEMPLATE, IMAGE_WORKERS, IMAGE_CACHE_FLUSH_EVERY
             from utils.file import extract_text_from_image, get_image_dimensions, embed_alt_text_into_image
             from utils.ai_provider import process_with_ai
-            from utils.file import clean_filename, get_cache_key
+            from utils.file import clean_filename, get_cache_key, scan_files
+            from utils.ratelimit import get_rate_limiter, estimate_tokens
+            from utils.sessions import get_http_stats
+            from utils.imaging import DecodedImage
+            from utils.image_metadata import embed_alt_text_bulk
+            from utils.file import read_alt_text
 except Exception as e:
     print(f"Error importing modules in image_processor.py: {e}")
     print("Make sure you're running from the project directory or the package is installed.")
     IMAGE_EXTENSIONS = set([".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg", ".tiff", ".tif"])
     DEFAULT_AI_PROVIDER = "xai"
+    IMAGE_WORKERS = 4
+    IMAGE_CACHE_FLUSH_EVERY = 25
     IMAGE_ALT_TEXT_TEMPLATE = (
         "You are an AI specializing in describing images for accessibility purposes. "
         "Write comprehensive alt text for this image, as though for a blind engineer who needs "
@@ -86,18 +103,38 @@ except Exception as e:
         return None
     def embed_alt_text_into_image(path, alt_text):
         pass
-    def process_with_ai(file_path, prompt, provider=None, custom_system_prompt=None):
+    def process_with_ai(file_path, prompt, provider=None, custom_system_prompt=None, **kwargs):
+        return None
+    def get_rate_limiter(provider):
+        return None
+    def estimate_tokens(text):
+        return len(text) // 4
+    def get_http_stats():
+        return {}
+    DecodedImage = None
+    def embed_alt_text_bulk(items, workers=4, fallback=None):
+        return {"files": 0, "in_place": 0, "copy": 0, "fallback": 0, "errors": 0, "bytes_written": 0}
+    def read_alt_text(path):
         return None
     def clean_filename(name):
         return name.lower().replace(' ', '_')
     def get_cache_key(path_str):
         import hashlib
         return hashlib.md5(path_str.encode('utf-8')).hexdigest()
+    def scan_files(directory, recursive=True, extensions=None):
+        walker = Path(directory).rglob('*') if recursive else Path(directory).glob('*')
+        return sorted(p for p in walker if p.is_file()
+                      and (extensions is None or p.suffix.lower() in extensions))
 
 logger = logging.getLogger(__name__)
 console = Console()
 
 ALT_CACHE_FILE = "alt_text_cache.json"
+# Estimated tokens for the image and JSON response of one alt-text request,
+# added to the prompt text when charging a provider's token budget.
+IMAGE_REQUEST_TOKENS = 2000
+# Longest time completed results may sit unsaved in the alt-text cache.
+ALT_CACHE_FLUSH_SECONDS = 30
 SUPPORTED_CONVERT_EXTS = {'.heic', '.heif', '.webp', '.gif'}
 
 try:
@@ -128,6 +165,9 @@ class ImageProcessor:
         self.alt_cache: Dict[str, Any] = {}
         self.omni_paths = omni_paths or {}
         self.provider = provider or DEFAULT_AI_PROVIDER
+        # Shared by every worker thread using this processor
+        self.rate_limiter = get_rate_limiter(self.provider)
+        self._rename_lock = threading.Lock()
         if not PIL_AVAILABLE:
             logger.warning("PIL/Pillow not installed. Image processing capabilities will be limited.")
 
@@ -144,29 +184,8 @@ class ImageProcessor:
         Returns a tuple of (image_data, error_message).
         """
         try:
-            with Image.open(image_path) as img:
-                if img.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'RGBA':
-                        background.paste(img, mask=img.split()[3])
-                    else:
-                        background.paste(img, mask=img.split()[1])
-                    img = background
-                elif img.mode not in ('RGB', 'L'):
-                    img = img.convert('RGB')
-                if img.size[0] * img.size[1] > 4000000:
-                    img.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
-                buffer = io.BytesIO()
-                save_kwargs = {}
-                if img.format == 'JPEG':
-                    save_kwargs['quality'] = 85
-                    save_kwargs['optimize'] = True
-                elif img.format == 'PNG':
-                    save_kwargs['optimize'] = True
-                else:
-                    save_kwargs['quality'] = 85
-                img.save(buffer, format='JPEG', **save_kwargs)
-                return buffer.getvalue(), None
+            with DecodedImage(image_path) as image:
+                return image.jpeg_bytes(), None
         except Exception as e:
             return None, f"Error converting image: {str(e)}"
 
@@ -204,11 +223,16 @@ class ImageProcessor:
             log(f"[yellow]PIL/Pillow not available for image processing: {file_path}[/]")
             result["error"] = "PIL/Pillow not available"
             return result
+        # One decoded image serves dimensions, OCR and the provider payload
+        image = None
         try:
             base_dir = omni_paths.get("base_dir", file_path.parent / ".herd")
             if isinstance(base_dir, str):
                 base_dir = Path(base_dir)
-            before_dims = get_image_dimensions(file_path)
+            image = DecodedImage(file_path)
+            before_dims = image.size
+            if before_dims is None:
+                before_dims = get_image_dimensions(file_path)
             result["dimensions"] = before_dims
             log(f"[bold blue]Processing image:[/] {file_path.name} ({before_dims})")
             model = None
@@ -234,12 +258,16 @@ class ImageProcessor:
                 log(f"[cyan]Using model: {model} for {file_path.name}[/cyan]")
             except Exception as e:
                 log(f"[yellow]Could not determine model: {e}[/]")
-            image_data, error = self.convert_image_for_processing(file_path)
-            if error:
+            # OCR first: it needs full resolution, and the payload thumbnail is
+            # then derived from the same decode instead of a second one
+            ocr = extract_text_from_image(file_path, image=image) or ""
+            try:
+                image_data = image.jpeg_bytes()
+            except Exception as e:
+                error = f"Error converting image: {str(e)}"
                 log(f"[yellow]{error}[/]")
                 result["error"] = error
                 return result
-            ocr = extract_text_from_image(file_path) or ""
             prompt = (
                 "You will receive both OCR-extracted text and a base64-encoded image. "
                 "Return a JSON object with the following keys:\n"
@@ -250,23 +278,28 @@ class ImageProcessor:
                 f"OCR Text: {ocr[:1000]}\n"
                 f"Current filename: {file_path.name}\n"
             )
+            request_tokens = estimate_tokens(prompt) + IMAGE_REQUEST_TOKENS
             if image_data:
-                b64 = base64.b64encode(image_data).decode('utf-8')
+                b64 = image.base64()
                 if len(b64) < 500000:
                     prompt += f"Image Base64: {b64}"
                 else:
                     prompt += "Image Base64: [Image too large, using OCR text only]"
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(request_tokens)
+                if waited > 1:
+                    log(f"[dim]Rate limited: waited {waited:.1f}s for {self.provider}[/dim]")
             log(f"[cyan]Analyzing image with {self.provider}: {file_path.name}[/cyan]")
             start_time = time.time()
             data = {}
             if self.provider == "xai":
-                data = process_with_ai(file_path, prompt, provider=self.provider, custom_system_prompt=IMAGE_ALT_TEXT_TEMPLATE)
+                data = process_with_ai(file_path, prompt, provider=self.provider, custom_system_prompt=IMAGE_ALT_TEXT_TEMPLATE, image=image)
                 if not data or not isinstance(data, dict):
                     log(f"[red]X.AI processing failed or returned invalid data for {file_path.name}[/red]")
                     result["error"] = "X.AI processing failed or returned invalid data"
                     return result
             else:
-                raw = process_with_ai(file_path, prompt, provider=self.provider, custom_system_prompt=IMAGE_ALT_TEXT_TEMPLATE)
+                raw = process_with_ai(file_path, prompt, provider=self.provider, custom_system_prompt=IMAGE_ALT_TEXT_TEMPLATE, image=image)
                 
                 # Handle dictionary responses with as_text flag (for error handling from Ollama)
                 if isinstance(raw, dict) and raw.get("as_text", False):
@@ -339,40 +372,45 @@ class ImageProcessor:
                     result["embedded_metadata"].append("alt_text (EXIF)")
                 except Exception as e:
                     log(f"[yellow]Error embedding alt text in {file_path.name}: {e}[/]")
-            after_dims = get_image_dimensions(file_path)
+            # Embedding metadata never resizes, so the header size still holds.
+            # Release the decoded pixels and file handle before renaming.
+            after_dims = before_dims
+            image.close()
             result["dimensions_after"] = after_dims
             if after_dims:
                 result["embedded_metadata"].append("dimensions")
-            if name_raw and len(name_raw.strip()) > 3:
-                new_stem = clean_filename(name_raw)
-                new_name = f"{new_stem}{file_path.suffix.lower()}"
-                new_path = file_path.with_name(new_name)
-                if not new_path.exists() and new_name != file_path.name and new_stem != file_path.stem:
-                    try:
-                        file_path.rename(new_path)
-                        log(f"[green]Renamed image:[/] {file_path.name} → {new_name}")
-                        file_path = new_path
-                        result["renamed"] = True
-                        result["new_path"] = str(new_path)
-                    except Exception as e:
-                        log(f"[yellow]Error renaming {file_path.name}: {e}[/]")
-                else:
-                    base, ext = os.path.splitext(new_name)
-                    counter = 1
-                    while True:
-                        candidate = f"{base}_{counter}{ext}"
-                        candidate_path = file_path.with_name(candidate)
-                        if not candidate_path.exists():
-                            try:
-                                file_path.rename(candidate_path)
-                                log(f"[green]Renamed image:[/] {file_path.name} → {candidate}")
-                                file_path = candidate_path
-                                result["renamed"] = True
-                                result["new_path"] = str(candidate_path)
-                            except Exception as e:
-                                log(f"[yellow]Error renaming {file_path.name}: {e}[/]")
-                            break
-                        counter += 1
+            # Serialize renames so concurrent workers cannot claim the same name
+            with self._rename_lock:
+                if name_raw and len(name_raw.strip()) > 3:
+                    new_stem = clean_filename(name_raw)
+                    new_name = f"{new_stem}{file_path.suffix.lower()}"
+                    new_path = file_path.with_name(new_name)
+                    if not new_path.exists() and new_name != file_path.name and new_stem != file_path.stem:
+                        try:
+                            file_path.rename(new_path)
+                            log(f"[green]Renamed image:[/] {file_path.name} → {new_name}")
+                            file_path = new_path
+                            result["renamed"] = True
+                            result["new_path"] = str(new_path)
+                        except Exception as e:
+                            log(f"[yellow]Error renaming {file_path.name}: {e}[/]")
+                    else:
+                        base, ext = os.path.splitext(new_name)
+                        counter = 1
+                        while True:
+                            candidate = f"{base}_{counter}{ext}"
+                            candidate_path = file_path.with_name(candidate)
+                            if not candidate_path.exists():
+                                try:
+                                    file_path.rename(candidate_path)
+                                    log(f"[green]Renamed image:[/] {file_path.name} → {candidate}")
+                                    file_path = candidate_path
+                                    result["renamed"] = True
+                                    result["new_path"] = str(candidate_path)
+                                except Exception as e:
+                                    log(f"[yellow]Error renaming {file_path.name}: {e}[/]")
+                                break
+                            counter += 1
             md_content = [
                 f"# {file_path.stem}",
                 "",
@@ -418,6 +456,9 @@ class ImageProcessor:
             log(f"[red]{error_msg}[/]")
             result["error"] = error_msg
             return result
+        finally:
+            if image is not None:
+                image.close()
 
     ###############################################################################
     # process_directory
@@ -436,7 +477,8 @@ class ImageProcessor:
         override_md: bool = False,
         test: bool = False,
         log_callback: Optional[Callable[[str], None]] = None,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Process all images in a directory.
@@ -453,6 +495,7 @@ class ImageProcessor:
             test: Whether to test metadata before and after embedding
             log_callback: Optional callback for logging
             provider: AI provider to use
+            workers: Number of images processed concurrently
             
         Returns:
             Dictionary with processing statistics and success status
@@ -509,7 +552,8 @@ class ImageProcessor:
                 override_md=override_md,
                 test=test,
                 log_callback=log_callback,
-                provider=provider
+                provider=provider,
+                workers=workers
             )
             
             # Return detailed results
@@ -538,7 +582,8 @@ class ImageProcessor:
 def convert_to_jpeg(image_path: Path) -> Optional[Path]:
     try:
         from PIL import Image
-        temp_path = Path(tempfile.gettempdir()) / f"temp_{image_path.stem}.jpg"
+        # Include a path hash so concurrent workers converting same-named files don't collide
+        temp_path = Path(tempfile.gettempdir()) / f"temp_{image_path.stem}_{get_cache_key(str(image_path))[:8]}.jpg"
         if image_path.suffix.lower() in {'.heic', '.heif'}:
             if not PYHEIF_AVAILABLE:
                 print(f"pyheif is not installed. Cannot convert {image_path.name}.")
@@ -579,19 +624,32 @@ def convert_to_jpeg(image_path: Path) -> Optional[Path]:
 ###############################################################################
 def load_alt_cache() -> Dict[str, Any]:
     if os.path.exists(ALT_CACHE_FILE):
-        with open(ALT_CACHE_FILE, "r", encoding="utf-8") as fp:
-            return json.load(fp)
+        try:
+            with open(ALT_CACHE_FILE, "r", encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read {ALT_CACHE_FILE}, starting with an empty cache: {e}")
     return {}
 
 def save_alt_cache(cache: Dict[str, Any]):
-    with open(ALT_CACHE_FILE, "w", encoding="utf-8") as fp:
+    # Write to a temporary file and swap it in so a crash mid-write can't
+    # truncate the progress recorded so far.
+    tmp_path = f"{ALT_CACHE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
         json.dump(cache, fp, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, ALT_CACHE_FILE)
+
+def _alt_cache_key(img_path: Path) -> str:
+    return f"{img_path}:{os.path.getmtime(img_path)}"
 
 ###############################################################################
 # process_images_cli
 #
 # Main entry point for batch image processing from the CLI.
 # Handles directory traversal, caching, format conversion, and logging.
+# Images are processed by a bounded thread pool sharing one ImageProcessor
+# and its provider rate limiter; results are saved to the alt-text cache in
+# batches so an interrupted run resumes where it stopped.
 ###############################################################################
 def process_images_cli(
     directory: Path,
@@ -601,7 +659,8 @@ def process_images_cli(
     override_md: bool = False,
     test: bool = False,
     log_callback: Optional[Any] = None,
-    provider: str = None
+    provider: str = None,
+    workers: Optional[int] = None
 ):
     if provider is None and herd_config:
         saved_provider = herd_config.get_provider()
@@ -639,80 +698,132 @@ def process_images_cli(
             options.append("test=True (testing mode)")
         if options:
             log_callback(f"[cyan]Options: {', '.join(options)}[/cyan]")
+    workers = max(1, workers or IMAGE_WORKERS)
     cache = load_alt_cache()
     stats = {
         "total": 0, "processed": 0, "skipped": 0, "renamed": 0, "errors": 0,
         "converted": 0, "optimized": 0
     }
     images = []
-    walker = directory.rglob('*') if recursive else directory.glob('*')
-    for p in walker:
-        if not p.is_file() or any(part.startswith('.') or part.startswith('|_') for part in p.parts):
+    for p in scan_files(directory, recursive, set(IMAGE_EXTENSIONS) | SUPPORTED_CONVERT_EXTS):
+        if any(part.startswith('.') or part.startswith('|_') for part in p.parts):
             continue
-        if p.suffix.lower() in IMAGE_EXTENSIONS or p.suffix.lower() in SUPPORTED_CONVERT_EXTS:
-            images.append(p)
+        images.append(p)
     stats["total"] = len(images)
     if not images:
         if log_callback:
             log_callback("[yellow]No images found in directory.[/]")
         return stats
+    pending = []
     for img_path in images:
         try:
             md_path = img_path.with_suffix('.md')
-            cache_key = f"{img_path}:{os.path.getmtime(img_path)}"
+            cache_key = _alt_cache_key(img_path)
             if md_path.exists() and not override_md and not force:
                 if log_callback:
                     log_callback(f"[yellow]Skipping {img_path.name}: .md exists[/]")
                 stats["skipped"] += 1
                 continue
-            if cache_key in cache and not force:
+            # Entries that failed last time are retried so an interrupted run can be resumed
+            entry = cache.get(cache_key)
+            if entry is not None and not force and not (isinstance(entry, dict) and entry.get("error")):
                 if log_callback:
                     log_callback(f"[yellow]Skipping {img_path.name}: in cache[/]")
                 stats["skipped"] += 1
                 continue
-            to_process = img_path
-            if img_path.suffix.lower() in SUPPORTED_CONVERT_EXTS:
-                jpeg_path = convert_to_jpeg(img_path)
-                if jpeg_path:
-                    to_process = jpeg_path
-                    stats["converted"] += 1
-            processor = ImageProcessor(provider=provider)
-            if 'get_model_for_file' in globals() and log_callback:
-                try:
-                    from herd_ai.config import get_model_for_file
-                    model = get_model_for_file(to_process, provider)
-                    log_callback(f"[cyan]Using model {model} for {img_path.name}[/cyan]")
-                except ImportError:
-                    pass
-            start_time = time.time()
-            result = processor.process_single_image(
-                to_process, 
-                {"base_dir": directory}, 
-                log_callback
-            )
-            processing_time = time.time() - start_time
-            if log_callback:
-                log_callback(f"[cyan]Processing time: {processing_time:.2f} seconds[/cyan]")
-            if result.get("error"):
-                stats["errors"] += 1
-            else:
-                stats["processed"] += 1
-                if result.get("renamed"):
-                    stats["renamed"] += 1
-            cache[cache_key] = {
-                "alt_text": result.get("alt_text_generated"),
-                "dimensions": result.get("dimensions"),
-                "renamed": result.get("renamed"),
-                "error": result.get("error"),
-                "provider": provider,
-                "processing_time": processing_time
-            }
-            save_alt_cache(cache)
+            pending.append((img_path, cache_key))
         except Exception as e:
             if log_callback:
                 log_callback(f"[red]Error processing {img_path}: {e}[/red]")
             stats["errors"] += 1
-            continue
+    if not pending:
+        if log_callback:
+            log_callback("[yellow]All images already processed.[/]")
+        return stats
+    if log_callback:
+        log_callback(f"[cyan]Processing {len(pending)} images with {workers} worker(s)[/cyan]")
+    # One processor is shared by all workers so they share its rate limiter
+    processor = ImageProcessor(provider=provider)
+
+    def process_one(img_path: Path) -> Tuple[Dict[str, Any], float, bool]:
+        to_process = img_path
+        converted = False
+        if img_path.suffix.lower() in SUPPORTED_CONVERT_EXTS:
+            jpeg_path = convert_to_jpeg(img_path)
+            if jpeg_path:
+                to_process = jpeg_path
+                converted = True
+        start_time = time.time()
+        result = processor.process_single_image(
+            to_process,
+            {"base_dir": directory},
+            log_callback
+        )
+        return result, time.time() - start_time, converted
+
+    def record(img_path: Path, cache_key: str, result: Dict[str, Any], processing_time: float, converted: bool) -> None:
+        if log_callback:
+            log_callback(f"[cyan]Processing time: {processing_time:.2f} seconds[/cyan]")
+        if converted:
+            stats["converted"] += 1
+        if result.get("error"):
+            stats["errors"] += 1
+        else:
+            stats["processed"] += 1
+            if result.get("renamed"):
+                stats["renamed"] += 1
+        entry = {
+            "alt_text": result.get("alt_text_generated"),
+            "dimensions": result.get("dimensions"),
+            "renamed": result.get("renamed"),
+            "error": result.get("error"),
+            "provider": provider,
+            "processing_time": processing_time
+        }
+        cache[cache_key] = entry
+        # Embedding alt text or renaming changes the path or mtime, so also
+        # record the processed file under its new key for later runs.
+        if not converted:
+            final_path = Path(result.get("new_path") or img_path)
+            if final_path.exists():
+                cache[_alt_cache_key(final_path)] = entry
+
+    queue = iter(pending)
+    in_flight = {}
+    unsaved = 0
+    last_save = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit_next() -> bool:
+                for img_path, cache_key in queue:
+                    in_flight[executor.submit(process_one, img_path)] = (img_path, cache_key)
+                    return True
+                return False
+
+            # Keep a bounded number of images queued rather than submitting them all
+            for _ in range(workers * 2):
+                if not submit_next():
+                    break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    img_path, cache_key = in_flight.pop(future)
+                    try:
+                        result, processing_time, converted = future.result()
+                        record(img_path, cache_key, result, processing_time, converted)
+                        unsaved += 1
+                    except Exception as e:
+                        if log_callback:
+                            log_callback(f"[red]Error processing {img_path}: {e}[/red]")
+                        stats["errors"] += 1
+                    submit_next()
+                if unsaved and (unsaved >= IMAGE_CACHE_FLUSH_EVERY or time.time() - last_save >= ALT_CACHE_FLUSH_SECONDS):
+                    save_alt_cache(cache)
+                    unsaved = 0
+                    last_save = time.time()
+    finally:
+        if unsaved:
+            save_alt_cache(cache)
     if log_callback:
         log_callback(f"[bold green]Image processing complete. Summary:[/bold green]")
         log_callback(f"[green]Total images: {stats['total']}[/green]")
@@ -722,6 +833,13 @@ def process_images_cli(
         log_callback(f"[green]Renamed: {stats['renamed']}[/green]")
         log_callback(f"[green]Errors: {stats['errors']}[/green]")
         log_callback(f"[green]Provider used: {provider}[/green]")
+        http_stats = get_http_stats().get(provider)
+        if http_stats and http_stats["requests"]:
+            log_callback(
+                f"[green]HTTP: {http_stats['requests']} requests, "
+                f"{http_stats['connections_reused']} on reused connections, "
+                f"avg latency {http_stats['avg_latency']:.2f}s[/green]"
+            )
     return stats
 
 ###############################################################################
@@ -738,6 +856,7 @@ def main():
     parser.add_argument("--override_md", "-m", action="store_true", help="Override existing markdown file check and reprocess images")
     parser.add_argument("--test", "-t", action="store_true", help="Check metadata before and after embedding alt text")
     parser.add_argument("--provider", "-p", help=f"AI provider to use (default: {DEFAULT_AI_PROVIDER})")
+    parser.add_argument("--workers", "-w", type=int, help=f"Number of images processed concurrently (default: {IMAGE_WORKERS})")
     args = parser.parse_args()
     directory = Path(args.dir)
     if not directory.exists() or not directory.is_dir():
@@ -745,7 +864,7 @@ def main():
         sys.exit(1)
     process_images_cli(directory, recursive=args.recursive, force=args.force, 
                       rename=args.rename, override_md=args.override_md, 
-                      test=args.test, provider=args.provider)
+                      test=args.test, provider=args.provider, workers=args.workers)
 
 if __name__ == "__main__":
     main()
@@ -760,7 +879,8 @@ def process_directory(
     override_md: bool = False,
     test: bool = False,
     log_callback: Optional[Callable[[str], None]] = None,
-    provider: Optional[str] = None
+    provider: Optional[str] = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Process all images in a directory.
@@ -777,6 +897,7 @@ def process_directory(
         test: Whether to test metadata before and after embedding
         log_callback: Optional callback for logging
         provider: AI provider to use
+        workers: Number of images processed concurrently
         
     Returns:
         Dictionary with processing statistics
@@ -814,7 +935,8 @@ def process_directory(
             override_md=override_md, 
             test=test,
             log_callback=log_callback,
-            provider=provider
+            provider=provider,
+            workers=workers
         )
         
         if log_callback:
@@ -842,7 +964,9 @@ def batch_extract_alt_text(
     directory: Path,
     output_format: str = "text",
     recursive: bool = False,
-    log_callback: Optional[Callable[[str], None]] = None
+    log_callback: Optional[Callable[[str], None]] = None,
+    embed_missing: bool = False,
+    workers: Optional[int] = None
 ) -> str:
     """
     Extract alt text from multiple images in a directory.
@@ -852,6 +976,10 @@ def batch_extract_alt_text(
         output_format: Format for output (text, json, csv, markdown)
         recursive: Whether to process subdirectories
         log_callback: Optional callback for logging
+        embed_missing: Bulk mode. Images without embedded alt text but with a
+            Markdown summary from an earlier run (image.md) get that alt text
+            written into their metadata without re-encoding
+        workers: Threads for reading and embedding (default: IMAGE_WORKERS)
         
     Returns:
         String with extracted alt text in requested format
@@ -863,28 +991,51 @@ def batch_extract_alt_text(
     image_files = []
     
     # Find all image files
-    if recursive:
-        image_files = [p for p in directory.rglob("*") if p.is_file() and processor.can_process(p)]
-    else:
-        image_files = [p for p in directory.glob("*") if p.is_file() and processor.can_process(p)]
+    image_files = [p for p in scan_files(directory, recursive) if processor.can_process(p)]
     
     if log_callback:
         log_callback(f"[cyan]Found {len(image_files)} image files[/]")
     
-    # Extract alt text
-    results = []
-    for img_file in image_files:
+    workers = max(1, workers or IMAGE_WORKERS)
+    
+    def read_one(img_file: Path) -> Optional[str]:
         try:
-            from herd_ai.utils.file import read_alt_text
-            alt_text = read_alt_text(img_file)
-            if alt_text:
-                results.append({
-                    "file": str(img_file),
-                    "alt_text": alt_text
-                })
+            return read_alt_text(img_file)
         except Exception as e:
             if log_callback:
                 log_callback(f"[yellow]Error reading alt text from {img_file}: {e}[/]")
+            return None
+    
+    # Extract alt text (header-only reads for JPEG and PNG)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        found = list(pool.map(read_one, image_files))
+    
+    if embed_missing:
+        pending = []
+        for i, img_file in enumerate(image_files):
+            if not found[i]:
+                sidecar_alt = _sidecar_alt_text(img_file)
+                if sidecar_alt:
+                    pending.append((i, img_file, sidecar_alt))
+        if pending:
+            embed_stats = embed_alt_text_bulk(
+                [(img_file, alt) for _, img_file, alt in pending],
+                workers=workers,
+                fallback=embed_alt_text_into_image
+            )
+            for i, _, alt in pending:
+                found[i] = alt
+            if log_callback:
+                log_callback(
+                    f"[cyan]Embedded alt text in {embed_stats['files'] - embed_stats['errors']} images "
+                    f"({embed_stats['in_place']} in place, {embed_stats['copy']} copied, "
+                    f"{embed_stats['fallback']} re-encoded, {embed_stats['bytes_written']:,} bytes written)[/]"
+                )
+    
+    results = [
+        {"file": str(img_file), "alt_text": alt_text}
+        for img_file, alt_text in zip(image_files, found) if alt_text
+    ]
     
     # Format output
     output = ""
@@ -907,6 +1058,18 @@ def batch_extract_alt_text(
     
     return output
 
+def _sidecar_alt_text(img_path: Path) -> Optional[str]:
+    """Alt text from the Markdown summary process_single_image writes next to an image."""
+    md_path = img_path.with_suffix('.md')
+    try:
+        with open(md_path, "r", encoding="utf-8") as fp:
+            for line in fp:
+                if line.startswith("**Alt Text:**"):
+                    return line[len("**Alt Text:**"):].strip() or None
+    except OSError:
+        pass
+    return None
+
 def list_alt_text_formats() -> List[str]:
     """
     List available output formats for alt text extraction.
@@ -8,6 +8,8 @@
 # =============================================================================
 
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from json import JSONDecodeError
 from pathlib import Path
 import logging
@@ -27,19 +29,37 @@ from rich.table import Table
 try:
     try:
         from herd_ai.config import PROCESS_EXTENSIONS, RENAME_TEMPLATE, DEFAULT_AI_PROVIDER, IMAGE_EXTENSIONS
-        from herd_ai.utils.file import get_file_text, clean_filename
+        from herd_ai.config import (
+            RENAME_BATCH_TEMPLATE, RENAME_BATCH_SIZE, RENAME_BATCH_TOKENS, RENAME_WORKERS, RENAME_SAMPLE_CHARS,
+            MEDIA_EXTENSIONS
+        )
+        from herd_ai.utils.file import get_file_text, iter_file_text, clean_filename
         from herd_ai.utils.ai_provider import process_with_ai
+        from herd_ai.utils.ratelimit import get_rate_limiter, estimate_tokens
+        from herd_ai.utils.media_index import probe_many, describe_media
         from herd_ai.utils import config as herd_config
     except ImportError:
         try:
             from llamacleaner.config import PROCESS_EXTENSIONS, RENAME_TEMPLATE, DEFAULT_AI_PROVIDER, IMAGE_EXTENSIONS
-            from llamacleaner.utils.file import get_file_text, clean_filename
+            from llamacleaner.config import (
+                RENAME_BATCH_TEMPLATE, RENAME_BATCH_SIZE, RENAME_BATCH_TOKENS, RENAME_WORKERS, RENAME_SAMPLE_CHARS,
+                MEDIA_EXTENSIONS
+            )
+            from llamacleaner.utils.file import get_file_text, iter_file_text, clean_filename
             from llamacleaner.utils.ai_provider import process_with_ai
+            from llamacleaner.utils.ratelimit import get_rate_limiter, estimate_tokens
+            from llamacleaner.utils.media_index import probe_many, describe_media
             from llamacleaner.utils import config as herd_config
         except ImportError:
             from config import PROCESS_EXTENSIONS, RENAME_TEMPLATE, DEFAULT_AI_PROVIDER, IMAGE_EXTENSIONS
-            from utils.file import get_file_text, clean_filename
+            from config import (
+                RENAME_BATCH_TEMPLATE, RENAME_BATCH_SIZE, RENAME_BATCH_TOKENS, RENAME_WORKERS, RENAME_SAMPLE_CHARS,
+                MEDIA_EXTENSIONS
+            )
+            from utils.file import get_file_text, iter_file_text, clean_filename
             from utils.ai_provider import process_with_ai
+            from utils.ratelimit import get_rate_limiter, estimate_tokens
+            from utils.media_index import probe_many, describe_media
             from utils import config as herd_config
 except Exception as e:
     print(f"Error importing modules in rename.py: {e}")
@@ -148,20 +168,216 @@ def rename_file(path: Path, suggestion: str, omni_paths: Dict[str, Any]) -> bool
         console.print(f"[red]Error renaming {path.name}: {e}[/]")
         return False
 
+# =============================================================================
+# Batched rename suggestions
+# 
+# Several files are packed into one request: each gets an id, its current
+# name and a content sample, and the model answers with a JSON array of
+# {"id", "filename"} objects. Batches are bounded by file count and by an
+# estimated prompt-token budget, and run concurrently under the provider's
+# rate limiter. Files the model leaves out, or whole batches whose reply
+# cannot be parsed, fall back to one single-file request each.
+# =============================================================================
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+def read_rename_sample(path: Path, max_chars: int = None) -> str:
+    """
+    The first `max_chars` characters of a file's text (default
+    RENAME_SAMPLE_CHARS), extracting only as much of the document as needed.
+    """
+    max_chars = max_chars or RENAME_SAMPLE_CHARS
+    sample = ""
+    try:
+        chunks = iter_file_text(path, chunk_size=max_chars, max_bytes=max_chars * 4)
+        try:
+            for chunk in chunks:
+                sample += chunk
+                if len(sample) >= max_chars:
+                    break
+        finally:
+            chunks.close()
+    except Exception as e:
+        logger.error(f"Error reading {path} for rename: {e}")
+    return sample[:max_chars]
+
+def _response_text(raw: Any) -> str:
+    # Handle dict responses by extracting the 'text' field
+    if isinstance(raw, dict):
+        return raw.get("text", "") or ""
+    return raw or ""
+
+def _valid_suggestion(text: str) -> Optional[str]:
+    suggestion = clean_filename(str(text).strip()) if text else ""
+    if not suggestion or suggestion.lower().startswith("please") or len(suggestion) > 100:
+        return None
+    return suggestion
+
+def build_batch_prompt(items: List[Tuple[int, Path, str]]) -> str:
+    """Prompt listing (id, path, sample) items for RENAME_BATCH_TEMPLATE."""
+    files = [{"id": file_id, "current_name": path.name, "content_sample": sample} for file_id, path, sample in items]
+    return (
+        f"Suggest a concise, meaningful filename (no more than 5 words) for each of these {len(files)} files:\n\n"
+        f"{json.dumps(files, ensure_ascii=False, indent=1)}\n\n"
+        "Respond with ONLY the JSON array of {\"id\", \"filename\"} objects (no extensions)."
+    )
+
+def parse_batch_suggestions(raw: Any) -> Optional[Dict[int, str]]:
+    """
+    Map file id to suggested name from a batched reply, or None if the reply
+    is not a JSON array (optionally fenced, or wrapped in an object) of
+    {"id", "filename"} objects.
+    """
+    if isinstance(raw, dict) and "text" not in raw:
+        data = raw
+    else:
+        text = _response_text(raw).strip()
+        fenced = _JSON_FENCE_RE.search(text)
+        if fenced:
+            text = fenced.group(1).strip()
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except JSONDecodeError:
+            return None
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), None)
+    if not isinstance(data, list):
+        return None
+    suggestions = {}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        name = entry.get("filename") or entry.get("suggested_filename") or entry.get("name")
+        try:
+            file_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if name:
+            suggestions[file_id] = str(name)
+    return suggestions
+
+def pack_rename_batches(
+    samples: List[Tuple[Path, str]],
+    batch_size: int,
+    token_budget: int
+) -> List[List[Tuple[int, Path, str]]]:
+    """
+    Split (path, sample) pairs into batches of at most `batch_size` files and
+    about `token_budget` estimated prompt tokens; a file that alone exceeds
+    the budget gets a batch of its own. Ids are positions in `samples`.
+    """
+    batches: List[List[Tuple[int, Path, str]]] = []
+    current: List[Tuple[int, Path, str]] = []
+    tokens = 0
+    for file_id, (path, sample) in enumerate(samples):
+        cost = estimate_tokens(sample) + estimate_tokens(path.name) + 16
+        if current and (len(current) >= batch_size or tokens + cost > token_budget):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append((file_id, path, sample))
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def suggest_filename(path: Path, sample: str, provider: str) -> Optional[str]:
+    """One single-file rename request, as used before batching and as the fallback."""
+    prompt = (
+        f"Based on this file's content, suggest a concise, meaningful filename (no more than 5 words):\n\n"
+        f"Current name: {path.name}\n"
+        f"Content sample: {sample}\n\n"
+        "Respond with ONLY the new filename (no extension)."
+    )
+    limiter = get_rate_limiter(provider)
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(prompt))
+    return _valid_suggestion(_response_text(
+        process_with_ai(path, prompt, provider=provider, custom_system_prompt=RENAME_TEMPLATE)
+    ))
+
+def suggest_filenames(
+    batch: List[Tuple[int, Path, str]],
+    provider: str,
+    log: Callable[[str], None]
+) -> Tuple[Dict[int, Optional[str]], Dict[str, int]]:
+    """
+    Suggestions for one batch: a single batched request when it holds more
+    than one file, then single-file requests for anything it did not answer.
+
+    Returns:
+        ({file id: suggestion or None}, {"requests", "fallbacks"})
+    """
+    suggestions: Dict[int, Optional[str]] = {}
+    stats = {"requests": 0, "fallbacks": 0}
+    if len(batch) > 1:
+        prompt = build_batch_prompt(batch)
+        limiter = get_rate_limiter(provider)
+        if limiter is not None:
+            waited = limiter.acquire(estimate_tokens(prompt))
+            if waited > 1:
+                log(f"[dim]Rate limited: waited {waited:.1f}s for {provider}[/dim]")
+        parsed = None
+        try:
+            stats["requests"] += 1
+            parsed = parse_batch_suggestions(process_with_ai(
+                batch[0][1], prompt, provider=provider, custom_system_prompt=RENAME_BATCH_TEMPLATE
+            ))
+        except Exception as e:
+            log(f"[red]Exception while calling AI for a batch of {len(batch)} files: {e}[/red]")
+        if parsed is None:
+            log(f"[yellow]Could not parse batched reply for {len(batch)} files; falling back to single-file requests[/yellow]")
+        else:
+            for file_id, _, _ in batch:
+                if file_id in parsed:
+                    suggestions[file_id] = _valid_suggestion(parsed[file_id])
+    for file_id, path, sample in batch:
+        if file_id in suggestions:
+            continue
+        if len(batch) > 1:
+            stats["fallbacks"] += 1
+        try:
+            stats["requests"] += 1
+            suggestions[file_id] = suggest_filename(path, sample, provider)
+        except Exception as e:
+            log(f"[red]Exception while calling AI for {path.name}: {e}[/red]")
+            suggestions[file_id] = None
+    return suggestions, stats
+
 # =============================================================================
 # batch_process_files
 # 
-# Processes a list of files in batches, sending their content to the LLM for
-# filename suggestions, and renaming them accordingly. Handles logging, timing,
-# and provider/model selection.
+# Reads a content sample from each file once, sends the samples to the LLM in
+# packed batches (several concurrently) for filename suggestions, and renames
+# the files accordingly. Handles logging, timing, and provider selection.
 # =============================================================================
 def batch_process_files(
     files: List[Path],
     omni_paths: Dict[str, Any],
     log_callback: Optional[Callable[[str], None]] = None,
-    batch_size: int = 10,
-    provider: str = None
+    batch_size: Optional[int] = None,
+    provider: str = None,
+    workers: Optional[int] = None,
+    token_budget: Optional[int] = None
 ) -> Tuple[int, int]:
+    """
+    Rename files from AI suggestions.
+
+    Args:
+        files: Files to rename.
+        omni_paths: Paths dictionary; "undo_log" or "backup_dir" locate the undo log.
+        log_callback: Receives progress messages.
+        batch_size: Files packed into one request (default RENAME_BATCH_SIZE;
+            1 sends one request per file).
+        provider: AI provider (default: saved config, then DEFAULT_AI_PROVIDER).
+        workers: Concurrent requests (default RENAME_WORKERS).
+        token_budget: Estimated prompt tokens per batched request
+            (default RENAME_BATCH_TOKENS).
+
+    Returns:
+        (files renamed, files given)
+    """
     if provider is None and herd_config:
         saved_provider = herd_config.get_provider()
         if saved_provider:
@@ -169,6 +385,9 @@ def batch_process_files(
             if log_callback:
                 log_callback(f"[cyan]Loading provider from config: {saved_provider}[/cyan]")
     provider = provider or DEFAULT_AI_PROVIDER
+    batch_size = max(1, batch_size or RENAME_BATCH_SIZE)
+    workers = max(1, workers or RENAME_WORKERS)
+    token_budget = token_budget or RENAME_BATCH_TOKENS
 
     def log(msg: str) -> None:
         if log_callback:
@@ -197,85 +416,84 @@ def batch_process_files(
             if len(api_key) > 8:
                 masked_key = f"{api_key[:4]}...{api_key[-4:]}"
             log(f"[cyan]Using X.AI API key from config: {masked_key}[/cyan]")
+    try:
+        from herd_ai.config import get_model_for_file
+        log(f"[cyan]Using model {get_model_for_file(files[0], provider)} with provider {provider}[/cyan]")
+    except ImportError:
+        log(f"[yellow]Could not determine specific model for {provider}[/yellow]")
 
     success_count = 0
-    batches = [files[i:i+batch_size] for i in range(0, len(files), batch_size)]
-    log(f"[cyan]Processing {len(files)} files in {len(batches)} batches[/cyan]")
-    processing_times = []
     overall_start_time = time.time()
-
-    for batch_idx, batch in enumerate(batches, 1):
-        log(f"[cyan]Processing batch {batch_idx}/{len(batches)} ({len(batch)} files)[/cyan]")
-        for file_idx, filepath in enumerate(batch, 1):
-            file_start_time = time.time()
-            log(f"[dim cyan]Processing file {file_idx}/{len(batch)} in batch {batch_idx}: {filepath.name}[/dim cyan]")
-            if filepath.suffix.lower() not in PROCESS_EXTENSIONS:
-                log(f"[yellow]Skipping unsupported file type: {filepath}[/]")
-                continue
-            model = "default"
-            try:
-                from herd_ai.config import get_model_for_file
-                model = get_model_for_file(filepath, provider)
-                log(f"[cyan]Using model {model} for {filepath.name} with provider {provider}[/cyan]")
-            except ImportError:
-                log(f"[yellow]Could not determine specific model for {provider}[/yellow]")
-            desc = generate_description(filepath, provider=provider)
-            file_contents = get_file_text(filepath)
-            if not file_contents.strip():
-                suggestion = f"{clean_filename(filepath.stem)}_v2"
-                log(f"[yellow]No text content, using basic rename: {suggestion}[/]")
-                if rename_file(filepath, suggestion, omni_paths):
-                    success_count += 1
-                    file_time = time.time() - file_start_time
-                    processing_times.append(file_time)
-                    log(f"[green]Renamed {filepath.name} → {suggestion}{filepath.suffix} in {file_time:.2f}s[/]")
+    samples: List[Tuple[Path, str]] = []
+    # Media files have no text; their sample is their metadata, probed
+    # together (and answered from the media index where possible)
+    media = [f for f in files if f.suffix.lower() in MEDIA_EXTENSIONS]
+    media_info = {}
+    if media:
+        probed = probe_many(media)
+        media_info = probed["results"]
+        log(f"[cyan]Media metadata for {len(media)} files: {probed['stats']['indexed']} indexed, "
+            f"{probed['stats']['probed']} probed[/cyan]")
+    for filepath in files:
+        if filepath.suffix.lower() not in PROCESS_EXTENSIONS:
+            log(f"[yellow]Skipping unsupported file type: {filepath}[/]")
+            continue
+        if filepath in media_info:
+            info = media_info[filepath]
+            if info.get("error"):
+                log(f"[yellow]Skipping {filepath.name}, no media metadata: {info['error']}[/]")
                 continue
-            prompt = (
-                f"Based on this file's content, suggest a concise, meaningful filename (no more than 5 words):\n\n"
-                f"Current name: {filepath.name}\n"
-                f"Content sample: {file_contents[:1000] if len(file_contents) > 1000 else file_contents}\n\n"
-                "Respond with ONLY the new filename (no extension)."
-            )
-            log(f"[cyan]Sending prompt to {provider} (model: {model}) for {filepath.name}[/cyan]")
-            ai_start_time = time.time()
+            sample = describe_media(filepath, info)
+        else:
+            sample = read_rename_sample(filepath)
+        if not sample.strip():
+            suggestion = f"{clean_filename(filepath.stem)}_v2"
+            log(f"[yellow]No text content, using basic rename: {suggestion}[/]")
+            if rename_file(filepath, suggestion, omni_paths):
+                success_count += 1
+                log(f"[green]Renamed {filepath.name} → {suggestion}{filepath.suffix}[/]")
+            continue
+        samples.append((filepath, sample))
+
+    batches = pack_rename_batches(samples, batch_size, token_budget)
+    if batches:
+        log(f"[cyan]Processing {len(samples)} files in {len(batches)} batches ({min(workers, len(batches))} concurrent)[/cyan]")
+    request_count = fallback_count = 0
+    batch_times = []
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches)) or 1) as pool:
+        def run(batch):
+            start = time.time()
+            return suggest_filenames(batch, provider, log), time.time() - start
+
+        futures = {pool.submit(run, batch): batch for batch in batches}
+        # Renames and the undo log are handled on this thread as batches finish
+        for future in as_completed(futures):
+            batch = futures[future]
             try:
-                raw = process_with_ai(filepath, prompt, provider=provider, custom_system_prompt=RENAME_TEMPLATE)
-                # Handle dict responses by extracting the 'text' field
-                if isinstance(raw, dict):
-                    text_response = raw.get("text", "")
-                else:
-                    text_response = raw or ""
-                ai_processing_time = time.time() - ai_start_time
-                log(f"[blue]AI processing took {ai_processing_time:.2f} seconds for {filepath.name}[/blue]")
-                log(f"[dim]Raw AI response ({len(text_response) if text_response else 0} chars): {repr(text_response[:100])}{'...' if text_response and len(text_response) > 100 else ''}[/dim]")
+                (suggestions, stats), batch_time = future.result()
             except Exception as e:
-                log(f"[red]Exception while calling AI for {filepath.name}: {e}[/red]")
-                continue
-            # Skip empty or whitespace-only responses
-            if not text_response or not text_response.strip():
-                log(f"[yellow]Empty response from AI for {filepath.name}[/]")
+                log(f"[red]Error processing batch of {len(batch)} files: {e}[/red]")
                 continue
-            suggestion = clean_filename(text_response.strip())
-            if not suggestion or suggestion.lower().startswith("please") or len(suggestion) > 100:
-                log(f"[yellow]Invalid suggestion: {suggestion}[/]")
-                continue
-            if rename_file(filepath, suggestion, omni_paths):
-                success_count += 1
-                file_time = time.time() - file_start_time
-                processing_times.append(file_time)
-                log(f"[green]Renamed {filepath.name} → {suggestion}{filepath.suffix} in {file_time:.2f}s[/]")
-            else:
-                log(f"[yellow]Skipped rename for {filepath.name}[/]")
+            request_count += stats["requests"]
+            fallback_count += stats["fallbacks"]
+            batch_times.append(batch_time)
+            log(f"[blue]AI suggestions for {len(batch)} files took {batch_time:.2f}s[/blue]")
+            for file_id, filepath, _ in batch:
+                suggestion = suggestions.get(file_id)
+                if not suggestion:
+                    log(f"[yellow]No valid suggestion for {filepath.name}[/]")
+                elif rename_file(filepath, suggestion, omni_paths):
+                    success_count += 1
+                    log(f"[green]Renamed {filepath.name} → {suggestion}{filepath.suffix}[/]")
+                else:
+                    log(f"[yellow]Skipped rename for {filepath.name}[/]")
     total_time = time.time() - overall_start_time
-    if processing_times:
-        avg_time = sum(processing_times) / len(processing_times)
-        min_time = min(processing_times)
-        max_time = max(processing_times)
+    if batch_times:
         log(f"[bold cyan]Processing Statistics:[/bold cyan]")
         log(f"[cyan]Total processing time: {total_time:.2f}s[/cyan]")
-        log(f"[cyan]Average processing time: {avg_time:.2f}s per file[/cyan]")
-        log(f"[cyan]Fastest processing time: {min_time:.2f}s[/cyan]")
-        log(f"[cyan]Slowest processing time: {max_time:.2f}s[/cyan]")
+        log(f"[cyan]AI requests: {request_count} for {len(samples)} files ({fallback_count} single-file fallbacks)[/cyan]")
+        log(f"[cyan]Average batch time: {sum(batch_times) / len(batch_times):.2f}s[/cyan]")
+        log(f"[cyan]Average time per file: {total_time / max(1, len(samples)):.2f}s[/cyan]")
     return success_count, len(files)
 
 # =============================================================================
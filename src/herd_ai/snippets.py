@@ -18,12 +18,15 @@
 from __future__ import annotations
 import re
 import time
-import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Callable, Any, Union, Tuple, NamedTuple
+from typing import Dict, Iterable, List, Set, Optional, Callable, Any, Union, Tuple, NamedTuple
 import hashlib
+import heapq
 import json
+from collections import defaultdict
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from dataclasses import dataclass
 from rich.console import Console
 from rich.panel import Panel
@@ -46,26 +49,30 @@ if str(root_dir) not in sys.path:
 try:
     try:
         # First try the standard package import
-        from herd_ai.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, is_code_extension
-        from herd_ai.utils.file import get_file_text
+        from herd_ai.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, MAX_TEXT_BYTES, SNIPPET_WORKERS, is_code_extension
+        from herd_ai.utils.file import get_file_text, iter_file_text, iter_lines, scan_files
+        from herd_ai.utils.snippet_index import get_snippet_index
         from herd_ai.utils.ollama import send_prompt_to_ollama
     except ImportError:
         try:
             # Then try legacy package import
-            from llamacleaner.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, is_code_extension
-            from llamacleaner.utils.file import get_file_text
+            from llamacleaner.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, MAX_TEXT_BYTES, SNIPPET_WORKERS, is_code_extension
+            from llamacleaner.utils.file import get_file_text, iter_file_text, iter_lines, scan_files
+            from llamacleaner.utils.snippet_index import get_snippet_index
             from llamacleaner.utils.ollama import send_prompt_to_ollama
         except ImportError:
             try:
                 # Then try relative imports from current directory
-                from config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, is_code_extension
-                from utils.file import get_file_text
+                from config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, MAX_TEXT_BYTES, SNIPPET_WORKERS, is_code_extension
+                from utils.file import get_file_text, iter_file_text, iter_lines, scan_files
+                from utils.snippet_index import get_snippet_index
                 from utils.ollama import send_prompt_to_ollama
             except ImportError:
                 # Finally try direct imports using the file path
                 sys.path.insert(0, str(Path(__file__).resolve().parent))
-                from herd_ai.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, is_code_extension
-                from herd_ai.utils.file import get_file_text
+                from herd_ai.config import TEXT_EXTENSIONS, SNIPPET_EXTENSIONS, CODE_EXTENSIONS, MAX_TEXT_BYTES, SNIPPET_WORKERS, is_code_extension
+                from herd_ai.utils.file import get_file_text, iter_file_text, iter_lines, scan_files
+                from herd_ai.utils.snippet_index import get_snippet_index
                 from herd_ai.utils.ollama import send_prompt_to_ollama
 except Exception as e:
     print(f"Error importing modules in snippets.py: {e}")
@@ -98,6 +105,22 @@ except Exception as e:
             return Path(path).read_text(encoding='utf-8', errors='ignore')
         except:
             return ""
+
+    def iter_file_text(path, chunk_size=None, max_bytes=None):
+        yield get_file_text(path)
+
+    def iter_lines(chunks):
+        for chunk in chunks:
+            yield from chunk.splitlines()
+
+    MAX_TEXT_BYTES = None
+    SNIPPET_WORKERS = 1
+    get_snippet_index = None
+
+    def scan_files(directory, recursive=True, extensions=None):
+        walker = Path(directory).rglob('*') if recursive else Path(directory).glob('*')
+        return sorted(p for p in walker if p.is_file()
+                      and (extensions is None or p.suffix.lower() in extensions))
             
     def send_prompt_to_ollama(prompt, model=None, max_tokens=2048, temperature=0.7, system_prompt=None, n=1, stream=False):
         print("Mock Ollama API call (module not available)")
@@ -157,8 +180,8 @@ def scan_for_api_credentials(content: str) -> Dict[str, List[str]]:
         r'(?:password|secret|auth)["\']?\s*(?::|=|:=|\+=)\s*["\']([^\'\"]+)["\']'
     ]
     endpoint_patterns = [
-        r'https?://([a-zA-Z0-9][-a-zA-Z0-9]*\.)*api\.[-a-zA-Z0-9.]+\.[a-zA-Z]{2,}/[-a-zA-Z0-9/%_.~?&=]*',
-        r'https?://([a-zA-Z0-9][-a-zA-Z0-9]*\.)*[-a-zA-Z0-9.]+\.[a-zA-Z]{2,}/api/[-a-zA-Z0-9/%_.~?&=]*',
+        r'https?://(?:[a-zA-Z0-9][-a-zA-Z0-9]*\.)*api\.[-a-zA-Z0-9.]+\.[a-zA-Z]{2,}/[-a-zA-Z0-9/%_.~?&=]*',
+        r'https?://(?:[a-zA-Z0-9][-a-zA-Z0-9]*\.)*[-a-zA-Z0-9.]+\.[a-zA-Z]{2,}/api/[-a-zA-Z0-9/%_.~?&=]*',
         r'(?:endpoint|url|uri|base[_-]?url)["\']?\s*(?::|=|:=|\+=)\s*["\']([^"\']+api[^"\']+)["\']'
     ]
     schema_patterns = [
@@ -173,39 +196,45 @@ def scan_for_api_credentials(content: str) -> Dict[str, List[str]]:
         r'(?:mongodb|postgresql|mysql|redis)://[^\s\'\"<>]+',
         r'(?:Data Source|Server|Database|User ID|Password)=[^;]+'
     ]
+    def value(match) -> str:
+        # The first group when a pattern has one and it took part in the match
+        return (match.group(1) if match.re.groups else None) or match.group(0)
+
     for pattern in key_patterns:
         matches = re.finditer(pattern, content, re.IGNORECASE)
         for match in matches:
-            key = match.group(1) if len(match.groups()) > 0 else match.group(0)
+            key = value(match)
             if not any(x in key.lower() for x in ['yourkey', 'example', 'placeholder', 'xxxxxx', '<key>']):
                 creds["api_keys"].append(key)
     for pattern in endpoint_patterns:
         matches = re.finditer(pattern, content, re.IGNORECASE)
         for match in matches:
-            endpoint = match.group(1) if len(match.groups()) > 0 else match.group(0)
+            endpoint = value(match)
             if not any(x in endpoint.lower() for x in ['example', 'placeholder', '<url>']):
                 creds["endpoints"].append(endpoint)
     for pattern in schema_patterns:
         matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
         for match in matches:
-            schema = match.group(1) if len(match.groups()) > 0 else match.group(0)
+            schema = value(match)
             if schema and len(schema.strip()) > 10:
                 creds["schemas"].append(schema.strip())
     for pattern in conn_patterns:
         matches = re.finditer(pattern, content, re.IGNORECASE)
         for match in matches:
-            conn_str = match.group(1) if len(match.groups()) > 0 else match.group(0)
+            conn_str = value(match)
             if not any(x in conn_str.lower() for x in ['example', 'placeholder', '<connection>']):
                 creds["connection_strings"].append(conn_str)
     for key in creds:
         creds[key] = list(dict.fromkeys(creds[key]))
     return creds
 
-def split_into_chunks(text: str, size: int = 6000) -> List[str]:
+def split_into_chunks(text: Union[str, Iterable[str]], size: int = 6000) -> List[str]:
     """
     Splits text into chunks of approximately the specified size (in characters).
+    Accepts a string or an iterable of text chunks such as iter_file_text().
     """
-    lines, out, buf, count = text.splitlines(), [], [], 0
+    lines = text.splitlines() if isinstance(text, str) else iter_lines(text)
+    out, buf, count = [], [], 0
     for ln in lines:
         if count + len(ln) > size and buf:
             out.append("\n".join(buf))
@@ -286,71 +315,80 @@ class CodeSnippet:
             related_snippets=data.get("related_snippets", [])
         )
 
+_CATEGORY_PATTERNS = {
+    "api_client": (
+        r"(?:fetch|axios|request|http|api|client)\s*\.",
+        r"\.(?:get|post|put|delete|patch)\s*\(",
+        r"new\s+(?:HttpClient|ApiClient|RestClient)",
+        r"@api\s+|@endpoint\s+"
+    ),
+    "authentication": (
+        r"auth|login|logout|session|token|jwt|oauth|permission",
+        r"@auth\s+|@login\s+|@secure\s+",
+        r"authenticate|authorize|verify"
+    ),
+    "database": (
+        r"(?:select|insert|update|delete)\s+(?:from|into|where)",
+        r"mongoose|sequelize|prisma|typeorm",
+        r"db\.|database\.|connection\.",
+        r"@entity\s+|@repository\s+"
+    ),
+    "streaming": (
+        r"stream\.|createStream|pipe\(",
+        r"websocket|socket\.|ws\.",
+        r"@stream\s+|@realtime\s+",
+        r"EventSource|SSE|Server-Sent"
+    ),
+    "configuration": (
+        r"config\.|settings\.|env\.",
+        r"process\.env",
+        r"@config\s+|@setting\s+",
+        r"\.env|config\.json|settings\.yaml"
+    ),
+    "utility": (
+        r"util\.|helper\.|common\.",
+        r"@util\s+|@helper\s+",
+        r"function\s+\w+\s*\([^)]*\)"
+    )
+}
+
+_TAG_PATTERNS = {
+    "async": r"async|await|promise|then\(",
+    "error-handling": r"try|catch|throw|error|exception",
+    "testing": r"test|describe|it\(|assert|expect",
+    "security": r"encrypt|decrypt|hash|salt|secure",
+    "validation": r"validate|schema|check|verify",
+    "caching": r"cache|redis|memcache",
+    "logging": r"log\.|logger\.|console\.",
+    "middleware": r"middleware|interceptor|filter",
+    "frontend": r"component|render|view|template",
+    "backend": r"controller|service|repository|model"
+}
+
+# Each category's alternatives, and each tag pattern, compiled once
+_CATEGORY_RES = {
+    cat: re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE | re.MULTILINE)
+    for cat, patterns in _CATEGORY_PATTERNS.items()
+}
+_TAG_RES = {tag: re.compile(pattern, re.IGNORECASE | re.MULTILINE) for tag, pattern in _TAG_PATTERNS.items()}
+
 def categorize_snippet(content: str, file_path: str) -> Tuple[str, Set[str]]:
     """
     Categorizes a code snippet and assigns relevant tags based on content and file type.
     Returns a tuple of (category, tags).
     """
-    categories = {
-        "api_client": (
-            r"(?:fetch|axios|request|http|api|client)\s*\.",
-            r"\.(?:get|post|put|delete|patch)\s*\(",
-            r"new\s+(?:HttpClient|ApiClient|RestClient)",
-            r"@api\s+|@endpoint\s+"
-        ),
-        "authentication": (
-            r"auth|login|logout|session|token|jwt|oauth|permission",
-            r"@auth\s+|@login\s+|@secure\s+",
-            r"authenticate|authorize|verify"
-        ),
-        "database": (
-            r"(?:select|insert|update|delete)\s+(?:from|into|where)",
-            r"mongoose|sequelize|prisma|typeorm",
-            r"db\.|database\.|connection\.",
-            r"@entity\s+|@repository\s+"
-        ),
-        "streaming": (
-            r"stream\.|createStream|pipe\(",
-            r"websocket|socket\.|ws\.",
-            r"@stream\s+|@realtime\s+",
-            r"EventSource|SSE|Server-Sent"
-        ),
-        "configuration": (
-            r"config\.|settings\.|env\.",
-            r"process\.env",
-            r"@config\s+|@setting\s+",
-            r"\.env|config\.json|settings\.yaml"
-        ),
-        "utility": (
-            r"util\.|helper\.|common\.",
-            r"@util\s+|@helper\s+",
-            r"function\s+\w+\s*\([^)]*\)"
-        )
-    }
     category = "other"
     tags = set()
     ext = Path(file_path).suffix.lower()
     if ext in SNIPPET_EXTENSIONS:
         tags.add(f"lang:{SNIPPET_EXTENSIONS[ext]}")
-    for cat, patterns in categories.items():
-        if any(re.search(pattern, content, re.IGNORECASE | re.MULTILINE) for pattern in patterns):
+    for cat, pattern in _CATEGORY_RES.items():
+        if pattern.search(content):
             category = cat
             tags.add(cat)
             break
-    tag_patterns = {
-        "async": r"async|await|promise|then\(",
-        "error-handling": r"try|catch|throw|error|exception",
-        "testing": r"test|describe|it\(|assert|expect",
-        "security": r"encrypt|decrypt|hash|salt|secure",
-        "validation": r"validate|schema|check|verify",
-        "caching": r"cache|redis|memcache",
-        "logging": r"log\.|logger\.|console\.",
-        "middleware": r"middleware|interceptor|filter",
-        "frontend": r"component|render|view|template",
-        "backend": r"controller|service|repository|model"
-    }
-    for tag, pattern in tag_patterns.items():
-        if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
+    for tag, pattern in _TAG_RES.items():
+        if pattern.search(content):
             tags.add(tag)
     return category, tags
 
@@ -362,23 +400,119 @@ def compute_snippet_hash(content: str) -> str:
     normalized = re.sub(r'//.*$|\s*/\*.*?\*/\s*', '', normalized, flags=re.MULTILINE)
     return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
-def find_related_snippets(snippet: CodeSnippet, all_snippets: List[CodeSnippet]) -> List[str]:
+_FUNCTION_RE = re.compile(r'function\s+(\w+)')
+_ROUTE_RE = re.compile(r'\.(?:get|post|put|delete|patch)\s*\([\'"]([^\'"]+)[\'"]')
+_TERM_RE = re.compile(r'[\w@$-]+')
+
+class SnippetRelations:
+    """
+    Postings lists over a collection of snippets, used to find related
+    snippets without comparing every pair.
+
+    Tags, imported modules, function names and HTTP route patterns are
+    extracted once per snippet and recorded as sorted lists of snippet
+    positions. A snippet's related snippets are found by merging the lists
+    for its own features.
+    """
+
+    def __init__(self, snippets: List[CodeSnippet]):
+        self.snippets = snippets
+        self.tags: Dict[str, List[int]] = defaultdict(list)
+        self.imports: Dict[str, List[int]] = defaultdict(list)
+        self.functions: Dict[str, List[int]] = defaultdict(list)
+        self.routes: Dict[str, List[int]] = defaultdict(list)
+        self._tag_sets: Dict[str, Set[int]] = {}
+        self._features: List[Tuple[Set[str], Set[str], Set[str]]] = []
+        for position, snippet in enumerate(snippets):
+            functions = set(_FUNCTION_RE.findall(snippet.content))
+            routes = set(_ROUTE_RE.findall(snippet.content))
+            for tag in snippet.tags:
+                self.tags[tag].append(position)
+            for module in extract_imports(snippet.content):
+                self.imports[module].append(position)
+            for name in functions:
+                self.functions[name].append(position)
+            for route in routes:
+                self.routes[route].append(position)
+            self._features.append((set(_TERM_RE.findall(snippet.content)), functions, routes))
+
+    def related(self, position: int, limit: int = 5) -> List[str]:
+        """
+        Hashes of up to `limit` snippets related to the snippet at `position`,
+        in collection order. Another snippet is related if it shares at least
+        two tags, imports a module named in this snippet, or shares a
+        function name or route pattern.
+        """
+        snippet = self.snippets[position]
+        terms, functions, routes = self._features[position]
+        # A snippet sharing two tags appears in at least one of the shorter
+        # tag lists, so only those are walked; the longest is a set lookup.
+        tag_lists = sorted(snippet.tags, key=lambda tag: len(self.tags[tag]))
+        widest = self._tag_set(tag_lists[-1]) if len(tag_lists) >= 2 else set()
+        # Each stream yields (position, is_tag); merged, they arrive in order
+        streams = [zip(self.tags[tag], repeat(True)) for tag in tag_lists[:-1]]
+        postings = [self.imports[term] for term in terms if term in self.imports]
+        postings += [self.functions[name] for name in functions]
+        postings += [self.routes[route] for route in routes]
+        streams += [zip(plist, repeat(False)) for plist in postings]
+        related: List[str] = []
+        current, shared_tags, strong = None, 0, False
+        for other, is_tag in heapq.merge(*streams):
+            if other != current:
+                if current is not None and (strong or shared_tags + (current in widest) >= 2):
+                    self._add(related, current, snippet.hash)
+                    if len(related) >= limit:
+                        return related
+                current, shared_tags, strong = other, 0, False
+            if is_tag:
+                shared_tags += 1
+            else:
+                strong = True
+        if current is not None and (strong or shared_tags + (current in widest) >= 2):
+            self._add(related, current, snippet.hash)
+        return related
+
+    def _tag_set(self, tag: str) -> Set[int]:
+        positions = self._tag_sets.get(tag)
+        if positions is None:
+            positions = self._tag_sets[tag] = set(self.tags[tag])
+        return positions
+
+    def _add(self, related: List[str], position: int, own_hash: str) -> None:
+        other_hash = self.snippets[position].hash
+        if other_hash != own_hash and other_hash not in related:
+            related.append(other_hash)
+
+def find_related_snippets(
+    snippet: CodeSnippet,
+    all_snippets: List[CodeSnippet],
+    relations: Optional[SnippetRelations] = None
+) -> List[str]:
     """
     Finds related snippets to the given snippet based on tags, imports, and function patterns.
     Returns a list of related snippet hashes.
+
+    Pass a SnippetRelations built over all_snippets to avoid rebuilding the
+    postings lists on every call; link_related_snippets does this for a
+    whole collection.
     """
-    related = []
-    for other in all_snippets:
-        if other.hash == snippet.hash:
-            continue
-        common_tags = len(snippet.tags & other.tags)
-        if common_tags >= 2:
-            related.append(other.hash)
-        if any(mod in snippet.content for mod in extract_imports(other.content)):
-            related.append(other.hash)
-        if similar_patterns(snippet.content, other.content):
-            related.append(other.hash)
-    return related[:5]
+    if relations is None:
+        relations = SnippetRelations(all_snippets)
+    for position, other in enumerate(all_snippets):
+        if other is snippet:
+            return relations.related(position)
+    # The snippet is not part of the collection: index it alongside it
+    return SnippetRelations(list(all_snippets) + [snippet]).related(len(all_snippets))
+
+def link_related_snippets(snippets: List[CodeSnippet]) -> SnippetRelations:
+    """
+    Sets related_snippets on every snippet in the collection, building the
+    postings lists once. Returns the SnippetRelations for further lookups.
+    """
+    relations = SnippetRelations(snippets)
+    for position, snippet in enumerate(snippets):
+        snippet.related_snippets = relations.related(position)
+    return relations
 
 def extract_imports(content: str) -> Set[str]:
     """
@@ -395,13 +529,9 @@ def similar_patterns(content1: str, content2: str) -> bool:
     """
     Checks if two code snippets have similar function names or API call patterns.
     """
-    funcs1 = set(re.findall(r'function\s+(\w+)', content1))
-    funcs2 = set(re.findall(r'function\s+(\w+)', content2))
-    if funcs1 & funcs2:
+    if set(_FUNCTION_RE.findall(content1)) & set(_FUNCTION_RE.findall(content2)):
         return True
-    patterns1 = set(re.findall(r'\.(?:get|post|put|delete|patch)\s*\([\'"]([^\'"]+)[\'"]', content1))
-    patterns2 = set(re.findall(r'\.(?:get|post|put|delete|patch)\s*\([\'"]([^\'"]+)[\'"]', content2))
-    return bool(patterns1 & patterns2)
+    return bool(set(_ROUTE_RE.findall(content1)) & set(_ROUTE_RE.findall(content2)))
 
 def extract_snippets(content: str) -> List[Tuple[str, int, int]]:
     """
@@ -411,19 +541,21 @@ def extract_snippets(content: str) -> List[Tuple[str, int, int]]:
     blocks = split_into_blocks(content)
     return [(block.content, block.start_line, block.end_line) for block in blocks]
 
-def split_into_blocks(content: str) -> List[CodeBlock]:
+def split_into_blocks(content: Union[str, Iterable[str]]) -> List[CodeBlock]:
     """
     Splits text content into meaningful code blocks using indentation and pattern heuristics.
-    Returns a list of CodeBlock objects.
+    `content` may be a string or an iterable of lines (e.g. iter_lines(iter_file_text(path))),
+    which is consumed lazily. Returns a list of CodeBlock objects.
     """
-    lines = content.splitlines()
-    if not lines:
-        return []
+    lines = content.splitlines() if isinstance(content, str) else content
     blocks = []
     current_block = []
     start_line = 1
     block_indent_level = None
+    i = 0
+    previous = current = ""
     for i, line in enumerate(lines, 1):
+        previous, current = current, line
         line_content = line.rstrip()
         line_indent = len(line_content) - len(line_content.lstrip())
         if not current_block and not line_content.strip():
@@ -464,7 +596,7 @@ def split_into_blocks(content: str) -> List[CodeBlock]:
                 block_indent_level = line_indent
                 continue
         current_block.append(line_content)
-        if i > 2 and not line_content.strip() and not lines[i-2].strip():
+        if i > 2 and not line_content.strip() and not previous.strip():
             if current_block:
                 block_content = '\n'.join(current_block[:-2])
                 if is_meaningful_block(block_content):
@@ -482,7 +614,7 @@ def split_into_blocks(content: str) -> List[CodeBlock]:
             blocks.append(CodeBlock(
                 content=block_content,
                 start_line=start_line,
-                end_line=len(lines)
+                end_line=i
             ))
     return blocks
 
@@ -533,13 +665,80 @@ def is_meaningful_block(content: str) -> bool:
             return True
     return False
 
+def snippet_records(file_path: Path, blocks: List[CodeBlock]) -> List[Dict[str, Any]]:
+    """
+    Builds the search-index records for blocks extracted from a file:
+    CodeSnippet dictionaries with category, tags and hash, plus "imports".
+    """
+    file_path = Path(file_path)
+    language = CODE_EXTENSIONS.get(file_path.suffix.lower(), "text")
+    records = []
+    for block in blocks:
+        category, tags = categorize_snippet(block.content, str(file_path))
+        record = CodeSnippet(
+            content=block.content,
+            file_path=str(file_path),
+            start_line=block.start_line,
+            end_line=block.end_line,
+            language=language,
+            category=category,
+            tags=tags,
+            hash=compute_snippet_hash(block.content)
+        ).to_dict()
+        record["imports"] = sorted(extract_imports(block.content))
+        records.append(record)
+    return records
+
+def extract_file_snippets(file_path: Path, scan_credentials: bool = True) -> Dict[str, Any]:
+    """
+    Extracts code blocks, their search-index records and API credential
+    findings from one file without writing anything. Module-level and
+    picklable so it can run in a worker process; the caller writes the results.
+
+    Returns a dictionary with the file, its code blocks, snippet records,
+    credential findings (empty when scan_credentials is False) and any
+    error message. A failing credential scan is reported in "creds_error"
+    and does not affect block extraction.
+    """
+    result = {"file": str(file_path), "blocks": [], "snippets": [], "api_creds": {}, "error": None, "creds_error": None}
+    creds: Dict[str, List[str]] = {}
+
+    def chunks() -> Iterable[str]:
+        # Lines are streamed from disk so large files are never fully loaded;
+        # each chunk is scanned for credentials as it passes through
+        for chunk in iter_file_text(file_path, max_bytes=MAX_TEXT_BYTES):
+            if scan_credentials:
+                try:
+                    for key, found in scan_for_api_credentials(chunk).items():
+                        creds.setdefault(key, []).extend(found)
+                except Exception as e:
+                    result["creds_error"] = str(e)
+            yield chunk
+
+    try:
+        result["blocks"] = split_into_blocks(iter_lines(chunks()))
+        result["snippets"] = snippet_records(file_path, result["blocks"])
+        result["api_creds"] = {key: list(dict.fromkeys(found)) for key, found in creds.items()}
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def write_api_credentials(file_path: Path, creds: Dict[str, List[str]], api_creds_path: Path) -> None:
+    """
+    Appends one file's credential findings to api_creds_path as a JSON line.
+    """
+    api_creds_path.parent.mkdir(parents=True, exist_ok=True)
+    with api_creds_path.open('a', encoding='utf-8') as f:
+        f.write(json.dumps({"file": str(file_path), "found": current_timestamp(), **creds}) + "\n")
+
 def process_snippet_file(
     file_path: Path, 
     output_path: Path, 
     api_creds_path: Optional[Path], 
     log_path: Optional[Path], 
     log_callback: Optional[Callable[[str], None]] = None,
-    provider: str = None
+    provider: str = None,
+    extraction: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Processes a single file for snippet extraction.
@@ -552,6 +751,8 @@ def process_snippet_file(
         log_path: Path to write logs
         log_callback: Optional callback for logging
         provider: AI provider to use for advanced features
+        extraction: Result of extract_file_snippets computed elsewhere (for
+            example in a worker process); only the writing is done here
     """
     results = {
         "file": str(file_path),
@@ -561,13 +762,19 @@ def process_snippet_file(
         "extracted_snippets": []
     }
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        if log_callback:
-            log_callback(f"[dim]Reading {len(content)} bytes from {file_path}[/dim]")
-        time.sleep(0.5)
-        if log_callback:
-            log_callback(f"[dim]Analyzing content to extract code blocks from {file_path}...[/dim]")
-        blocks = split_into_blocks(content)
+        if extraction is None:
+            if log_callback:
+                log_callback(f"[dim]Reading {file_path.stat().st_size} bytes from {file_path}[/dim]")
+                log_callback(f"[dim]Analyzing content to extract code blocks from {file_path}...[/dim]")
+            extraction = extract_file_snippets(file_path)
+        if extraction["error"]:
+            raise RuntimeError(extraction["error"])
+        blocks = extraction["blocks"]
+        creds = extraction["api_creds"]
+        if any(creds.values()):
+            results["api_creds_found"] = True
+            if api_creds_path:
+                write_api_credentials(file_path, creds, api_creds_path)
         if log_callback:
             log_callback(f"[dim]Found {len(blocks)} potential code blocks in {file_path}[/dim]")
         if blocks:
@@ -595,7 +802,6 @@ def process_snippet_file(
                         "end_line": block.end_line,
                         "language": syntax_language
                     })
-            time.sleep(0.5)
             if log_callback:
                 log_callback(f"[success]Extracted {len(blocks)} snippets from {file_path} to {snippet_file}[/success]")
         else:
@@ -607,10 +813,64 @@ def process_snippet_file(
             log_callback(f"[error]Error processing {file_path}: {str(e)}[/error]")
     return results
 
+def iter_snippet_extractions(
+    files: List[Path],
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    scan_credentials: bool = True
+) -> Iterable[Tuple[Path, Dict[str, Any]]]:
+    """
+    Yields (file_path, extract_file_snippets result) for each file. With more
+    than one worker, files are extracted on a single process pool and yielded
+    as they finish, with at most `window` files (default four per worker)
+    submitted at a time; otherwise they are extracted in order in this process.
+    """
+    workers = max(1, workers or SNIPPET_WORKERS)
+    if workers == 1 or len(files) < 2:
+        for file_path in files:
+            yield file_path, extract_file_snippets(file_path, scan_credentials)
+        return
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(files)))
+    except (OSError, NotImplementedError) as e:
+        console.print(f"[yellow]Process pool unavailable ({e}); extracting snippets sequentially[/yellow]")
+        for file_path in files:
+            yield file_path, extract_file_snippets(file_path, scan_credentials)
+        return
+    queue = iter(files)
+    in_flight = {}
+    try:
+        def submit_next() -> bool:
+            file_path = next(queue, None)
+            if file_path is None:
+                return False
+            in_flight[pool.submit(extract_file_snippets, file_path, scan_credentials)] = file_path
+            return True
+        for _ in range(max(workers, window or workers * 4)):
+            if not submit_next():
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = in_flight.pop(future)
+                try:
+                    extraction = future.result()
+                except Exception as e:
+                    extraction = {"file": str(file_path), "blocks": [], "snippets": [], "api_creds": {}, "error": str(e)}
+                submit_next()
+                yield file_path, extraction
+    finally:
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=True)
+
 def write_organized_snippets(snippets: List[CodeSnippet], output_path: Path) -> None:
     """
     Writes snippets to organized files by category and generates an index.
+    Snippets whose related snippets have not been computed are linked first.
     """
+    if any(snippet.related_snippets is None for snippet in snippets):
+        link_related_snippets(snippets)
     output_path.mkdir(parents=True, exist_ok=True)
     with open(output_path / "index.md", "w", encoding="utf-8") as f:
         f.write("# Code Snippets\n\n")
@@ -642,20 +902,25 @@ def batch_process_snippets(
     log_path: Optional[Path],
     batch_size: int = 50,
     log_callback: Optional[Callable[[str], None]] = None,
-    provider: str = None
+    provider: str = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Processes files in batches for snippet extraction.
-    Returns a dictionary with processing statistics.
+    Extraction runs on a process pool (see iter_snippet_extractions); all
+    output files are written from this process.
+    Returns a dictionary with processing statistics, including files_per_second.
     
     Args:
         files: List of files to process
         output_path: Path to write the extracted snippets
         api_creds_path: Path to write API credentials found in the files
         log_path: Path to write logs
-        batch_size: Number of files to process in each batch
+        batch_size: Number of files to process in each batch (also the
+            number of files queued on the extraction pool at once)
         log_callback: Optional callback for logging
         provider: AI provider to use for advanced features
+        workers: Extraction processes (defaults to SNIPPET_WORKERS)
     """
     def log(msg: str) -> None:
         if log_callback:
@@ -664,26 +929,36 @@ def batch_process_snippets(
             log_message(msg, log_path)
     if not files:
         log("[yellow]No files to process for snippets.[/]")
-        return {"total": 0, "with_snippets": 0, "with_creds": 0, "errors": 0}
+        return {"total": 0, "with_snippets": 0, "with_creds": 0, "errors": 0, "total_snippets": 0, "files_per_second": 0.0}
     stats = {
         "total": len(files),
         "with_snippets": 0,
         "with_creds": 0,
-        "errors": 0
+        "errors": 0,
+        "total_snippets": 0
     }
     batches = [files[i:i+batch_size] for i in range(0, len(files), batch_size)]
     log(f"[cyan]Processing {len(files)} files in {len(batches)} batches[/]")
-    for batch_idx, batch in enumerate(batches, 1):
-        log(f"[cyan]Processing batch {batch_idx}/{len(batches)} ({len(batch)} files)[/]")
-        for file_idx, file_path in enumerate(batch, 1):
-            log(f"[cyan]Processing file {file_idx}/{len(batch)} in batch {batch_idx}: {file_path.name}[/]")
-            result = process_snippet_file(file_path, output_path, api_creds_path, log_path, log_callback, provider)
-            if result["snippets_found"]:
-                stats["with_snippets"] += 1
-            if result["api_creds_found"]:
-                stats["with_creds"] += 1
-            if result["error"]:
-                stats["errors"] += 1
+    index = open_snippet_index(output_path)
+    start = time.perf_counter()
+    for position, (file_path, extraction) in enumerate(iter_snippet_extractions(files, workers, batch_size)):
+        batch_idx, file_idx = divmod(position, batch_size)
+        if file_idx == 0:
+            log(f"[cyan]Processing batch {batch_idx + 1}/{len(batches)} ({len(batches[batch_idx])} files)[/]")
+        log(f"[cyan]Processed file {file_idx + 1}/{len(batches[batch_idx])} in batch {batch_idx + 1}: {file_path.name}[/]")
+        result = process_snippet_file(file_path, output_path, api_creds_path, log_path, log_callback, provider, extraction)
+        if result["snippets_found"]:
+            stats["with_snippets"] += 1
+            stats["total_snippets"] += len(result["extracted_snippets"])
+        if result["api_creds_found"]:
+            stats["with_creds"] += 1
+        if result["error"]:
+            stats["errors"] += 1
+        elif index is not None:
+            index_extracted_snippets(index, file_path, extraction["snippets"])
+    elapsed = time.perf_counter() - start
+    stats["files_per_second"] = len(files) / elapsed if elapsed > 0 else 0.0
+    log(f"[cyan]Extracted snippets from {len(files)} files at {stats['files_per_second']:.1f} files/s[/]")
     return stats
 
 def is_code_file(file_path: Path) -> bool:
@@ -702,6 +977,21 @@ def is_code_file(file_path: Path) -> bool:
         pass
     return False
 
+def find_code_files(directory: Path, recursive: bool = True) -> List[Path]:
+    """
+    Lists code files under a directory via the shared file manifest, skipping
+    hidden files and directories whose names start with '.' or '__'.
+    """
+    directory = Path(directory)
+    found = []
+    for file_path in scan_files(directory, recursive):
+        parts = file_path.relative_to(directory).parts
+        if parts[-1].startswith('.') or any(p.startswith('.') or p.startswith('__') for p in parts[:-1]):
+            continue
+        if is_code_file(file_path):
+            found.append(file_path)
+    return found
+
 def process_snippets(
     file_or_dir: Path, 
     recursive: bool = False, 
@@ -709,20 +999,26 @@ def process_snippets(
     exclude_ext: Set[str] = None,
     omni_paths: Dict[str, Any] = None,
     log_callback: Optional[Callable[[str], None]] = None,
-    provider: str = None
-) -> None:
+    provider: str = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Main entry point for extracting code snippets from a file or directory.
     Handles batch processing, directory traversal, and progress reporting.
+    Files are split into blocks and scanned for credentials on a process pool;
+    snippet files are written by this process as results arrive and added to
+    the snippet directory's search index (see search_snippets).
+    Returns the processing statistics.
     
     Args:
         file_or_dir: File or directory to process
         recursive: If True, process subdirectories recursively
-        batch_size: Number of files to process in each batch
+        batch_size: Number of files queued on the extraction pool at once
         exclude_ext: Set of extensions to exclude
         omni_paths: Dictionary of paths to use for output
         log_callback: Optional callback for logging
         provider: AI provider to use (ollama, xai, gemini)
+        workers: Extraction processes (defaults to SNIPPET_WORKERS; 1 runs in-process)
     """
     if omni_paths is None:
         omni_paths = {}
@@ -744,20 +1040,7 @@ def process_snippets(
         elif log_callback:
             log_callback(f"[info]Skipping non-code file: {file_or_dir}[/info]")
     else:
-        if recursive:
-            for root, dirs, files in os.walk(file_or_dir):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and not d.startswith('__')]
-                root_path = Path(root)
-                for file in files:
-                    if file.startswith('.'):
-                        continue
-                    file_path = root_path / file
-                    if is_code_file(file_path):
-                        files_to_process.append(file_path)
-        else:
-            for f in file_or_dir.iterdir():
-                if f.is_file() and not f.name.startswith('.') and is_code_file(f):
-                    files_to_process.append(f)
+        files_to_process = find_code_files(file_or_dir, recursive)
     if not files_to_process:
         if log_callback:
             log_callback(f"[warning]No code files found for snippet extraction. Make sure files have extensions defined in CODE_EXTENSIONS.[/warning]")
@@ -768,7 +1051,7 @@ def process_snippets(
             border_style="yellow",
             box=box.ROUNDED
         ))
-        return
+        return {"total": 0, "with_snippets": 0, "with_creds": 0, "failed": 0, "total_snippets": 0, "files_per_second": 0.0}
     extension_counts = {}
     for file in files_to_process:
         ext = file.suffix.lower() if file.suffix else "(no extension)"
@@ -792,58 +1075,69 @@ def process_snippets(
         stats = {
             "total": len(files_to_process),
             "with_snippets": 0,
+            "with_creds": 0,
             "failed": 0,
             "total_snippets": 0
         }
-        for i in range(0, len(files_to_process), batch_size):
-            batch = files_to_process[i:i + batch_size]
-            for file_path in batch:
-                try:
-                    progress.update(total_task, description=f"[cyan]Processing[/cyan] → {file_path.name}")
-                    rel_path = file_path.relative_to(file_or_dir) if file_or_dir.is_dir() else file_path.name
-                    output_dir = snippets_dir / "code_snippets" / Path(rel_path).parent
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    result = process_snippet_file(
-                        file_path,
-                        output_dir,
-                        None,
-                        log_file,
-                        log_callback,
-                        provider
-                    )
-                    time.sleep(0.1)
-                    if result.get("error"):
-                        if log_callback:
-                            log_callback(f"[error]Error processing {file_path}: {result['error']}[/error]")
-                        stats["failed"] += 1
-                    elif result.get("snippets_found"):
-                        snippet_count = len(result.get('extracted_snippets', []))
-                        stats["total_snippets"] += snippet_count
-                        if log_callback:
-                            log_callback(f"[success]Extracted {snippet_count} snippets from {file_path}[/success]")
-                        stats["with_snippets"] += 1
-                    else:
-                        if log_callback:
-                            log_callback(f"[info]No snippets found in {file_path}[/info]")
-                except Exception as e:
+        index = open_snippet_index(snippets_dir)
+        start = time.perf_counter()
+        for file_path, extraction in iter_snippet_extractions(files_to_process, workers, batch_size):
+            try:
+                progress.update(total_task, description=f"[cyan]Processing[/cyan] → {file_path.name}")
+                rel_path = file_path.relative_to(file_or_dir) if file_or_dir.is_dir() else file_path.name
+                output_dir = snippets_dir / "code_snippets" / Path(rel_path).parent
+                output_dir.mkdir(parents=True, exist_ok=True)
+                result = process_snippet_file(
+                    file_path,
+                    output_dir,
+                    None,
+                    log_file,
+                    log_callback,
+                    provider,
+                    extraction
+                )
+                if index is not None and not result.get("error"):
+                    index_extracted_snippets(index, file_path, extraction["snippets"])
+                if result.get("api_creds_found"):
+                    stats["with_creds"] += 1
+                if result.get("error"):
                     if log_callback:
-                        log_callback(f"[error]Failed to process {file_path}: {str(e)}[/error]")
+                        log_callback(f"[error]Error processing {file_path}: {result['error']}[/error]")
                     stats["failed"] += 1
-                progress.update(total_task, advance=1)
-            time.sleep(0.05)
+                elif result.get("snippets_found"):
+                    snippet_count = len(result.get('extracted_snippets', []))
+                    stats["total_snippets"] += snippet_count
+                    if log_callback:
+                        log_callback(f"[success]Extracted {snippet_count} snippets from {file_path}[/success]")
+                    stats["with_snippets"] += 1
+                else:
+                    if log_callback:
+                        log_callback(f"[info]No snippets found in {file_path}[/info]")
+            except Exception as e:
+                if log_callback:
+                    log_callback(f"[error]Failed to process {file_path}: {str(e)}[/error]")
+                stats["failed"] += 1
+            progress.update(total_task, advance=1)
+    elapsed = time.perf_counter() - start
+    stats["files_per_second"] = stats["total"] / elapsed if elapsed > 0 else 0.0
+    if log_callback:
+        log_callback(f"[info]Processed {stats['total']} files in {elapsed:.2f}s ({stats['files_per_second']:.1f} files/s)[/info]")
     console.print()
     console.print(Panel(
         f"[bold green]✓[/bold green] Snippet extraction complete!\n"
         f"[cyan]Code files processed:[/cyan] {stats['total']}\n"
         f"[cyan]Files with snippets:[/cyan] {stats['with_snippets']}\n"
         f"[cyan]Total snippets found:[/cyan] {stats['total_snippets']}\n"
+        f"[cyan]Files with possible credentials:[/cyan] {stats['with_creds']}\n"
         f"[cyan]Files with errors:[/cyan] {stats['failed']}\n"
+        f"[cyan]Throughput:[/cyan] {stats['files_per_second']:.1f} files/s\n"
         f"[cyan]Output directory:[/cyan] {snippets_dir / 'code_snippets'}\n\n"
         f"[dim]Note: Only code files (based on extension or shebang) were processed.[/dim]",
         title="[bold]Snippet Extraction Summary[/bold]",
         border_style="green",
         box=box.ROUNDED
     ))
+    return stats
 
 def process_directory(
     directory: Path,
@@ -929,22 +1223,7 @@ def process_directory(
                 result["output_dir"] = str(snippets_dir)
                 return result
         else:
-            if recursive:
-                for root, dirs, files in os.walk(directory):
-                    # Skip ignored directories
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and not d.startswith('__')]
-                    root_path = Path(root)
-                    
-                    for file in files:
-                        if file.startswith('.'):
-                            continue
-                        file_path = root_path / file
-                        if is_code_file(file_path):
-                            files_to_process.append(file_path)
-            else:
-                for f in directory.iterdir():
-                    if f.is_file() and not f.name.startswith('.') and is_code_file(f):
-                        files_to_process.append(f)
+            files_to_process = find_code_files(directory, recursive)
         
         # Log number of files found
         if log_callback:
@@ -975,7 +1254,8 @@ def process_directory(
         result["files_processed"] = len(files_to_process)
         result["with_snippets"] = stats.get("with_snippets", 0)
         result["snippets_found"] = stats.get("total_snippets", 0)
-        result["files_with_errors"] = stats.get("failed", 0)
+        result["files_with_errors"] = stats.get("errors", 0)
+        result["files_per_second"] = stats.get("files_per_second", 0.0)
         result["output_dir"] = str(snippets_dir / "code_snippets")
         
         return result
@@ -987,6 +1267,46 @@ def process_directory(
         result["error"] = error_msg
         return result
 
+def open_snippet_index(snippets_dir: Path):
+    """
+    Returns the shared search index for a snippet directory, seeding it from
+    the *.snippet.json files already in the store the first time it is used.
+    Returns None if the index is unavailable (for example, SQLite built
+    without FTS5), in which case callers fall back to scanning the store.
+    """
+    if get_snippet_index is None:
+        return None
+    try:
+        index = get_snippet_index(snippets_dir)
+        if not index.seeded:
+            pending, imports = [], {}
+            for snippet_file in Path(snippets_dir).rglob("*.snippet.json"):
+                try:
+                    snippet_data = json.loads(snippet_file.read_text(encoding="utf-8"))
+                    pending.append(snippet_data)
+                    imports[snippet_data["hash"]] = extract_imports(snippet_data.get("content", ""))
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Error reading snippet file {snippet_file}: {e}")
+                if len(pending) >= 500:
+                    index.add_many(pending, imports=imports)
+                    pending, imports = [], {}
+            index.add_many(pending, imports=imports)
+            index.mark_seeded()
+        return index
+    except Exception as e:
+        console.print(f"[yellow]Snippet index unavailable ({e}); searching files directly[/yellow]")
+        return None
+
+def index_extracted_snippets(index, file_path: Path, snippets: List[Dict[str, Any]]) -> int:
+    """
+    Replaces the indexed snippets for one source file with the snippet
+    records just extracted from it (extract_file_snippets' "snippets").
+    Returns the number of snippets indexed.
+    """
+    records = [{k: v for k, v in snippet.items() if k != "imports"} for snippet in snippets]
+    imports = {snippet["hash"]: snippet.get("imports", ()) for snippet in snippets}
+    return index.add_many(records, source=str(Path(file_path).resolve()), imports=imports, replace_source=True)
+
 # Functions for importing and exporting snippets
 def search_snippets(
     query: str,
@@ -996,19 +1316,28 @@ def search_snippets(
     """
     Search for snippets matching a query string.
     
+    Uses the snippet directory's inverted index: results are ranked by BM25
+    over code tokens, tags, category, language and imports, and a term ending
+    in '*' matches as a prefix (e.g. "auth* fetch"). Without the index, every
+    snippet file is scanned for the query as a substring.
+    
     Args:
         query: Search query
         snippets_dir: Directory containing snippet files
         limit: Maximum number of results to return
         
     Returns:
-        List of matching snippets as dictionaries
+        List of matching snippets as dictionaries, best first, each with a
+        "score" when the index is used
     """
+    index = open_snippet_index(snippets_dir)
+    if index is not None:
+        return index.search(query, limit)
+
     results = []
     pattern = re.compile(re.escape(query), re.IGNORECASE)
     
-    snippet_files = list(snippets_dir.rglob("*.snippet.json"))
-    for snippet_file in snippet_files[:100]:  # Limit to prevent too much processing
+    for snippet_file in snippets_dir.rglob("*.snippet.json"):
         try:
             with open(snippet_file, "r", encoding="utf-8") as f:
                 snippet_data = json.load(f)
@@ -1125,6 +1454,11 @@ def import_snippet(
     with open(snippet_file, "w", encoding="utf-8") as f:
         json.dump(snippet.to_dict(), f, indent=2)
     
+    # Keep the search index in step with the store
+    index = open_snippet_index(snippets_dir)
+    if index is not None:
+        index.add(snippet.to_dict(), imports=extract_imports(content))
+    
     return snippet.to_dict()
 
 def list_snippet_formats() -> List[str]:
@@ -5,6 +5,32 @@ This package contains various utility functions and classes
 used throughout the Herd AI toolkit.
 """
 
-# Import commonly used utilities for convenience
-from .cache import clear_cache, get_cache_path
-from .file import get_file_text, clean_filename 
\ No newline at end of file
+# Commonly used utilities, imported on first access (PEP 562) so that
+# importing one utility module does not load requests and the file readers.
+# Maps name -> (module, attribute).
+_LAZY_ATTRIBUTES = {
+    "clear_cache": (".cache", "clear_cache"),
+    "get_cache_path": (".cache", "get_cache_path"),
+    "get_cache_stats": (".cache", "get_cache_stats"),
+    "get_file_text": (".file", "get_file_text"),
+    "iter_file_text": (".file", "iter_file_text"),
+    "clean_filename": (".file", "clean_filename"),
+    "get_manifest": (".file", "get_manifest"),
+    "scan_files": (".file", "scan_files"),
+    "get_http_stats": (".sessions", "get_http_stats"),
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
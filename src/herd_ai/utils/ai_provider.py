@@ -25,10 +25,12 @@
 #
 ###############################################################################
 
+import atexit
+import hashlib
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
-import requests
+from typing import Optional, Dict, Any, Tuple, Union
 from herd_ai.config import DEFAULT_COHERE_MODEL
 
 # Add OpenAI import
@@ -61,6 +63,11 @@ except ImportError:
     except ImportError:
         cohere = None
 
+try:
+    from herd_ai.utils import sessions
+except ImportError:
+    import utils.sessions as sessions
+
 ###############################################################################
 # Provider and Config Import Logic
 #
@@ -75,7 +82,8 @@ try:
             is_image_extension, get_model_for_file, 
             INSTRUCTION_TEMPLATE, IMAGE_ALT_TEXT_TEMPLATE,
             OPENAI_API_KEY, DEFAULT_OPENAI_MODEL,  # OpenAI config imports
-            MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL  # Mistral config imports
+            MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL,  # Mistral config imports
+            AI_CACHE_MAX_BYTES, AI_CACHE_MAX_AGE_DAYS
         )
         from herd_ai.utils import ollama, xai, gemini
         from herd_ai.utils import config as herd_config
@@ -86,7 +94,8 @@ try:
                 is_image_extension, get_model_for_file, 
                 INSTRUCTION_TEMPLATE, IMAGE_ALT_TEXT_TEMPLATE,
                 OPENAI_API_KEY, DEFAULT_OPENAI_MODEL,  # OpenAI config imports
-                MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL  # Mistral config imports
+                MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL,  # Mistral config imports
+                AI_CACHE_MAX_BYTES, AI_CACHE_MAX_AGE_DAYS
             )
             from llamacleaner.utils import ollama, xai, gemini
             from llamacleaner.utils import config as herd_config
@@ -96,7 +105,8 @@ try:
                 is_image_extension, get_model_for_file, 
                 INSTRUCTION_TEMPLATE, IMAGE_ALT_TEXT_TEMPLATE,
                 OPENAI_API_KEY, DEFAULT_OPENAI_MODEL,  # OpenAI config imports
-                MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL  # Mistral config imports
+                MISTRAL_API_KEY, DEFAULT_MISTRAL_MODEL,  # Mistral config imports
+                AI_CACHE_MAX_BYTES, AI_CACHE_MAX_AGE_DAYS
             )
             import utils.ollama as ollama
             import utils.xai as xai
@@ -113,6 +123,8 @@ except Exception as e:
     DEFAULT_OPENAI_MODEL = "gpt-4o"
     MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY", "")
     DEFAULT_MISTRAL_MODEL = "mistral-medium"
+    AI_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    AI_CACHE_MAX_AGE_DAYS = 30.0
     def is_image_extension(file_path):
         return str(file_path).lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.svg'))
     def get_model_for_file(file_path, provider="ollama"):
@@ -153,6 +165,9 @@ OPENAI_DEFAULT_MODELS = {
     }
 }
 
+# Mistral image payloads are kept within this many pixels per side
+MISTRAL_IMAGE_MAX_SIDE = 1024
+
 # Mistral default models
 MISTRAL_DEFAULT_MODELS = {
     "mistral-tiny": {
@@ -204,6 +219,96 @@ def get_ai_provider(provider: str = None) -> str:
         provider = DEFAULT_AI_PROVIDER
     return provider
 
+###############################################################################
+# Response Cache
+#
+# Opt-in memoization of process_with_ai. Responses are stored in a DocCache
+# (SQLite, TTL and LRU-by-size eviction) keyed by a hash of the provider,
+# model, system prompt, prompt, extra arguments and the file's content, so an
+# unchanged file sent with an unchanged prompt is answered from disk. Error
+# responses are never cached.
+###############################################################################
+AI_CACHE_ENV = "LLAMACLEANER_AI_CACHE"
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+_content_hashes: Dict[Tuple[str, int, int], str] = {}
+
+def response_cache_enabled() -> bool:
+    return os.environ.get(AI_CACHE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+def get_response_cache():
+    """Return the shared AI response cache, or None if it cannot be opened."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            try:
+                from herd_ai.utils.cache import DocCache, CACHE_DIR
+            except ImportError:
+                try:
+                    from llamacleaner.utils.cache import DocCache, CACHE_DIR
+                except ImportError:
+                    from utils.cache import DocCache, CACHE_DIR
+            try:
+                _response_cache = DocCache(
+                    Path(CACHE_DIR) / "ai_responses.sqlite3",
+                    max_bytes=AI_CACHE_MAX_BYTES,
+                    max_age_days=AI_CACHE_MAX_AGE_DAYS
+                )
+                atexit.register(_response_cache.close)
+            except Exception as e:
+                logger.error(f"Error opening AI response cache: {e}")
+                return None
+        return _response_cache
+
+def clear_response_cache() -> bool:
+    cache = get_response_cache()
+    if cache is None:
+        return False
+    cache.clear()
+    return True
+
+def _file_content_hash(file_path: Union[str, Path]) -> Optional[str]:
+    """SHA-256 of a file's bytes, memoized per (path, size, mtime) for this process."""
+    try:
+        st = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    memo_key = (str(file_path), st.st_size, st.st_mtime_ns)
+    digest = _content_hashes.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _content_hashes[memo_key] = digest
+    return digest
+
+def _response_cache_key(file_path, prompt, provider, system_prompt, kwargs) -> str:
+    try:
+        model = get_model_for_file(file_path, provider)
+    except Exception:
+        model = None
+    parts = [
+        provider,
+        kwargs.get("model") or model,
+        system_prompt,
+        prompt,
+        _file_content_hash(file_path),
+        sorted((k, repr(v)) for k, v in kwargs.items()),
+    ]
+    return "ai:" + hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+def _is_cacheable(result: Any) -> bool:
+    if result is None:
+        return False
+    if isinstance(result, dict):
+        return not result.get("error") and "stream" not in result
+    if isinstance(result, str):
+        return bool(result.strip())
+    return False
+
 ###############################################################################
 # process_with_ai
 #
@@ -215,6 +320,10 @@ def get_ai_provider(provider: str = None) -> str:
 #   - provider (str, optional): AI provider to use. If None, uses default.
 #   - custom_system_prompt (str, optional): Custom system prompt to override
 #     the default instruction or image alt text template.
+#   - use_cache (bool, optional): Reuse responses from the on-disk response
+#     cache. Defaults to on when LLAMACLEANER_AI_CACHE is set.
+#   - image (DecodedImage, optional): Already-open image for image files. Its
+#     downscaled JPEG payload is sent instead of re-reading the file.
 #
 # Returns:
 #   - str | dict | None: The AI response, or None if processing failed.
@@ -230,11 +339,44 @@ def process_with_ai(
     prompt: str,
     provider: str = None,
     custom_system_prompt: str = None,
+    use_cache: Optional[bool] = None,
+    image: Any = None,
     **kwargs
 ) -> Optional[Union[str, dict]]:
     provider = get_ai_provider(provider)
     is_image = is_image_extension(file_path)
     system_prompt = custom_system_prompt or (IMAGE_ALT_TEXT_TEMPLATE if is_image else INSTRUCTION_TEMPLATE)
+    if use_cache is None:
+        use_cache = response_cache_enabled()
+    cache = get_response_cache() if use_cache else None
+    key = None
+    if cache is not None:
+        try:
+            key = _response_cache_key(file_path, prompt, provider, system_prompt, kwargs)
+            cached = cache.get(key)
+        except Exception as e:
+            logger.warning(f"AI response cache lookup failed for {file_path}: {e}")
+            key = cached = None
+        if cached is not None:
+            logger.info(f"Using cached {provider} response for {file_path}")
+            return cached
+    result = _call_provider(file_path, prompt, provider, system_prompt, is_image, image, **kwargs)
+    if key is not None and _is_cacheable(result):
+        try:
+            cache.set(key, result)
+        except (TypeError, ValueError):
+            logger.debug(f"Response for {file_path} is not JSON-serializable; not cached")
+    return result
+
+def _call_provider(
+    file_path: Union[str, Path],
+    prompt: str,
+    provider: str,
+    system_prompt: str,
+    is_image: bool,
+    image: Any = None,
+    **kwargs
+) -> Optional[Union[str, dict]]:
     logger.info(f"Processing {file_path} with {provider}")
 
     try:
@@ -244,7 +386,8 @@ def process_with_ai(
                     image_path=str(file_path),
                     prompt=prompt,
                     model=get_model_for_file(file_path, provider),
-                    system_prompt=system_prompt
+                    system_prompt=system_prompt,
+                    base64_image=_image_payload(image)
                 )
                 return response
             else:
@@ -258,7 +401,8 @@ def process_with_ai(
                 return xai.send_image_to_xai(
                     str(file_path),
                     model=get_model_for_file(file_path, provider),
-                    prompt=system_prompt
+                    prompt=system_prompt,
+                    base64_image=_image_payload(image)
                 )
             else:
                 return xai.send_prompt_to_xai(
@@ -271,7 +415,8 @@ def process_with_ai(
                 return gemini.send_image_to_gemini(
                     str(file_path),
                     model=get_model_for_file(file_path, provider),
-                    prompt=system_prompt
+                    prompt=system_prompt,
+                    base64_image=_image_payload(image)
                 )
             else:
                 return gemini.send_prompt_to_gemini(
@@ -296,6 +441,7 @@ def process_with_ai(
                     image_path=str(file_path),
                     prompt=prompt,
                     system_prompt=system_prompt,
+                    base64_image=_image_payload(image),
                     **kwargs
                 )
             else:
@@ -309,7 +455,8 @@ def process_with_ai(
                 return mistral.process_image_with_mistral(
                     image_path=str(file_path),
                     prompt=prompt,
-                    model=get_model_for_file(file_path, provider)
+                    model=get_model_for_file(file_path, provider),
+                    base64_image=_image_payload(image, MISTRAL_IMAGE_MAX_SIDE)
                 )
             elif mistral is not None:
                 return mistral.process_with_mistral(
@@ -328,6 +475,16 @@ def process_with_ai(
         logger.error(error_msg)
         return {"text": error_msg, "error": True, "as_text": True}
 
+def _image_payload(image: Any, max_side: Optional[int] = None) -> Optional[str]:
+    """Base64 JPEG payload from a DecodedImage, or None to let the client read the file."""
+    if image is None:
+        return None
+    try:
+        return image.base64(max_side)
+    except Exception as e:
+        logger.warning(f"Could not encode decoded image {getattr(image, 'path', '')}: {e}")
+        return None
+
 ###############################################################################
 # process_image
 #
@@ -436,6 +593,19 @@ def validate_provider(provider: str) -> bool:
             
     return True
 
+###############################################################################
+# get_provider_stats
+#
+# Report HTTP statistics for providers used in this process. Ollama, X.AI,
+# Gemini and Mistral requests go through pooled per-provider sessions.
+#
+# Returns:
+#   - dict: Per-provider requests, failures, retries, connections opened and
+#     reused, reuse rate, and average/maximum latency in seconds.
+###############################################################################
+def get_provider_stats() -> Dict[str, Dict[str, Any]]:
+    return sessions.get_http_stats()
+
 ###############################################################################
 # check_local_provider
 #
@@ -446,7 +616,7 @@ def validate_provider(provider: str) -> bool:
 ###############################################################################
 def check_local_provider() -> bool:
     try:
-        response = requests.get("http://localhost:11434/api/version", timeout=2)
+        response = sessions.get("ollama", "http://localhost:11434/api/version", timeout=2, retries=0)
         return response.status_code == 200
     except Exception:
         return False
@@ -631,6 +801,7 @@ def process_with_openai_image(
     system_prompt: str = None,
     model: str = None,
     max_tokens: int = None,
+    base64_image: Optional[str] = None,
     **kwargs
 ) -> dict:
     """
@@ -642,6 +813,7 @@ def process_with_openai_image(
         system_prompt: The system prompt to use
         model: The OpenAI model to use (must support vision)
         max_tokens: Maximum tokens for completion
+        base64_image: Pre-encoded JPEG payload; when given the file is not re-read
         
     Returns:
         Dict with response text and metadata
@@ -655,11 +827,14 @@ def process_with_openai_image(
         model = model or "gpt-4o"
         
         # Read and encode the image
-        with open(image_path, "rb") as image_file:
-            image_data = image_file.read()
-        
-        # Prepare base64 encoding for the image
-        encoded_image = base64.b64encode(image_data).decode('utf-8')
+        if base64_image is None:
+            with open(image_path, "rb") as image_file:
+                image_data = image_file.read()
+            
+            # Prepare base64 encoding for the image
+            encoded_image = base64.b64encode(image_data).decode('utf-8')
+        else:
+            encoded_image = base64_image
         
         # Create messages with the image
         content = [
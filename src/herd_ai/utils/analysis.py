@@ -24,15 +24,18 @@ from typing import Any, Dict, List, Optional, Set
 ###############################################################################
 try:
     try:
-        from herd_ai.utils.file import get_file_extension, get_file_metadata, get_file_text
+        from herd_ai.utils.file import get_file_extension, get_file_metadata, get_file_text, iter_file_text
+        from herd_ai.config import MAX_TEXT_BYTES
         from herd_ai.utils.cache import is_cached, get_from_cache, save_to_cache
     except ImportError:
         try:
-            from llamacleaner.utils.file import get_file_extension, get_file_metadata, get_file_text
+            from llamacleaner.utils.file import get_file_extension, get_file_metadata, get_file_text, iter_file_text
+            from llamacleaner.config import MAX_TEXT_BYTES
             from llamacleaner.utils.cache import is_cached, get_from_cache, save_to_cache
         except ImportError:
             try:
-                from utils.file import get_file_extension, get_file_metadata, get_file_text
+                from utils.file import get_file_extension, get_file_metadata, get_file_text, iter_file_text
+                from config import MAX_TEXT_BYTES
                 from utils.cache import is_cached, get_from_cache, save_to_cache
             except ImportError:
                 def get_file_extension(path):
@@ -49,6 +52,9 @@ try:
                     }
                 def get_file_text(path):
                     return Path(path).read_text(encoding='utf-8', errors='ignore')
+                def iter_file_text(path, chunk_size=None, max_bytes=None):
+                    yield get_file_text(path)
+                MAX_TEXT_BYTES = None
                 def is_cached(key):
                     return False
                 def get_from_cache(key):
@@ -72,6 +78,9 @@ except Exception as e:
         }
     def get_file_text(path):
         return Path(path).read_text(encoding='utf-8', errors='ignore')
+    def iter_file_text(path, chunk_size=None, max_bytes=None):
+        yield get_file_text(path)
+    MAX_TEXT_BYTES = None
     def is_cached(key):
         return False
     def get_from_cache(key):
@@ -109,22 +118,28 @@ except ImportError:
 #
 # Extracts the most frequent keywords from a text, filtering out common stop
 # words. Returns a list of up to `max_keywords` keywords sorted by frequency.
+# count_keywords accumulates the same counts chunk by chunk for streamed text.
 ###############################################################################
+STOP_WORDS = frozenset([
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what',
+    'when', 'where', 'how', 'who', 'which', 'this', 'that', 'to', 'in',
+    'of', 'for', 'with', 'on', 'at', 'from', 'by', 'about', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do',
+    'does', 'did', 'can', 'could', 'will', 'would', 'shall', 'should',
+    'may', 'might', 'must', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+])
+
+def count_keywords(text: str, counts: Dict[str, int]) -> Dict[str, int]:
+    for w in re.findall(r'\b\w+\b', text.lower()):
+        if w not in STOP_WORDS and len(w) > 2:
+            counts[w] = counts.get(w, 0) + 1
+    return counts
+
+def top_keywords(counts: Dict[str, int], max_keywords: int = 20) -> List[str]:
+    return [w for w, _ in sorted(counts.items(), key=lambda x: -x[1])[:max_keywords]]
+
 def extract_keywords(text: str, max_keywords: int = 20) -> List[str]:
-    stop = set([
-        'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what',
-        'when', 'where', 'how', 'who', 'which', 'this', 'that', 'to', 'in',
-        'of', 'for', 'with', 'on', 'at', 'from', 'by', 'about', 'is', 'are',
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do',
-        'does', 'did', 'can', 'could', 'will', 'would', 'shall', 'should',
-        'may', 'might', 'must', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-    ])
-    words = re.findall(r'\b\w+\b', text.lower())
-    words = [w for w in words if w not in stop and len(w) > 2]
-    cnt: Dict[str, int] = {}
-    for w in words:
-        cnt[w] = cnt.get(w, 0) + 1
-    return [w for w, _ in sorted(cnt.items(), key=lambda x: -x[1])[:max_keywords]]
+    return top_keywords(count_keywords(text, {}), max_keywords)
 
 ###############################################################################
 # get_language
@@ -157,43 +172,116 @@ def analyze_document(fp: Path, force: bool = False, provider: Optional[str] = No
         return get_from_cache(key)
 
     info = get_file_metadata(fp)
-    text = get_file_text(fp)
     res = {'info': info, 'analysis': {}}
 
-    if text:
-        kw = extract_keywords(text)
+    # Stream the document so large files are never held in memory at once.
+    # Chunks are cut on whitespace, so per-chunk word counts add up.
+    word_count = 0
+    counts: Dict[str, int] = {}
+    sample = None
+    for chunk in iter_file_text(fp, max_bytes=MAX_TEXT_BYTES):
+        if sample is None:
+            sample = chunk
+        word_count += len(chunk.split())
+        count_keywords(chunk, counts)
+
+    if sample:
         res['analysis'] = {
-            'word_count': len(text.split()),
-            'keywords': kw,
-            'language': get_language(text)
+            'word_count': word_count,
+            'keywords': top_keywords(counts),
+            'language': get_language(sample)
         }
 
     save_to_cache(key, res)
     return res
 
+###############################################################################
+# load_corpus
+#
+# Returns the persisted CorpusMatrix (utils.corpus) for a directory, updated
+# to its current documents: new and modified files are tokenized on a process
+# pool, unchanged rows are reused and rows for deleted files are dropped.
+# Returns None when NumPy is not installed, in which case analyze_documents
+# and generate_document_summary count each document separately.
+#
+# Args:
+#     dir: Directory to scan
+#     recursive: If True, scan subdirectories too
+#     force: If True, re-tokenize every document
+#     workers: Tokenizer processes (default CORPUS_WORKERS)
+#
+# Returns:
+#     Updated CorpusMatrix, or None
+###############################################################################
+DOCUMENT_EXTENSIONS = ('.pdf', '.docx', '.txt', '.md', '.rtf', '.odt')
+
+def _document_paths(dir: Path, recursive: bool) -> List[Path]:
+    return [
+        p for p in (dir.rglob('*') if recursive else dir.glob('*'))
+        if p.is_file() and get_file_extension(p).lower() in DOCUMENT_EXTENSIONS
+    ]
+
+def load_corpus(dir: Path, recursive: bool = True, force: bool = False, workers: Optional[int] = None,
+                paths: Optional[List[Path]] = None):
+    try:
+        try:
+            from herd_ai.utils.corpus import CorpusMatrix, corpus_path_for, NUMPY_AVAILABLE
+        except ImportError:
+            try:
+                from llamacleaner.utils.corpus import CorpusMatrix, corpus_path_for, NUMPY_AVAILABLE
+            except ImportError:
+                from utils.corpus import CorpusMatrix, corpus_path_for, NUMPY_AVAILABLE
+    except ImportError:
+        return None
+    if not NUMPY_AVAILABLE:
+        return None
+    corpus = CorpusMatrix(corpus_path_for(dir, recursive))
+    stats = corpus.update(_document_paths(dir, recursive) if paths is None else paths, workers=workers, force=force)
+    if stats["added"] or stats["updated"] or stats["removed"]:
+        corpus.save()
+    return corpus
+
 ###############################################################################
 # analyze_documents
 #
 # Analyzes all documents in a directory, optionally recursively.
-# Returns a dictionary of analysis results by file path.
+# Returns a dictionary of analysis results by file path. With NumPy, keywords
+# are each document's top TF-IDF terms across the scanned corpus.
 #
 # Args:
 #     dir: Directory to scan
 #     recursive: If True, scan subdirectories too
 #     force: If True, force re-analysis even if cached
 #     provider: AI provider to use for analysis (optional)
+#     workers: Tokenizer processes (default CORPUS_WORKERS)
 #
 # Returns:
 #     Dictionary of analysis results by file path
 ###############################################################################
-def analyze_documents(dir: Path, recursive: bool = True, force: bool = False, provider: Optional[str] = None) -> Dict[str, Any]:
+def analyze_documents(dir: Path, recursive: bool = True, force: bool = False, provider: Optional[str] = None,
+                      workers: Optional[int] = None) -> Dict[str, Any]:
     results: Dict[str, Any] = {}
-    file_types = ('.pdf', '.docx', '.txt', '.md', '.rtf', '.odt')
-
-    for p in (dir.rglob('*') if recursive else dir.glob('*')):
-        if p.is_file() and get_file_extension(p).lower() in file_types:
+    paths = _document_paths(dir, recursive)
+    corpus = load_corpus(dir, recursive, force, workers, paths=paths)
+    if corpus is None:
+        for p in paths:
             results[str(p)] = analyze_document(p, force, provider=provider)
+        return results
 
+    keywords = corpus.keywords(20)
+    for p in paths:
+        row = corpus.row(p)
+        if row is None:
+            continue
+        doc = corpus.docs[row]
+        res = {'info': get_file_metadata(p), 'analysis': {}}
+        if doc['has_text']:
+            res['analysis'] = {
+                'word_count': doc['word_count'],
+                'keywords': keywords[row],
+                'language': get_language('')
+            }
+        results[str(p)] = res
     return results
 
 ###############################################################################
@@ -203,26 +291,40 @@ def analyze_documents(dir: Path, recursive: bool = True, force: bool = False, pr
 #   - Total document count
 #   - Total word count
 #   - Document type distribution
-#   - Top keywords across all documents
+#   - Top keywords across all documents (with NumPy, the most frequent terms
+#     in the whole corpus and their counts; otherwise how many documents
+#     list each keyword)
 #
 # Args:
 #     dir: Directory to scan
 #     recursive: If True, scan subdirectories too
 #     force: If True, force re-analysis even if cached
 #     provider: AI provider to use for analysis (optional)
+#     workers: Tokenizer processes (default CORPUS_WORKERS)
 #
 # Returns:
 #     Dictionary with summary statistics
 ###############################################################################
-def generate_document_summary(dir: Path, recursive: bool = True, force: bool = False, provider: Optional[str] = None) -> Dict[str, Any]:
-    res = analyze_documents(dir, recursive, force, provider)
+def generate_document_summary(dir: Path, recursive: bool = True, force: bool = False, provider: Optional[str] = None,
+                              workers: Optional[int] = None) -> Dict[str, Any]:
     summary = {
-        'count': len(res),
+        'count': 0,
         'total_words': 0,
         'document_types': {},
         'top_keywords': {}
     }
+    corpus = load_corpus(dir, recursive, force, workers)
+    if corpus is not None:
+        summary['count'] = len(corpus)
+        summary['total_words'] = int(corpus.word_counts().sum())
+        for doc in corpus.docs:
+            ext = Path(doc['path']).suffix.lower()
+            summary['document_types'][ext] = summary['document_types'].get(ext, 0) + 1
+        summary['top_keywords'] = dict(corpus.top_terms(50))
+        return summary
 
+    res = analyze_documents(dir, recursive, force, provider)
+    summary['count'] = len(res)
     for fp, r in res.items():
         cnt = r.get('analysis', {}).get('word_count', 0)
         summary['total_words'] += cnt
@@ -231,4 +333,4 @@ def generate_document_summary(dir: Path, recursive: bool = True, force: bool = F
         for kw in r.get('analysis', {}).get('keywords', []):
             summary['top_keywords'][kw] = summary['top_keywords'].get(kw, 0) + 1
 
-    return summary
\ No newline at end of file
+    return summary
@@ -4,111 +4,358 @@
 # Caching utilities for document analysis and processing.
 #
 # This module provides functions to store, retrieve, and manage cached data
-# (typically JSON-serializable) for document analysis tasks. The cache is
-# stored as a JSON file in a configurable directory. The cache directory can
-# be set via project configuration, and the module is robust to different
+# (typically JSON-serializable) for document analysis tasks. Entries live in a
+# single SQLite database in a configurable directory, so lookups are indexed
+# by key instead of re-reading the whole cache, writes are buffered and
+# committed in batches, and old or excess entries are evicted by age and by
+# total size. A legacy doc_cache.json is imported once on first use.
+###############################################################################
 """Caching utilities for document analysis."""
 
+import atexit
 import json
 import os
+import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 # Try import as if from a package first, fall back to direct import
 try:
     # Package imports (when installed or run as a module)
     try:
-        from herd_ai.config import CACHE_DIR
-        from herd_ai.utils.file import ensure_directory
+        from herd_ai.config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_MAX_AGE_DAYS, CACHE_FLUSH_EVERY
     except ImportError:
         # Legacy package imports
         try:
-            from llamacleaner.config import CACHE_DIR
-            from llamacleaner.utils.file import ensure_directory
+            from llamacleaner.config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_MAX_AGE_DAYS, CACHE_FLUSH_EVERY
         except ImportError:
             # Direct imports (when run directly, not as a module)
             try:
-                from config import CACHE_DIR
-                from utils.file import ensure_directory
+                from config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_MAX_AGE_DAYS, CACHE_FLUSH_EVERY
             except ImportError:
                 # Set default cache directory
                 CACHE_DIR = Path(".herd/cache")
-                # Define minimal version if all imports fail
-                def ensure_directory(path):
-                    p = Path(path)
-                    p.mkdir(parents=True, exist_ok=True)
-                    return p
+                CACHE_MAX_BYTES = 512 * 1024 * 1024
+                CACHE_MAX_AGE_DAYS = 90.0
+                CACHE_FLUSH_EVERY = 64
 except Exception as e:
     print(f"Error importing modules in utils/cache.py: {e}")
     print("Make sure you're running from the project directory or the package is installed.")
     # Set default cache directory
     CACHE_DIR = Path(".herd/cache")
-    # Define minimal version if all imports fail
-    def ensure_directory(path):
-        p = Path(path)
-        p.mkdir(parents=True, exist_ok=True)
-        return p
+    CACHE_MAX_BYTES = 512 * 1024 * 1024
+    CACHE_MAX_AGE_DAYS = 90.0
+    CACHE_FLUSH_EVERY = 64
+
+# Same as utils.file.ensure_directory, which is not imported here because
+# utils.file loads Pillow, and the cache is needed by `herd --clear-cache`.
+def ensure_directory(path) -> Path:
+    p = Path(path)
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+# Sentinel used in the write buffer to mark a pending delete.
+_DELETED = object()
+
+class DocCache:
+    """
+    Persistent key-value store backed by SQLite.
+
+    Reads hit an in-memory write buffer first and then the indexed table.
+    Writes are buffered and committed together every `flush_every` writes,
+    on `flush()`, and at interpreter exit. Eviction runs after each flush
+    and drops entries older than `max_age_days`, then the least recently
+    accessed entries until the store fits within `max_bytes`.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES,
+                 max_age_days: float = CACHE_MAX_AGE_DAYS,
+                 flush_every: int = CACHE_FLUSH_EVERY,
+                 legacy_json: Optional[Path] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.flush_every = max(1, flush_every)
+        self.legacy_json = legacy_json
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Any] = {}
+        self._touched: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_directory(self.path.parent)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries(created)")
+            conn.commit()
+            self._conn = conn
+            self._import_legacy_json()
+        return self._conn
+
+    def _import_legacy_json(self) -> None:
+        """Move entries from the old whole-file JSON cache into the store."""
+        if not self.legacy_json or not self.legacy_json.exists():
+            return
+        try:
+            data = json.loads(self.legacy_json.read_text())
+        except Exception:
+            data = {}
+        now = time.time()
+        rows = []
+        for key, value in data.items():
+            blob = json.dumps(value)
+            rows.append((key, blob, len(blob), now, now))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        self._conn.commit()
+        try:
+            self.legacy_json.rename(self.legacy_json.with_suffix('.json.migrated'))
+        except OSError:
+            pass
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key] is not _DELETED
+            row = self._connect().execute(
+                "SELECT 1 FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            return row is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._pending:
+                value = self._pending[key]
+                if value is _DELETED:
+                    self.misses += 1
+                    return default
+                self.hits += 1
+                return json.loads(value)
+            row = self._connect().execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._touched[key] = time.time()
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        blob = json.dumps(value)
+        with self._lock:
+            self._pending[key] = blob
+            self.writes += 1
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending[key] = _DELETED
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit buffered writes, deletes and access times in one transaction."""
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            conn = self._connect()
+            now = time.time()
+            upserts = []
+            deletes = []
+            for key, value in self._pending.items():
+                if value is _DELETED:
+                    deletes.append((key,))
+                else:
+                    upserts.append((key, value, len(value), now, now))
+            with conn:
+                if deletes:
+                    conn.executemany("DELETE FROM entries WHERE key = ?", deletes)
+                if upserts:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                        upserts
+                    )
+                if self._touched:
+                    conn.executemany(
+                        "UPDATE entries SET accessed = ? WHERE key = ?",
+                        [(ts, key) for key, ts in self._touched.items()]
+                    )
+            self._pending.clear()
+            self._touched.clear()
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones above max_bytes."""
+        with self._lock:
+            conn = self._connect()
+            removed = 0
+            with conn:
+                if self.max_age_days and self.max_age_days > 0:
+                    cutoff = time.time() - self.max_age_days * 86400
+                    removed += conn.execute("DELETE FROM entries WHERE created < ?", (cutoff,)).rowcount
+                if self.max_bytes and self.max_bytes > 0:
+                    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                    if total > self.max_bytes:
+                        excess = total - self.max_bytes
+                        victims = []
+                        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                            victims.append((key,))
+                            excess -= size
+                            if excess <= 0:
+                                break
+                        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+                        removed += len(victims)
+            self.evictions += removed
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._touched.clear()
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+            conn.execute("VACUUM")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and on-disk size of the store."""
+        with self._lock:
+            self.flush()
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'path': str(self.path),
+                'entries': entries,
+                'bytes': size,
+                'file_bytes': self.path.stat().st_size if self.path.exists() else 0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'writes': self.writes,
+                'evictions': self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self.flush()
+                finally:
+                    self._conn.close()
+                    self._conn = None
+
+_doc_cache: Optional[DocCache] = None
+_doc_cache_lock = threading.Lock()
 
 def get_cache_path(name: str) -> Path:
     """Get the path to a cache file for the given name."""
     return ensure_directory(CACHE_DIR) / f"{name}.json"
 
+def get_doc_cache() -> DocCache:
+    """Return the shared document cache, opening it on first use."""
+    global _doc_cache
+    with _doc_cache_lock:
+        if _doc_cache is None:
+            _doc_cache = DocCache(
+                ensure_directory(CACHE_DIR) / "doc_cache.sqlite3",
+                legacy_json=get_cache_path('doc_cache')
+            )
+            atexit.register(_doc_cache.close)
+        return _doc_cache
+
 def is_cached(key: str) -> bool:
     """Check if a key exists in the document cache."""
-    cf = get_cache_path('doc_cache')
-    if not cf.exists():
-        return False
     try:
-        c = json.loads(cf.read_text())
-        return key in c
-    except:
+        return get_doc_cache().contains(key)
+    except Exception:
         return False
 
 def get_from_cache(key: str) -> Any:
     """Get a value from the document cache by key."""
-    cf = get_cache_path('doc_cache')
     try:
-        c = json.loads(cf.read_text())
-        return c.get(key)
-    except:
+        return get_doc_cache().get(key)
+    except Exception:
         return None
 
 def save_to_cache(key: str, data: Any) -> bool:
     """Save a value to the document cache with the given key."""
-    cf = get_cache_path('doc_cache')
     try:
-        d = {} if not cf.exists() else json.loads(cf.read_text())
-        d[key] = data
-        cf.write_text(json.dumps(d, indent=2))
+        get_doc_cache().set(key, data)
+        return True
+    except Exception:
+        return False
+
+def flush_cache() -> bool:
+    """Commit any buffered document cache writes to disk."""
+    try:
+        get_doc_cache().flush()
         return True
-    except:
+    except Exception as e:
+        print(f"Error flushing cache: {e}")
         return False
 
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get statistics for the document cache.
+
+    Returns:
+        Dictionary with entries, bytes, hits, misses, hit_rate, writes and
+        evictions. Counters cover the current process only.
+    """
+    try:
+        return get_doc_cache().stats()
+    except Exception as e:
+        print(f"Error reading cache stats: {e}")
+        return {}
+
 def clear_cache(key: Optional[str]=None) -> bool:
     """
     Clear the document cache.
-    
+
     Args:
         key: If provided, only clear this specific key. Otherwise, clear the entire cache.
-        
+
     Returns:
         True if successful, False otherwise.
     """
-    cf = get_cache_path('doc_cache')
-    if not cf.exists():
-        return True
     if key is None:
         try:
-            cf.unlink()
+            get_doc_cache().clear()
+            legacy = get_cache_path('doc_cache')
+            if legacy.exists():
+                legacy.unlink()
         except Exception as e:
             print(f"Error clearing cache: {e}")
             return False
     else:
         try:
-            d = json.loads(cf.read_text())
-            d.pop(key, None)
-            cf.write_text(json.dumps(d, indent=2))
+            cache = get_doc_cache()
+            cache.delete(key)
+            cache.flush()
         except Exception as e:
             print(f"Error clearing cache key '{key}': {e}")
             return False
-    return True 
\ No newline at end of file
+    return True
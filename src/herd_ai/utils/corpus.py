@@ -0,0 +1,333 @@
+###############################################################################
+# herd_ai.utils.corpus
+#
+# Persistent term-document matrix for corpus analytics.
+#
+# Documents are tokenized once, on a process pool, into per-document term
+# counts (the same words extract_keywords counts: lowercased, longer than two
+# characters, stop words removed). The counts are kept as a sparse matrix in
+# CSR form (indptr/indices/data arrays, one row per document) so corpus-wide
+# figures are single NumPy operations: column sums give top terms, non-zero
+# counts per column give document frequencies, and TF-IDF keywords for every
+# document come from one weighted sort of the non-zero entries.
+#
+# The matrix is saved as an .npz file together with its vocabulary and the
+# size and mtime of each document, so a later run only tokenizes files that
+# are new or changed and drops rows for files that are gone. NumPy is
+# required; callers fall back to per-document counting without it.
+###############################################################################
+"""Sparse, incrementally updated term-document matrix with TF-IDF keywords."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from herd_ai.config import CACHE_DIR, CORPUS_WORKERS, MAX_TEXT_BYTES
+    from herd_ai.utils.file import iter_file_text
+    from herd_ai.utils.analysis import STOP_WORDS
+except ImportError:
+    try:
+        from llamacleaner.config import CACHE_DIR, CORPUS_WORKERS, MAX_TEXT_BYTES
+        from llamacleaner.utils.file import iter_file_text
+        from llamacleaner.utils.analysis import STOP_WORDS
+    except ImportError:
+        from config import CACHE_DIR, CORPUS_WORKERS, MAX_TEXT_BYTES
+        from utils.file import iter_file_text
+        from utils.analysis import STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization changes so saved matrices are rebuilt.
+FORMAT_VERSION = 1
+
+# Words of three or more characters, as counted by extract_keywords.
+_WORD_RE = re.compile(r'\w{3,}')
+
+def tokenize_document(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Term counts and word count for one document, streamed in chunks.
+
+    Returns:
+        {"path", "word_count", "has_text", "terms": {term: count}, "error"}
+    """
+    counts: Counter = Counter()
+    word_count = 0
+    has_text = False
+    try:
+        for chunk in iter_file_text(Path(path), max_bytes=MAX_TEXT_BYTES):
+            if chunk:
+                has_text = True
+            word_count += len(chunk.split())
+            counts.update(_WORD_RE.findall(chunk.lower()))
+    except Exception as e:
+        return {"path": str(path), "word_count": 0, "has_text": False, "terms": {}, "error": str(e)}
+    for stop_word in STOP_WORDS.intersection(counts):
+        del counts[stop_word]
+    return {"path": str(path), "word_count": word_count, "has_text": has_text, "terms": dict(counts), "error": None}
+
+def iter_tokenized(paths: List[str], workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields tokenize_document() results. With more than one worker, documents
+    are tokenized on a process pool with a bounded number in flight and
+    yielded as they finish; otherwise in order in this process.
+    """
+    workers = max(1, workers or CORPUS_WORKERS)
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield tokenize_document(path)
+        return
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(paths)))
+    except (OSError, NotImplementedError) as e:
+        logger.warning(f"Process pool unavailable ({e}); tokenizing sequentially")
+        for path in paths:
+            yield tokenize_document(path)
+        return
+    queue = iter(paths)
+    in_flight = {}
+    try:
+        def submit_next() -> bool:
+            path = next(queue, None)
+            if path is None:
+                return False
+            in_flight[pool.submit(tokenize_document, path)] = path
+            return True
+        for _ in range(workers * 4):
+            if not submit_next():
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"path": path, "word_count": 0, "has_text": False, "terms": {}, "error": str(e)}
+                submit_next()
+                yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+def corpus_path_for(directory: Union[str, Path], recursive: bool = True) -> Path:
+    """Where the matrix for a scanned directory is saved (under CACHE_DIR/corpus)."""
+    key = hashlib.sha1(f"{Path(directory).resolve()}|{int(recursive)}".encode("utf-8")).hexdigest()[:20]
+    return Path(CACHE_DIR) / "corpus" / f"{key}.npz"
+
+class CorpusMatrix:
+    """
+    Term-document count matrix over a set of files.
+
+    Rows are documents (self.docs, each with path, size, mtime_ns,
+    word_count, has_text and error), columns are self.vocab. update() brings
+    the matrix in line with a list of files and save() persists it to
+    self.path, from which a new instance loads it.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("CorpusMatrix requires NumPy")
+        self.path = Path(path) if path else None
+        self._reset()
+        if self.path is not None and self.path.exists():
+            try:
+                self._load()
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable corpus matrix {self.path}: {e}")
+                self._reset()
+
+    def _reset(self) -> None:
+        self.vocab: List[str] = []
+        self.docs: List[Dict[str, Any]] = []
+        self._term_ids: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.data = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, path: Union[str, Path]) -> bool:
+        return str(path) in self._rows
+
+    def _load(self) -> None:
+        with np.load(self.path, allow_pickle=False) as saved:
+            meta = json.loads(str(saved["meta"]))
+            if meta.get("version") != FORMAT_VERSION:
+                return
+            self.indptr = saved["indptr"].astype(np.int64)
+            self.indices = saved["indices"].astype(np.int32)
+            self.data = saved["data"].astype(np.int32)
+        self.vocab = meta["vocab"]
+        self.docs = meta["docs"]
+        self._term_ids = {term: i for i, term in enumerate(self.vocab)}
+        self._rows = {doc["path"]: i for i, doc in enumerate(self.docs)}
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+        """Write the matrix to `path` (default self.path) atomically; returns the path or None on failure."""
+        target = Path(path) if path else self.path
+        if target is None:
+            return None
+        self._compact()
+        meta = json.dumps({"version": FORMAT_VERSION, "vocab": self.vocab, "docs": self.docs})
+        tmp = target.with_name(target.stem + ".tmp.npz")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(tmp, indptr=self.indptr, indices=self.indices, data=self.data, meta=np.array(meta))
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning(f"Could not save corpus matrix to {target}: {e}")
+            return None
+        return target
+
+    def _compact(self) -> None:
+        # Drop vocabulary left unused by removed documents once it is most of the vocabulary
+        used = np.bincount(self.indices, minlength=len(self.vocab)) > 0
+        unused = len(self.vocab) - int(used.sum())
+        if unused < 1000 or unused * 2 < len(self.vocab):
+            return
+        remap = np.cumsum(used) - 1
+        self.indices = remap[self.indices].astype(np.int32)
+        self.vocab = [term for term, keep in zip(self.vocab, used) if keep]
+        self._term_ids = {term: i for i, term in enumerate(self.vocab)}
+
+    def _keep_rows(self, keep: "np.ndarray") -> None:
+        lengths = np.diff(self.indptr)
+        entries = np.repeat(keep, lengths)
+        self.indices = self.indices[entries]
+        self.data = self.data[entries]
+        self.indptr = np.concatenate(([0], np.cumsum(lengths[keep]))).astype(np.int64)
+        self.docs = [doc for doc, k in zip(self.docs, keep) if k]
+        self._rows = {doc["path"]: i for i, doc in enumerate(self.docs)}
+
+    def _append(self, results: List[Dict[str, Any]], signatures: Dict[str, Tuple[int, int]]) -> None:
+        indices: List[int] = []
+        data: List[int] = []
+        lengths = []
+        term_ids = self._term_ids
+        for result in results:
+            terms = result["terms"]
+            for term in [t for t in terms if t not in term_ids]:
+                term_ids[term] = len(self.vocab)
+                self.vocab.append(term)
+            indices.extend(map(term_ids.__getitem__, terms))
+            data.extend(terms.values())
+            lengths.append(len(terms))
+            size, mtime_ns = signatures[result["path"]]
+            self._rows[result["path"]] = len(self.docs)
+            self.docs.append({
+                "path": result["path"], "size": size, "mtime_ns": mtime_ns,
+                "word_count": result["word_count"], "has_text": result["has_text"], "error": result["error"],
+            })
+        self.indices = np.concatenate((self.indices, np.asarray(indices, dtype=np.int32)))
+        self.data = np.concatenate((self.data, np.asarray(data, dtype=np.int32)))
+        self.indptr = np.concatenate((self.indptr, self.indptr[-1] + np.cumsum(lengths, dtype=np.int64)))
+
+    def update(self, paths: Iterable[Union[str, Path]], workers: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Make the matrix cover exactly `paths`: rows for missing files are
+        dropped, new or modified files (by size and mtime) are tokenized, and
+        unchanged rows are kept. force re-tokenizes everything.
+
+        Returns:
+            {"added", "updated", "removed", "unchanged", "errors"}
+        """
+        signatures: Dict[str, Tuple[int, int]] = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signatures[str(path)] = (st.st_size, st.st_mtime_ns)
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "errors": 0}
+        keep = np.zeros(len(self.docs), dtype=bool)
+        for i, doc in enumerate(self.docs):
+            current = signatures.get(doc["path"])
+            if current is None:
+                stats["removed"] += 1
+            elif force or tuple(current) != (doc["size"], doc["mtime_ns"]) or doc.get("error"):
+                stats["updated"] += 1
+            else:
+                keep[i] = True
+                stats["unchanged"] += 1
+        if not keep.all():
+            self._keep_rows(keep)
+        pending = [path for path in signatures if path not in self._rows]
+        stats["added"] = len(pending) - stats["updated"]
+        if pending:
+            results = list(iter_tokenized(pending, workers))
+            stats["errors"] = sum(1 for r in results if r["error"])
+            # Keep rows in scan order for the new documents
+            order = {path: i for i, path in enumerate(pending)}
+            results.sort(key=lambda r: order[r["path"]])
+            self._append(results, signatures)
+        return stats
+
+    def row(self, path: Union[str, Path]) -> Optional[int]:
+        """Row index of a document, or None if it is not in the matrix."""
+        return self._rows.get(str(path))
+
+    def row_ids(self) -> "np.ndarray":
+        """Document index of every stored entry."""
+        return np.repeat(np.arange(len(self.docs)), np.diff(self.indptr))
+
+    def word_counts(self) -> "np.ndarray":
+        return np.array([doc["word_count"] for doc in self.docs], dtype=np.int64)
+
+    def document_frequencies(self) -> "np.ndarray":
+        """Number of documents containing each vocabulary term."""
+        return np.bincount(self.indices, minlength=len(self.vocab))
+
+    def term_totals(self) -> "np.ndarray":
+        """Occurrences of each vocabulary term across the corpus."""
+        return np.bincount(self.indices, weights=self.data, minlength=len(self.vocab)).astype(np.int64)
+
+    def top_terms(self, limit: int = 50) -> List[Tuple[str, int]]:
+        """The `limit` most frequent terms across all documents, most frequent first."""
+        totals = self.term_totals()
+        if not len(totals):
+            return []
+        limit = min(limit, len(totals))
+        top = np.argpartition(-totals, limit - 1)[:limit]
+        top = top[np.lexsort((top, -totals[top]))]
+        return [(self.vocab[i], int(totals[i])) for i in top if totals[i] > 0]
+
+    def keywords(self, limit: int = 20, tfidf: bool = True) -> List[List[str]]:
+        """
+        Top `limit` terms for every document, in row order. With tfidf, terms
+        are ranked by count * (log((1 + N) / (1 + df)) + 1), so words common
+        to the whole corpus rank below words specific to the document;
+        otherwise by raw count.
+        """
+        if not len(self.docs):
+            return []
+        scores = self.data.astype(np.float64)
+        if tfidf:
+            idf = np.log((1.0 + len(self.docs)) / (1.0 + self.document_frequencies())) + 1.0
+            scores *= idf[self.indices]
+        rows = self.row_ids()
+        # By document, then score descending; the sort is stable, so ties keep
+        # the order in which terms first appear in the document
+        order = np.lexsort((-scores, rows))
+        rank = np.arange(len(order)) - self.indptr[rows[order]]
+        chosen = order[rank < limit]
+        result: List[List[str]] = [[] for _ in self.docs]
+        for row, term_id in zip(rows[chosen].tolist(), self.indices[chosen].tolist()):
+            result[row].append(self.vocab[term_id])
+        return result
@@ -0,0 +1,175 @@
+###############################################################################
+# herd_ai.utils.crossref
+#
+# Cached, concurrent DOI metadata lookups against the CrossRef works API.
+#
+# Responses are kept in a DocCache (CACHE_DIR/doi_metadata.sqlite3) so a DOI
+# is fetched once across files and across runs. DOIs CrossRef does not know
+# (HTTP 404) are cached as misses for DOI_NEGATIVE_CACHE_DAYS so they are not
+# retried on every run. fetch_many() collapses duplicate DOIs, answers what it
+# can from the cache and fetches the rest on a small thread pool; every
+# request passes through the shared "crossref" rate limiter and goes out over
+# the pooled "crossref" HTTP session with a polite User-Agent.
+###############################################################################
+"""DOI metadata fetching with a persistent cache and polite concurrency."""
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import quote
+
+try:
+    from herd_ai.config import (
+        CACHE_DIR, CROSSREF_API_URL, CROSSREF_MAILTO, DOI_WORKERS,
+        DOI_CACHE_MAX_AGE_DAYS, DOI_NEGATIVE_CACHE_DAYS
+    )
+    from herd_ai.utils import sessions
+    from herd_ai.utils.cache import DocCache
+    from herd_ai.utils.ratelimit import get_rate_limiter
+except ImportError:
+    try:
+        from llamacleaner.config import (
+            CACHE_DIR, CROSSREF_API_URL, CROSSREF_MAILTO, DOI_WORKERS,
+            DOI_CACHE_MAX_AGE_DAYS, DOI_NEGATIVE_CACHE_DAYS
+        )
+        from llamacleaner.utils import sessions
+        from llamacleaner.utils.cache import DocCache
+        from llamacleaner.utils.ratelimit import get_rate_limiter
+    except ImportError:
+        from config import (
+            CACHE_DIR, CROSSREF_API_URL, CROSSREF_MAILTO, DOI_WORKERS,
+            DOI_CACHE_MAX_AGE_DAYS, DOI_NEGATIVE_CACHE_DAYS
+        )
+        import utils.sessions as sessions
+        from utils.cache import DocCache
+        from utils.ratelimit import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+PROVIDER = "crossref"
+# Connect/read timeouts for a single works lookup.
+REQUEST_TIMEOUT = (5.0, 15.0)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def normalize_doi(doi: str) -> str:
+    """Canonical cache key for a DOI: lowercase, without resolver prefixes or trailing punctuation."""
+    doi = doi.strip()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:"):
+        if doi.lower().startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi.rstrip(".,;").lower()
+
+def get_doi_cache():
+    """Return the shared DOI metadata cache, or None if it cannot be opened."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = DocCache(Path(CACHE_DIR) / "doi_metadata.sqlite3", max_age_days=DOI_CACHE_MAX_AGE_DAYS)
+                atexit.register(_cache.close)
+            except Exception as e:
+                logger.error(f"Error opening DOI metadata cache: {e}")
+                return None
+        return _cache
+
+def _cached(key: str) -> Optional[Dict[str, Any]]:
+    """Cache entry for a normalized DOI, or None if absent or an expired miss."""
+    cache = get_doi_cache()
+    if cache is None:
+        return None
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if not entry.get("found") and time.time() - entry.get("fetched", 0) > DOI_NEGATIVE_CACHE_DAYS * 86400:
+        return None
+    return entry
+
+def _store(key: str, message: Optional[Dict[str, Any]]) -> None:
+    cache = get_doi_cache()
+    if cache is not None:
+        cache.set(key, {"found": message is not None, "message": message, "fetched": time.time()})
+
+def _headers() -> Dict[str, str]:
+    agent = "herd-ai (https://github.com/lukeslp/llamaherder)"
+    if CROSSREF_MAILTO:
+        agent += f"; mailto:{CROSSREF_MAILTO}"
+    return {"Accept": "application/json", "User-Agent": agent}
+
+def _request(doi: str) -> Dict[str, Any]:
+    """
+    One CrossRef lookup. Returns {"status": "found"|"missing"|"error",
+    "message": ..., "error": ...}; only found and missing are cacheable.
+    """
+    get_rate_limiter(PROVIDER).acquire()
+    url = CROSSREF_API_URL.rstrip("/") + "/" + quote(doi, safe="/:;()")
+    try:
+        response = sessions.get(PROVIDER, url, headers=_headers(), timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    if response.status_code == 200:
+        try:
+            return {"status": "found", "message": response.json().get("message", {})}
+        except ValueError as e:
+            return {"status": "error", "error": f"invalid JSON: {e}"}
+    if response.status_code == 404:
+        return {"status": "missing"}
+    return {"status": "error", "error": f"HTTP {response.status_code}"}
+
+def fetch_doi_metadata(doi: str) -> Optional[Dict[str, Any]]:
+    """CrossRef "message" for a DOI, from the cache when possible; None if unknown or unavailable."""
+    return fetch_many([doi], workers=1)["results"].get(doi)
+
+def fetch_many(dois: Iterable[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Resolve many DOIs at once.
+
+    Duplicates (after normalization) are fetched once, cached entries are
+    answered without a request, and the remaining DOIs are fetched on up to
+    `workers` threads (default DOI_WORKERS) under the CrossRef rate limit.
+
+    Returns:
+        {"results": {doi: message or None for each DOI as given},
+         "stats": {"unique", "cached", "cached_missing", "fetched", "missing", "errors"}}
+    """
+    dois = list(dois)
+    keys = {doi: normalize_doi(doi) for doi in dois}
+    stats = {"unique": 0, "cached": 0, "cached_missing": 0, "fetched": 0, "missing": 0, "errors": 0}
+    messages: Dict[str, Optional[Dict[str, Any]]] = {}
+    pending = []
+    for key in dict.fromkeys(keys.values()):
+        stats["unique"] += 1
+        entry = _cached(key)
+        if entry is None:
+            pending.append(key)
+        elif entry.get("found"):
+            stats["cached"] += 1
+            messages[key] = entry.get("message")
+        else:
+            stats["cached_missing"] += 1
+            messages[key] = None
+    if pending:
+        workers = max(1, min(workers or DOI_WORKERS, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for key, outcome in zip(pending, pool.map(_request, pending)):
+                if outcome["status"] == "found":
+                    stats["fetched"] += 1
+                    messages[key] = outcome["message"]
+                    _store(key, outcome["message"])
+                elif outcome["status"] == "missing":
+                    stats["missing"] += 1
+                    messages[key] = None
+                    _store(key, None)
+                else:
+                    stats["errors"] += 1
+                    messages[key] = None
+                    logger.warning(f"CrossRef lookup failed for {key}: {outcome['error']}")
+        cache = get_doi_cache()
+        if cache is not None:
+            cache.flush()
+    return {"results": {doi: messages.get(key) for doi, key in keys.items()}, "stats": stats}
@@ -6,9 +6,12 @@
 
 This module provides a comprehensive utility for deduplicating files in a directory.
 It supports:
-    - Image deduplication (by file size and resolution)
-    - General file deduplication (by file size and content hash)
-    - Text file deduplication (by content similarity, with optional merging)
+    - Image deduplication (by perceptual hash within a Hamming radius, so
+      resized or recompressed copies are found)
+    - General file deduplication (by size, then a head/tail partial hash, then
+      a full content hash only for files that still collide)
+    - Text file deduplication (by content similarity, with optional merging),
+      using MinHash/LSH to pick candidate pairs before detailed scoring
 
 The module can be used programmatically or via an interactive CLI.
 
@@ -20,7 +23,10 @@ import sys
 import logging
 import hashlib
 import re
+import math
 import difflib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
@@ -46,6 +52,14 @@ except ImportError:
             scrambler = None
             undo_log = None
 
+try:
+    from herd_ai.utils.minhash import MinHasher, LSHIndex, shingle_hashes
+except ImportError:
+    try:
+        from llamacleaner.utils.minhash import MinHasher, LSHIndex, shingle_hashes
+    except ImportError:
+        from utils.minhash import MinHasher, LSHIndex, shingle_hashes
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -76,6 +90,34 @@ except ImportError:
     PIL_AVAILABLE = False
     logger.warning("PIL/Pillow not installed. Image resolution detection disabled.")
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Hash algorithms accepted by the exact-duplicate pipeline. 'xxhash' falls
+# back to blake2b when the xxhash package is not installed.
+HASH_ALGORITHMS = ['sha256', 'blake2b', 'xxhash']
+DEFAULT_HASH_ALGORITHM = 'sha256'
+
+# Bytes hashed from the start and from the end of a file in the partial stage.
+PARTIAL_HASH_BYTES = 64 * 1024
+
+# Read size used for full-content hashes.
+FULL_HASH_BLOCK_SIZE = 1024 * 1024
+
+# Persistent hash store, relative to the scanned directory.
+HASH_STORE_NAME = ".herd/dedupe_hashes.sqlite3"
+
+# Minimum number of text pairs before similarity scoring moves to a process pool.
+MIN_PAIRS_FOR_PROCESS_POOL = 64
+
+# Perceptual image hashes are 64 bits; similarity is 1 - hamming_distance / 64.
+IMAGE_HASH_METHODS = ['phash', 'dhash']
+IMAGE_HASH_BITS = 64
+DEFAULT_IMAGE_SIMILARITY = 0.9
+
 class DedupeProcessor:
     """
     ===========================================================================
@@ -177,6 +219,10 @@ class TextDedupeProcessor(DedupeProcessor):
         self.supported_extensions = TEXT_EXTENSIONS
         self.max_size_mb = 10.0
         self.similarity_threshold = 0.7
+        # Estimated shingle Jaccard above which pairs are verified with
+        # calculate_text_similarity; kept below similarity_threshold on purpose.
+        self.lsh_threshold = 0.5
+        self.num_perm = 128
 
     def process(self, file_path: Union[str, Path], cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -213,9 +259,32 @@ class DuplicateDetector:
     Scans a directory for duplicate files of various types (images, text, general).
     Provides methods for scanning, deleting duplicates, and merging similar text.
     """
-    def __init__(self, directory: Union[str, Path], recursive: bool = True):
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        recursive: bool = True,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+        use_hash_store: bool = True,
+        workers: int = 1,
+        image_similarity: float = DEFAULT_IMAGE_SIMILARITY,
+        image_hash_method: str = 'phash'
+    ):
         self.directory = Path(directory)
         self.recursive = recursive
+        self.workers = max(1, int(workers or 1))
+        if not 0.0 <= image_similarity <= 1.0:
+            raise ValueError(f"image_similarity must be between 0 and 1, got {image_similarity}")
+        if image_hash_method not in IMAGE_HASH_METHODS:
+            raise ValueError(f"Unsupported image hash method: {image_hash_method}")
+        self.image_similarity = image_similarity
+        self.image_hash_method = image_hash_method
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+        self.hash_algorithm = hash_algorithm
+        self.use_hash_store = use_hash_store
+        self.hash_store = None
+        self.hash_stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
         self.cache = {}
         self.image_processor = ImageDedupeProcessor()
         self.text_processor = TextDedupeProcessor()
@@ -225,6 +294,7 @@ class DuplicateDetector:
         self.exact_duplicates = {}
         self.similar_text_groups = []
         self.image_duplicates = {}
+        self.image_info = {}
 
     def scan_directory(self) -> Dict[str, Any]:
         """
@@ -232,7 +302,9 @@ class DuplicateDetector:
         Scan Directory for Duplicates
         =========================================================================
         Scans the target directory for files, groups by size, and detects duplicates
-        using hashing, image resolution, and text similarity.
+        using hashing, image resolution, and text similarity. With workers > 1,
+        file reads run on a thread pool and text similarity scoring on a process
+        pool; results are ordered the same as a single-worker scan.
         Returns a structured dictionary of results.
         """
         logger.info(f"Scanning directory: {self.directory}")
@@ -241,96 +313,283 @@ class DuplicateDetector:
         self.exact_duplicates = {}
         self.similar_text_groups = []
         self.image_duplicates = {}
-        file_pattern = '**/*' if self.recursive else '*'
-        files = list(self.directory.glob(file_pattern))
-        files = [f for f in files if f.is_file() and not is_ignored_file(f)]
+        self.image_info = {}
+        self.hash_stats = defaultdict(int)
+        self._open_hash_store()
+        sizes = self._list_files()
+        files = [f for f in sizes if not is_ignored_file(f)]
         if not files:
             logger.info(f"No files found in {self.directory}")
             return self._generate_empty_results()
         logger.info(f"Found {len(files)} files to process")
         for file_path in files:
-            try:
-                size = file_path.stat().st_size
-                self.size_groups[size].append(file_path)
-            except Exception as e:
-                logger.error(f"Error getting size for {file_path}: {e}")
-        total_groups = 0
-        processed_files = 0
-        for size, file_group in self.size_groups.items():
-            if len(file_group) < 2:
-                continue
-            image_files = [f for f in file_group if f.suffix.lower() in IMAGE_EXTENSIONS]
-            text_files = [f for f in file_group if f.suffix.lower() in TEXT_EXTENSIONS]
-            other_files = [f for f in file_group if f.suffix.lower() not in IMAGE_EXTENSIONS
-                                                 and f.suffix.lower() not in TEXT_EXTENSIONS]
-            image_dupes = self._find_image_duplicates(image_files)
-            self.image_duplicates.update(image_dupes)
-            text_dupes = self._find_exact_duplicates(text_files)
-            self.exact_duplicates.update(text_dupes)
-            similar_groups = self._find_similar_text_files(text_files)
-            self.similar_text_groups.extend(similar_groups)
-            other_dupes = self._find_exact_duplicates(other_files)
-            self.exact_duplicates.update(other_dupes)
-            total_groups += (len(image_dupes) + len(text_dupes) + len(other_dupes) + len(similar_groups))
-            processed_files += len(file_group)
+            size = sizes[file_path]
+            if size is None:
+                try:
+                    size = file_path.stat().st_size
+                except Exception as e:
+                    logger.error(f"Error getting size for {file_path}: {e}")
+                    continue
+            self.size_groups[size].append(file_path)
+        candidates = [f for group in self.size_groups.values() if len(group) > 1 for f in group]
+        image_files = [f for f in files if f.suffix.lower() in IMAGE_EXTENSIONS]
+        text_files = [f for f in candidates if f.suffix.lower() in TEXT_EXTENSIONS]
+        other_files = [f for f in candidates if f.suffix.lower() not in IMAGE_EXTENSIONS
+                                             and f.suffix.lower() not in TEXT_EXTENSIONS]
+        image_dupes = self._find_image_duplicates(image_files)
+        self.image_duplicates.update(image_dupes)
+        text_dupes = self._find_exact_duplicates(text_files)
+        self.exact_duplicates.update(text_dupes)
+        other_dupes = self._find_exact_duplicates(other_files)
+        self.exact_duplicates.update(other_dupes)
+        # Only the first file of each exact-duplicate group takes part in the
+        # similarity search, so copies are not reported a second time
+        copies = {f for group in self.exact_duplicates.values() for f in group[1:]}
+        similar_groups = self._find_similar_text_files(
+            [f for f in files if f.suffix.lower() in TEXT_EXTENSIONS and f not in copies]
+        )
+        self.similar_text_groups.extend(similar_groups)
+        total_groups = len(image_dupes) + len(text_dupes) + len(other_dupes) + len(similar_groups)
+        processed_files = len(candidates)
         logger.info(f"Found {total_groups} groups of duplicates among {processed_files} files")
+        if self.hash_store is not None:
+            self.hash_store.flush()
         return self._generate_results()
 
+    def _list_files(self) -> Dict[Path, Optional[int]]:
+        """
+        =========================================================================
+        List Files
+        =========================================================================
+        Returns {path: size} for files under the directory, in sorted order.
+        Uses the incremental file manifest when available, so repeat scans
+        only stat files; otherwise falls back to globbing (sizes left as None).
+        """
+        if file is not None and hasattr(file, 'get_manifest'):
+            manifest = file.get_manifest(self.directory)
+            manifest.scan(recursive=self.recursive)
+            return {
+                e['path']: e['size']
+                for e in manifest.entries(recursive=self.recursive, base=self.directory)
+            }
+        file_pattern = '**/*' if self.recursive else '*'
+        return {f: None for f in sorted(self.directory.glob(file_pattern)) if f.is_file()}
+
+    def _map(self, fn, items: List[Any]) -> List[Any]:
+        """
+        =========================================================================
+        Map Over Files
+        =========================================================================
+        Applies fn to each item, on a thread pool when workers > 1. Results are
+        returned in input order.
+        """
+        items = list(items)
+        if self.workers <= 1 or len(items) < 2:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def _open_hash_store(self) -> None:
+        """
+        =========================================================================
+        Open Persistent Hash Store
+        =========================================================================
+        Opens the per-directory hash store so reruns can reuse partial and full
+        hashes of files whose (device, inode, size, mtime) have not changed.
+        """
+        if not self.use_hash_store or self.hash_store is not None:
+            return
+        try:
+            from herd_ai.utils.cache import DocCache
+        except ImportError:
+            try:
+                from llamacleaner.utils.cache import DocCache
+            except ImportError:
+                try:
+                    from utils.cache import DocCache
+                except ImportError:
+                    logger.warning("Cache module not available. Hashes will not be persisted.")
+                    return
+        try:
+            self.hash_store = DocCache(self.directory / HASH_STORE_NAME, max_bytes=0)
+        except Exception as e:
+            logger.error(f"Error opening hash store: {e}")
+            self.hash_store = None
+
+    def _get_hash(self, file_path: Path, partial: bool = False) -> Optional[str]:
+        """
+        =========================================================================
+        Get Stored or Computed Hash
+        =========================================================================
+        Returns the partial (head/tail) or full content hash of a file, reading
+        it from the hash store when the file's identity and mtime are unchanged.
+        """
+        kind = 'partial' if partial else 'full'
+        try:
+            st = file_path.stat()
+        except Exception as e:
+            logger.error(f"Error getting stat for {file_path}: {e}")
+            return None
+        key = f"{self.hash_algorithm}:{kind}:{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+        if self.hash_store is not None:
+            digest = self.hash_store.get(key)
+            if digest:
+                with self._stats_lock:
+                    self.hash_stats[f'{kind}_cached'] += 1
+                return digest
+        if partial:
+            digest = get_partial_hash(file_path, algorithm=self.hash_algorithm)
+            bytes_read = min(st.st_size, 2 * PARTIAL_HASH_BYTES)
+        else:
+            digest = get_file_hash(file_path, FULL_HASH_BLOCK_SIZE, self.hash_algorithm)
+            bytes_read = st.st_size
+        with self._stats_lock:
+            self.hash_stats['bytes_read'] += bytes_read
+            self.hash_stats[f'{kind}_computed'] += 1
+        if digest and self.hash_store is not None:
+            self.hash_store.set(key, digest)
+        return digest
+
     def _find_exact_duplicates(self, files: List[Path]) -> Dict[str, List[Path]]:
         """
         =========================================================================
         Find Exact Duplicates
         =========================================================================
-        Groups files by identical content hash and size.
+        Groups files by identical content hash and size in three stages:
+        size buckets, a hash of the first and last PARTIAL_HASH_BYTES, and a
+        full content hash only for files that still collide. Files no larger
+        than two partial blocks are fully covered by the partial hash.
         Returns a dict of {hash_key: [file_paths]} for groups with >1 file.
         """
         if not files:
             return {}
-        hash_groups = defaultdict(list)
+        size_groups = defaultdict(list)
         for file_path in files:
-            file_hash = get_file_hash(file_path)
-            if file_hash:
-                key = f"{file_path.stat().st_size}_{file_hash}"
-                hash_groups[key].append(file_path)
+            try:
+                size_groups[file_path.stat().st_size].append(file_path)
+            except Exception as e:
+                logger.error(f"Error getting size for {file_path}: {e}")
+        hash_groups = defaultdict(list)
+        for size, same_size in size_groups.items():
+            if len(same_size) < 2:
+                continue
+            partial_groups = defaultdict(list)
+            partial_hashes = self._map(lambda f: self._get_hash(f, partial=True), same_size)
+            for file_path, partial_hash in zip(same_size, partial_hashes):
+                if partial_hash:
+                    partial_groups[partial_hash].append(file_path)
+            for partial_hash, candidates in partial_groups.items():
+                if len(candidates) < 2:
+                    continue
+                if size <= 2 * PARTIAL_HASH_BYTES:
+                    hash_groups[f"{size}_{partial_hash}"].extend(candidates)
+                    continue
+                full_hashes = self._map(self._get_hash, candidates)
+                for file_path, file_hash in zip(candidates, full_hashes):
+                    if file_hash:
+                        hash_groups[f"{size}_{file_hash}"].append(file_path)
         return {k: v for k, v in hash_groups.items() if len(v) > 1}
 
+    def _get_image_hash(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        =========================================================================
+        Get Stored or Computed Perceptual Hash
+        =========================================================================
+        Returns {'hash', 'resolution', 'size'} for an image, decoding it only
+        when the hash store has no entry for its current (inode, size, mtime).
+        """
+        try:
+            st = file_path.stat()
+        except Exception as e:
+            logger.error(f"Error getting stat for {file_path}: {e}")
+            return None
+        key = f"{self.image_hash_method}:{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+        if self.hash_store is not None:
+            info = self.hash_store.get(key)
+            if info:
+                with self._stats_lock:
+                    self.hash_stats['image_cached'] += 1
+                return info
+        try:
+            with Image.open(file_path) as img:
+                resolution = list(img.size)
+                if self.image_hash_method == 'dhash':
+                    value = compute_dhash(img)
+                else:
+                    value = compute_phash(img)
+        except Exception as e:
+            logger.error(f"Error processing image {file_path}: {e}")
+            return None
+        info = {'hash': f"{value:016x}", 'resolution': resolution, 'size': st.st_size}
+        with self._stats_lock:
+            self.hash_stats['image_computed'] += 1
+        if self.hash_store is not None:
+            self.hash_store.set(key, info)
+        return info
+
     def _find_image_duplicates(self, files: List[Path]) -> Dict[str, List[Path]]:
         """
         =========================================================================
         Find Duplicate Images
         =========================================================================
-        Groups images by file size and resolution.
-        Returns a dict of {size_res_key: [file_paths]} for groups with >1 file.
+        Groups images whose perceptual hashes lie within the Hamming radius
+        implied by image_similarity, using a BK-tree for the radius queries.
+        Within each group the largest image (by pixels, then bytes) comes
+        first, so keep-first deletion keeps the best copy.
+        Returns a dict of {hash_res_key: [file_paths]} for groups with >1 file.
         """
         if not files or not PIL_AVAILABLE:
             return {}
-        image_groups = defaultdict(list)
-        for file_path in files:
-            try:
-                file_size = file_path.stat().st_size
-                with Image.open(file_path) as img:
-                    resolution = img.size
-                    key = f"{file_size}_{resolution[0]}x{resolution[1]}"
-                    image_groups[key].append(file_path)
-            except Exception as e:
-                logger.error(f"Error processing image {file_path}: {e}")
-        return {k: v for k, v in image_groups.items() if len(v) > 1}
+        radius = int(math.floor((1.0 - self.image_similarity) * IMAGE_HASH_BITS + 1e-9))
+        tree = BKTree()
+        hashed = []
+        for file_path, info in zip(files, self._map(self._get_image_hash, files)):
+            if not info:
+                continue
+            index = len(hashed)
+            hashed.append((file_path, info))
+            self.image_info[str(file_path)] = info
+            tree.add(int(info['hash'], 16), index)
+        groups = {}
+        grouped = set()
+        for index, (file_path, info) in enumerate(hashed):
+            if index in grouped:
+                continue
+            matches = sorted(i for _, i in tree.query(int(info['hash'], 16), radius) if i not in grouped)
+            if len(matches) < 2:
+                continue
+            grouped.update(matches)
+            members = sorted(
+                (hashed[i] for i in matches),
+                key=lambda item: (-item[1]['resolution'][0] * item[1]['resolution'][1], -item[1]['size'], str(item[0]))
+            )
+            best = members[0][1]
+            key = f"{best['hash']}_{best['resolution'][0]}x{best['resolution'][1]}"
+            groups[key] = [path for path, _ in members]
+        return groups
 
     def _find_similar_text_files(self, files: List[Path]) -> List[List[Dict[str, Any]]]:
         """
         =========================================================================
         Find Similar Text Files
         =========================================================================
-        Groups text files by content similarity above a threshold.
+        Groups text files by content similarity above a threshold. Files of any
+        size are compared: a MinHash/LSH index proposes candidate pairs and only
+        those are scored with calculate_text_similarity.
         Returns a list of groups, each group being a list of file metadata dicts.
         """
         if not files:
             return []
-        text_files = []
-        for file_path in files:
-            result = self.text_processor.process(file_path, self.cache)
-            if not result.get('error'):
-                text_files.append(result)
+        results = self._map(lambda f: self.text_processor.process(f, self.cache), files)
+        text_files = [r for r in results if not r.get('error')]
+        if len(text_files) < 2:
+            return []
+        pairs = self._find_candidate_pairs(text_files)
+        scores = self._score_pairs(text_files, pairs)
+        neighbours = defaultdict(list)
+        for i, j in pairs:
+            neighbours[i].append(j)
+            neighbours[j].append(i)
         similar_groups = []
         processed = set()
         for i, file1 in enumerate(text_files):
@@ -338,17 +597,75 @@ class DuplicateDetector:
                 continue
             current_group = [file1]
             processed.add(file1['original_path'])
-            for j, file2 in enumerate(text_files):
-                if i == j or file2['original_path'] in processed:
+            for j in sorted(neighbours[i]):
+                file2 = text_files[j]
+                if file2['original_path'] in processed:
                     continue
-                similarity = calculate_text_similarity(file1, file2)
-                if similarity >= self.text_processor.similarity_threshold:
+                if scores[(min(i, j), max(i, j))] >= self.text_processor.similarity_threshold:
                     current_group.append(file2)
                     processed.add(file2['original_path'])
             if len(current_group) > 1:
                 similar_groups.append(current_group)
         return similar_groups
 
+    def _find_candidate_pairs(self, text_files: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """
+        =========================================================================
+        Find Candidate Text Pairs
+        =========================================================================
+        Builds MinHash signatures over word shingles and returns the (i, j)
+        index pairs, i < j, that share an LSH bucket. Files without any text
+        are skipped. Files with identical shingle sets are collapsed before
+        banding: each is paired with the first file of its set only, and LSH
+        candidates are paired with the members of each other's set, so the
+        number of pairs stays linear in the number of identical files.
+        """
+        hasher = MinHasher(num_perm=self.text_processor.num_perm)
+        shingles = self._map(lambda r: shingle_hashes(r.get('content', ''), hasher.shingle_size), text_files)
+        first_seen: Dict[frozenset, int] = {}
+        members: Dict[int, List[int]] = {}
+        for i, hashes in enumerate(shingles):
+            if not hashes:
+                continue
+            first = first_seen.setdefault(frozenset(hashes), i)
+            members.setdefault(first, []).append(i)
+        representatives = sorted(members)
+        signatures = self._map(lambda i: hasher.signature_from_hashes(shingles[i]), representatives)
+        index = LSHIndex(self.text_processor.lsh_threshold, hasher.num_perm)
+        for i, signature in zip(representatives, signatures):
+            index.add(i, signature)
+        pairs = set()
+        for first, group in members.items():
+            pairs.update((first, i) for i in group[1:])
+        for a, b in index.candidate_pairs():
+            pairs.update((min(a, i), max(a, i)) for i in members[b])
+            pairs.update((min(i, b), max(i, b)) for i in members[a])
+        pairs = sorted(pairs)
+        logger.info(f"LSH proposed {len(pairs)} candidate pairs among {len(text_files)} text files")
+        return pairs
+
+    def _score_pairs(self, text_files: List[Dict[str, Any]], pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """
+        =========================================================================
+        Score Candidate Text Pairs
+        =========================================================================
+        Scores each (i, j) pair with calculate_text_similarity, on a process
+        pool when workers > 1 and there are enough pairs to amortize it.
+        """
+        if self.workers > 1 and len(pairs) >= MIN_PAIRS_FOR_PROCESS_POOL:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_similarity_worker,
+                    initargs=(text_files,)
+                ) as pool:
+                    chunksize = max(1, len(pairs) // (self.workers * 4))
+                    values = pool.map(_score_similarity_pair, pairs, chunksize=chunksize)
+                    return dict(zip(pairs, values))
+            except Exception as e:
+                logger.warning(f"Process pool unavailable, scoring text similarity serially: {e}")
+        return {(i, j): calculate_text_similarity(text_files[i], text_files[j]) for i, j in pairs}
+
     def _generate_results(self) -> Dict[str, Any]:
         """
         =========================================================================
@@ -363,7 +680,9 @@ class DuplicateDetector:
             'image_duplicates': [],
             'similar_text_groups': [],
             'total_duplicates': 0,
-            'potential_space_saving': 0
+            'potential_space_saving': 0,
+            'hash_algorithm': self.hash_algorithm,
+            'hash_stats': dict(self.hash_stats)
         }
         for key, files in self.exact_duplicates.items():
             if len(files) <= 1:
@@ -392,7 +711,7 @@ class DuplicateDetector:
             }
             result['image_duplicates'].append(group)
             result['total_duplicates'] += len(files) - 1
-            result['potential_space_saving'] += size * (len(files) - 1)
+            result['potential_space_saving'] += sum(f.stat().st_size for f in files[1:])
         for group in self.similar_text_groups:
             if len(group) <= 1:
                 continue
@@ -539,15 +858,32 @@ class DuplicateDetector:
             content.append("\n---\n")
         return "\n".join(content)
 
-def get_file_hash(file_path: Path, block_size: int = 65536) -> Optional[str]:
+def new_hasher(algorithm: str = DEFAULT_HASH_ALGORITHM):
+    """
+    ============================================================================
+    Create Hash Object
+    ============================================================================
+    Returns a hashlib-style hasher for the named algorithm. 'xxhash' uses
+    XXH3-128 when available and falls back to blake2b otherwise.
+    """
+    if algorithm == 'xxhash':
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_128()
+        algorithm = 'blake2b'
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(digest_size=32)
+    return hashlib.sha256()
+
+def get_file_hash(file_path: Path, block_size: int = 65536, algorithm: str = DEFAULT_HASH_ALGORITHM) -> Optional[str]:
     """
     ============================================================================
     Calculate File Hash
     ============================================================================
-    Returns the SHA-256 hash of the file at the given path.
+    Returns the hash of the full contents of the file at the given path
+    (SHA-256 unless another algorithm is requested).
     """
     try:
-        hasher = hashlib.sha256()
+        hasher = new_hasher(algorithm)
         with open(file_path, 'rb') as f:
             for block in iter(lambda: f.read(block_size), b''):
                 hasher.update(block)
@@ -556,6 +892,27 @@ def get_file_hash(file_path: Path, block_size: int = 65536) -> Optional[str]:
         logger.error(f"Error calculating hash for {file_path}: {e}")
         return None
 
+def get_partial_hash(file_path: Path, chunk_size: int = PARTIAL_HASH_BYTES, algorithm: str = DEFAULT_HASH_ALGORITHM) -> Optional[str]:
+    """
+    ============================================================================
+    Calculate Partial File Hash
+    ============================================================================
+    Returns a hash of the first and last `chunk_size` bytes of a file. For files
+    of up to 2 * chunk_size bytes this covers the entire content.
+    """
+    try:
+        hasher = new_hasher(algorithm)
+        with open(file_path, 'rb') as f:
+            hasher.update(f.read(chunk_size))
+            size = os.fstat(f.fileno()).st_size
+            if size > chunk_size:
+                f.seek(max(chunk_size, size - chunk_size))
+                hasher.update(f.read(chunk_size))
+        return hasher.hexdigest()
+    except Exception as e:
+        logger.error(f"Error calculating partial hash for {file_path}: {e}")
+        return None
+
 def get_image_info(file_path: Path) -> Tuple[Optional[int], Optional[Tuple[int, int]]]:
     """
     ============================================================================
@@ -578,6 +935,112 @@ def get_image_info(file_path: Path) -> Tuple[Optional[int], Optional[Tuple[int,
         resolution = None
     return file_size, resolution
 
+def _grayscale_pixels(img, width: int, height: int) -> List[int]:
+    """Downscale an open image to width x height grayscale pixel values."""
+    if img.format == 'JPEG':
+        # Let the JPEG decoder skip most of the work for large photos.
+        img.draft('L', (width * 4, height * 4))
+    small = img.convert('L').resize((width, height), Image.LANCZOS)
+    return list(small.getdata())
+
+def compute_dhash(img) -> int:
+    """
+    ============================================================================
+    Difference Hash
+    ============================================================================
+    Returns a 64-bit hash where each bit records whether a pixel is brighter
+    than its right-hand neighbour in a 9x8 grayscale thumbnail.
+    """
+    pixels = _grayscale_pixels(img, 9, 8)
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+_DCT_SIZE = 32
+_DCT_KEEP = 8
+_DCT_COS = [
+    [math.cos(math.pi * (2 * x + 1) * u / (2 * _DCT_SIZE)) for x in range(_DCT_SIZE)]
+    for u in range(_DCT_KEEP)
+]
+
+def compute_phash(img) -> int:
+    """
+    ============================================================================
+    Perceptual Hash
+    ============================================================================
+    Returns a 64-bit hash from the low-frequency 8x8 block of the DCT of a
+    32x32 grayscale thumbnail; each bit is set when the coefficient is above
+    the block median.
+    """
+    pixels = _grayscale_pixels(img, _DCT_SIZE, _DCT_SIZE)
+    rows = [
+        [sum(pixels[y * _DCT_SIZE + x] * cos_u[x] for x in range(_DCT_SIZE)) for cos_u in _DCT_COS]
+        for y in range(_DCT_SIZE)
+    ]
+    coefficients = [
+        sum(rows[y][u] * cos_v[y] for y in range(_DCT_SIZE))
+        for cos_v in _DCT_COS
+        for u in range(_DCT_KEEP)
+    ]
+    median = sorted(coefficients[1:])[(len(coefficients) - 1) // 2]
+    value = 0
+    for coefficient in coefficients:
+        value = (value << 1) | (1 if coefficient > median else 0)
+    return value
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two integer hashes."""
+    return bin(a ^ b).count('1')
+
+class BKTree:
+    """
+    ===========================================================================
+    BK-Tree for Hamming Distance
+    ===========================================================================
+    Metric tree over integer hashes. query() returns every stored item within
+    a Hamming radius while pruning subtrees via the triangle inequality.
+    """
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value: int, item: Any) -> None:
+        node = [value, [item], {}]
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming_distance(value, current[0])
+            if distance == 0:
+                current[1].append(item)
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def query(self, value: int, radius: int) -> List[Tuple[int, Any]]:
+        results = []
+        if self.root is None:
+            return results
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= radius:
+                results.extend((distance, item) for item in node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return results
+
 def calculate_text_hash(text: str) -> str:
     """
     ============================================================================
@@ -630,6 +1093,17 @@ def calculate_text_similarity(file1: Dict[str, Any], file2: Dict[str, Any]) -> f
         word_similarity = len(intersection) / max(len(words1), len(words2))
     return (line_similarity * 0.5) + (paragraph_similarity * 0.3) + (word_similarity * 0.2)
 
+# Text files shared with similarity worker processes (set by the pool initializer).
+_similarity_files: List[Dict[str, Any]] = []
+
+def _init_similarity_worker(text_files: List[Dict[str, Any]]) -> None:
+    global _similarity_files
+    _similarity_files = text_files
+
+def _score_similarity_pair(pair: Tuple[int, int]) -> float:
+    i, j = pair
+    return calculate_text_similarity(_similarity_files[i], _similarity_files[j])
+
 def is_ignored_file(file_path: Path) -> bool:
     """
     ============================================================================
@@ -710,7 +1184,10 @@ def dedupe_files(
     interactive: bool = True,
     delete_duplicates: bool = False,
     merge_similar: bool = False,
-    output_dir: Optional[Union[str, Path]] = None
+    output_dir: Optional[Union[str, Path]] = None,
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+    workers: int = 1,
+    image_similarity: float = DEFAULT_IMAGE_SIMILARITY
 ) -> Dict[str, Any]:
     """
     ============================================================================
@@ -723,7 +1200,13 @@ def dedupe_files(
     directory = Path(directory)
     if output_dir:
         output_dir = Path(output_dir)
-    detector = DuplicateDetector(directory, recursive)
+    detector = DuplicateDetector(
+        directory,
+        recursive,
+        hash_algorithm=hash_algorithm,
+        workers=workers,
+        image_similarity=image_similarity
+    )
     results = detector.scan_directory()
     exact_dupes_count = sum(len(g['files']) - 1 for g in results['exact_duplicates'])
     image_dupes_count = sum(len(g['files']) - 1 for g in results['image_duplicates'])
@@ -755,7 +1238,7 @@ def dedupe_files(
             if results['image_duplicates']:
                 print("\n== Image Duplicates ==")
                 for i, group in enumerate(results['image_duplicates'], 1):
-                    print(f"\nGroup {i}: {group['count']} files, {format_size(group['size'])} each, Resolution: {group['resolution']}")
+                    print(f"\nGroup {i}: {group['count']} files, keeping {format_size(group['size'])} at {group['resolution']}")
                     for file_path in group['files']:
                         print(f"  - {file_path}")
             if results['similar_text_groups']:
@@ -805,6 +1288,9 @@ def main():
     parser.add_argument('--delete', action='store_true', help='Delete duplicates (keeping the first in each group)')
     parser.add_argument('--merge', action='store_true', help='Merge similar text files')
     parser.add_argument('--output', '-o', type=str, help='Output directory for merged files')
+    parser.add_argument('--hash', choices=HASH_ALGORITHMS, default=DEFAULT_HASH_ALGORITHM, help='Hash algorithm for exact duplicates (default: sha256)')
+    parser.add_argument('--image-similarity', type=float, default=DEFAULT_IMAGE_SIMILARITY, help='Perceptual hash similarity (0-1) for image duplicates (default: 0.9)')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Worker threads/processes for hashing and similarity (default: 1)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     args = parser.parse_args()
     if args.verbose:
@@ -815,7 +1301,10 @@ def main():
         interactive=not args.non_interactive,
         delete_duplicates=args.delete,
         merge_similar=args.merge,
-        output_dir=args.output
+        output_dir=args.output,
+        hash_algorithm=args.hash,
+        workers=args.workers,
+        image_similarity=args.image_similarity
     )
 
 if __name__ == "__main__":
@@ -13,11 +13,17 @@
 ###############################################################################
 
 import hashlib
+import os
+import sqlite3
 import subprocess
 import re
+import threading
+import time
+import zipfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import logging
+from xml.etree import ElementTree
 
 try:
     import fitz  # PyMuPDF for PDF text extraction
@@ -36,28 +42,32 @@ except ImportError:
     PILImage = None
     pytesseract = None
 
-# --- Herd AI Utility Imports (robust, fallback style) ---
 try:
-    from herd_ai.utils import dedupe, analysis, config as herd_config, scrambler, undo_log
+    from herd_ai.utils.image_metadata import read_alt_text_metadata, write_alt_text_metadata, image_kind
 except ImportError:
     try:
-        from llamacleaner.utils import dedupe, analysis, config as herd_config, scrambler, undo_log
+        from llamacleaner.utils.image_metadata import read_alt_text_metadata, write_alt_text_metadata, image_kind
     except ImportError:
         try:
-            import utils.dedupe as dedupe
-            import utils.analysis as analysis
-            import utils.config as herd_config
-            import utils.scrambler as scrambler
-            import utils.undo_log as undo_log
+            from utils.image_metadata import read_alt_text_metadata, write_alt_text_metadata, image_kind
         except ImportError:
-            dedupe = None
-            analysis = None
-            herd_config = None
-            scrambler = None
-            undo_log = None
+            read_alt_text_metadata = write_alt_text_metadata = image_kind = None
 
 logger = logging.getLogger(__name__)
 
+# Target size of chunks yielded by iter_file_text, in characters.
+DEFAULT_TEXT_CHUNK_SIZE = 64 * 1024
+# Number of bytes read from plain text files per read() call.
+TEXT_READ_BLOCK_SIZE = 256 * 1024
+
+# Per-tree manifest location, relative to the scanned root.
+MANIFEST_DIR_NAME = ".herd"
+MANIFEST_FILE_NAME = "manifest.sqlite3"
+# Timestamps this close to "now" may still change within the same tick.
+_RACY_MTIME_NS = 2_000_000_000
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
 ###############################################################################
 # ensure_directory
 # ---------------
@@ -193,14 +203,19 @@ def extract_text_from_txt_like(file_path: Path) -> str:
 ###############################################################################
 # extract_text_from_image
 # -----------------------
-# Extracts text from an image file using OCR (pytesseract).
+# Extracts text from an image file using OCR (pytesseract). An already
+# decoded image (a PIL image or a utils.imaging.DecodedImage) may be passed
+# to avoid opening and decoding the file again.
 ###############################################################################
-def extract_text_from_image(image_path: Path) -> str:
+def extract_text_from_image(image_path: Path, image: Any = None) -> str:
     if not PILImage or not pytesseract:
         logger.warning("OCR libraries not available. Skipping OCR.")
         return ""
     try:
-        img = PILImage.open(image_path)
+        if image is None:
+            img = PILImage.open(image_path)
+        else:
+            img = getattr(image, 'full_image', image)
         return pytesseract.image_to_string(img)
     except Exception as e:
         logger.error(f"Error extracting text from image {image_path}: {e}")
@@ -222,6 +237,452 @@ def get_file_text(path: Path) -> str:
         return extract_text_from_image(path)
     return extract_text_from_txt_like(path)
 
+###############################################################################
+# iter_text_from_pdf
+# ------------------
+# Yields the text of a PDF one page at a time. Pages are loaded and released
+# individually, and the OCR fallback converts a single page image at a time,
+# so memory use is bounded by the largest page rather than the document.
+###############################################################################
+def iter_text_from_pdf(file_path: Path, force_ocr: bool = False) -> Iterator[str]:
+    found_text = False
+    try:
+        if not force_ocr and fitz:
+            with fitz.open(file_path) as pdf:
+                for page_num in range(len(pdf)):
+                    text = pdf.load_page(page_num).get_text()
+                    if text.strip():
+                        found_text = True
+                    if text:
+                        yield text
+        if not found_text and PILImage and pytesseract:
+            from pdf2image import convert_from_path, pdfinfo_from_path
+            pages = int(pdfinfo_from_path(str(file_path)).get("Pages", 0))
+            for page in range(1, pages + 1):
+                for img in convert_from_path(file_path, first_page=page, last_page=page):
+                    yield pytesseract.image_to_string(img) + "\n"
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF {file_path}: {e}")
+
+###############################################################################
+# iter_text_from_docx
+# -------------------
+# Yields the paragraphs of a DOCX body one at a time by streaming
+# word/document.xml with iterparse, clearing each paragraph once read.
+# Falls back to docx2txt for files that are not Office Open XML (e.g. .doc).
+###############################################################################
+def iter_text_from_docx(file_path: Path) -> Iterator[str]:
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except (zipfile.BadZipFile, OSError):
+        text = extract_text_from_docx(file_path)
+        if text:
+            yield text
+        return
+    try:
+        with archive, archive.open("word/document.xml") as xml:
+            parts: List[str] = []
+            for event, elem in ElementTree.iterparse(xml, events=("end",)):
+                tag = elem.tag
+                if tag == f"{_WORD_NS}t" and elem.text:
+                    parts.append(elem.text)
+                elif tag == f"{_WORD_NS}tab":
+                    parts.append("\t")
+                elif tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+                    parts.append("\n")
+                elif tag == f"{_WORD_NS}p":
+                    yield "".join(parts) + "\n"
+                    parts = []
+                    elem.clear()
+    except Exception as e:
+        logger.error(f"Error extracting text from DOCX {file_path}: {e}")
+
+###############################################################################
+# iter_text_from_txt_like
+# -----------------------
+# Yields a plain text file in blocks of roughly TEXT_READ_BLOCK_SIZE bytes,
+# decoded as UTF-8 with undecodable bytes dropped.
+###############################################################################
+def iter_text_from_txt_like(file_path: Path) -> Iterator[str]:
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            for block in iter(lambda: f.read(TEXT_READ_BLOCK_SIZE), ""):
+                yield block
+    except Exception as e:
+        logger.error(f"Error reading text file {file_path}: {e}")
+
+###############################################################################
+# iter_file_text
+# --------------
+# Streaming counterpart of get_file_text. Yields the text of a file lazily in
+# chunks of about `chunk_size` characters, split at page, paragraph or line
+# boundaries where possible (falling back to whitespace for very long lines).
+# Extraction stops once `max_bytes` of UTF-8 text has been yielded, so callers
+# can bound memory and work on very large documents.
+###############################################################################
+def iter_file_text(
+    path: Path,
+    chunk_size: int = DEFAULT_TEXT_CHUNK_SIZE,
+    max_bytes: Optional[int] = None
+) -> Iterator[str]:
+    path = Path(path)
+    ext = path.suffix.lower()
+    if ext == '.pdf':
+        pieces: Iterable[str] = iter_text_from_pdf(path)
+    elif ext in {'.docx', '.doc'}:
+        pieces = iter_text_from_docx(path)
+    elif ext in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif'}:
+        pieces = iter([extract_text_from_image(path)])
+    else:
+        pieces = iter_text_from_txt_like(path)
+
+    remaining = max_bytes if max_bytes and max_bytes > 0 else None
+    buf = ""
+    for piece in pieces:
+        buf += piece
+        while len(buf) >= chunk_size:
+            cut = _chunk_boundary(buf, chunk_size)
+            chunk, buf = buf[:cut], buf[cut:]
+            if remaining is not None:
+                chunk, remaining = _cap_chunk(chunk, remaining)
+            if chunk:
+                yield chunk
+            if remaining == 0:
+                return
+    if buf:
+        if remaining is not None:
+            buf, remaining = _cap_chunk(buf, remaining)
+        if buf:
+            yield buf
+
+def _chunk_boundary(text: str, size: int) -> int:
+    """Index to cut `text` at: the last newline, else whitespace, before `size`."""
+    cut = text.rfind("\n", 0, size)
+    if cut <= 0:
+        cut = max(text.rfind(" ", 0, size), text.rfind("\t", 0, size))
+    return cut + 1 if cut > 0 else size
+
+def _cap_chunk(chunk: str, remaining: int) -> Tuple[str, int]:
+    data = chunk.encode("utf-8")
+    if len(data) <= remaining:
+        return chunk, remaining - len(data)
+    return data[:remaining].decode("utf-8", errors="ignore"), 0
+
+###############################################################################
+# iter_lines
+# ----------
+# Yields lines (without line endings) from an iterable of text chunks,
+# matching str.splitlines() on the joined text without building it.
+###############################################################################
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    carry = ""
+    for chunk in chunks:
+        parts = (carry + chunk).splitlines(True)
+        if not parts:
+            continue
+        # Hold back the last piece: it may be a partial line or a "\r" whose
+        # "\n" arrives in the next chunk.
+        carry = parts.pop()
+        for line in parts:
+            yield line.splitlines()[0]
+    if carry:
+        yield carry.splitlines()[0]
+
+###############################################################################
+# FileManifest
+# ------------
+# Persistent, incrementally refreshed listing of a directory tree, stored in
+# <root>/.herd/manifest.sqlite3 and shared by every command that walks a tree.
+#
+# Each file row records its relative path, size, mtime, inode and (lazily) a
+# content hash. Each directory row records the directory's mtime. On rescan a
+# directory whose mtime is unchanged reuses its stored listing instead of
+# calling os.scandir() again; only its files are re-stat'ed, because editing a
+# file in place does not touch the directory's mtime. Content hashes are
+# dropped whenever size, mtime or inode change and recomputed on demand.
+###############################################################################
+class FileManifest:
+    """
+    Incremental file manifest for one directory tree.
+
+    Use get_manifest() to share one instance per root within a process. If the
+    .herd directory cannot be created, the manifest is kept in memory for the
+    life of the instance.
+    """
+
+    def __init__(self, root: Union[str, Path], manifest_path: Optional[Union[str, Path]] = None):
+        self.root = Path(root).resolve()
+        self.path = Path(manifest_path) if manifest_path else self.root / MANIFEST_DIR_NAME / MANIFEST_FILE_NAME
+        self._lock = threading.RLock()
+        self.last_scan: Dict[str, Any] = {}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Manifest unavailable at {self.path} ({e}); keeping it in memory")
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                parent TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                hash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS files_parent ON files(parent);
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+            """
+        )
+        self._conn.commit()
+
+    def scan(self, recursive: bool = True) -> Dict[str, Any]:
+        """
+        Bring the manifest up to date with the tree on disk.
+
+        Args:
+            recursive: Descend into subdirectories. A non-recursive scan only
+                refreshes the files directly under the root.
+
+        Returns:
+            Scan statistics: added, modified and removed file paths (relative
+            to the root), plus counts of directories listed with os.scandir,
+            directories reused from the manifest and files stat'ed.
+        """
+        stats = {
+            "added": [], "modified": [], "removed": [],
+            "dirs_listed": 0, "dirs_reused": 0, "files_checked": 0,
+        }
+        with self._lock, self._conn:
+            pending = [""]
+            while pending:
+                rel = pending.pop()
+                self._scan_dir(rel, recursive, pending, stats)
+        self.last_scan = stats
+        logger.debug(
+            f"Manifest scan of {self.root}: {stats['dirs_listed']} listed, "
+            f"{stats['dirs_reused']} reused, +{len(stats['added'])} "
+            f"~{len(stats['modified'])} -{len(stats['removed'])}"
+        )
+        return stats
+
+    def _scan_dir(self, rel: str, recursive: bool, pending: List[str], stats: Dict[str, Any]) -> None:
+        conn = self._conn
+        directory = self.root / rel if rel else self.root
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._remove_dir(rel, stats)
+            return
+        row = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (rel,)).fetchone()
+        known_files = {
+            name: (size, mtime_ns, inode)
+            for name, size, mtime_ns, inode in conn.execute(
+                "SELECT path, size, mtime_ns, inode FROM files WHERE parent = ?", (rel,)
+            )
+        }
+        known_dirs = {p for (p,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (rel,))}
+        if row is not None and row[0] == dir_mtime:
+            # Listing unchanged since the last scan; re-stat the known files only.
+            stats["dirs_reused"] += 1
+            subdirs = sorted(known_dirs)
+            current = {}
+            for path in known_files:
+                try:
+                    st = os.stat(self.root / path)
+                except OSError:
+                    continue
+                current[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+        else:
+            stats["dirs_listed"] += 1
+            subdirs = []
+            current = {}
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        path = f"{rel}/{entry.name}" if rel else entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not (rel == "" and entry.name == MANIFEST_DIR_NAME):
+                                    subdirs.append(path)
+                            elif entry.is_file():
+                                st = entry.stat()
+                                current[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.warning(f"Could not list {directory}: {e}")
+                return
+            for gone in known_dirs.difference(subdirs):
+                self._remove_dir(gone, stats)
+            for path in subdirs:
+                if path not in known_dirs:
+                    # Placeholder mtime so the first visit always lists the directory.
+                    conn.execute(
+                        "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, -1)",
+                        (path, rel)
+                    )
+        stats["files_checked"] += len(current)
+        for path in set(known_files).difference(current):
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            stats["removed"].append(path)
+        for path, meta in current.items():
+            previous = known_files.get(path)
+            if previous == meta:
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, parent, size, mtime_ns, inode, hash) "
+                "VALUES (?, ?, ?, ?, ?, NULL)",
+                (path, rel, *meta)
+            )
+            stats["added" if previous is None else "modified"].append(path)
+        if time.time_ns() - dir_mtime < _RACY_MTIME_NS:
+            # Changes later in the same timestamp tick would not move the mtime,
+            # so a just-modified directory is listed again next time.
+            dir_mtime = -1
+        conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (rel, None if rel == "" else rel.rpartition("/")[0], dir_mtime)
+        )
+        if recursive:
+            pending.extend(subdirs)
+
+    def _remove_dir(self, rel: str, stats: Dict[str, Any]) -> None:
+        prefix = f"{rel}/"
+        removed = [
+            p for (p,) in self._conn.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            )
+        ]
+        stats["removed"].extend(removed)
+        self._conn.execute("DELETE FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+        self._conn.execute(
+            "DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (rel, len(prefix), prefix)
+        )
+
+    def entries(
+        self,
+        recursive: bool = True,
+        extensions: Optional[Iterable[str]] = None,
+        base: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return manifest rows as dicts with path, size, mtime (epoch seconds),
+        mtime_ns, inode and hash (None until computed), sorted by path.
+        Paths are joined onto `base` (default: the resolved root). Reflects
+        the tree as of the last scan().
+        """
+        base = self.root if base is None else Path(base)
+        exts = {e.lower() for e in extensions} if extensions is not None else None
+        query = "SELECT path, size, mtime_ns, inode, hash FROM files"
+        if not recursive:
+            query += " WHERE parent = ''"
+        with self._lock:
+            rows = self._conn.execute(query).fetchall()
+        result = []
+        for path, size, mtime_ns, inode, digest in rows:
+            full = base / path
+            if exts is not None and full.suffix.lower() not in exts:
+                continue
+            result.append({
+                "path": full, "size": size, "mtime": mtime_ns / 1e9,
+                "mtime_ns": mtime_ns, "inode": inode, "hash": digest,
+            })
+        result.sort(key=lambda e: e["path"])
+        return result
+
+    def files(
+        self,
+        recursive: bool = True,
+        extensions: Optional[Iterable[str]] = None,
+        base: Optional[Path] = None
+    ) -> List[Path]:
+        """Return the paths of files in the manifest, sorted."""
+        return [e["path"] for e in self.entries(recursive, extensions, base)]
+
+    def get_hash(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        Return the SHA-256 of a file's content, computing and storing it if the
+        manifest has no hash for the file's current size, mtime and inode.
+        """
+        full = Path(path) if Path(path).is_absolute() else self.root / path
+        try:
+            rel = full.relative_to(self.root).as_posix()
+            st = os.stat(full)
+        except (ValueError, OSError):
+            return None
+        meta = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, hash FROM files WHERE path = ?", (rel,)
+            ).fetchone()
+        if row is not None and tuple(row[:3]) == meta and row[3]:
+            return row[3]
+        digest = hashlib.sha256()
+        try:
+            with open(full, "rb") as f:
+                for block in iter(lambda: f.read(TEXT_READ_BLOCK_SIZE), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        value = digest.hexdigest()
+        if time.time_ns() - st.st_mtime_ns < _RACY_MTIME_NS:
+            # A same-tick rewrite could keep size and mtime; don't trust it yet.
+            return value
+        parent = rel.rpartition("/")[0]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, parent, size, mtime_ns, inode, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rel, parent, *meta, value)
+            )
+        return value
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_manifests: Dict[Path, FileManifest] = {}
+_manifests_lock = threading.Lock()
+
+###############################################################################
+# get_manifest
+# ------------
+# Returns the shared FileManifest for a directory, opening it on first use.
+###############################################################################
+def get_manifest(directory: Union[str, Path]) -> FileManifest:
+    root = Path(directory).resolve()
+    with _manifests_lock:
+        manifest = _manifests.get(root)
+        if manifest is None:
+            manifest = FileManifest(root)
+            _manifests[root] = manifest
+        return manifest
+
+###############################################################################
+# scan_files
+# ----------
+# Incrementally rescans a directory through its manifest and returns the
+# files found, optionally limited to a set of extensions. Paths are sorted
+# and rooted at `directory` as given; the .herd directory is never listed.
+###############################################################################
+def scan_files(
+    directory: Union[str, Path],
+    recursive: bool = True,
+    extensions: Optional[Iterable[str]] = None
+) -> List[Path]:
+    manifest = get_manifest(directory)
+    manifest.scan(recursive=recursive)
+    return manifest.files(recursive=recursive, extensions=extensions, base=Path(directory))
+
 ###############################################################################
 # get_file_size_mb
 # ----------------
@@ -243,8 +704,8 @@ def get_file_size_mb(file_path: Union[str, Path]) -> float:
 ###############################################################################
 def count_by_extension(directory: Path) -> Dict[str, int]:
     counts = {}
-    for file_path in directory.rglob('*'):
-        if file_path.is_file() and not is_ignored_file(file_path):
+    for file_path in scan_files(directory):
+        if not is_ignored_file(file_path):
             ext = file_path.suffix.lower()
             counts[ext] = counts.get(ext, 0) + 1
     return counts
@@ -280,18 +741,19 @@ def read_project_stats(directory: Path, recursive: bool = True) -> Dict[str, Any
         'newest_file_time': 0
     }
     
-    # Choose glob function based on recursion preference
-    glob_func = directory.rglob if recursive else directory.glob
+    # Sizes and mtimes come from the manifest, so unchanged files are not re-read
+    manifest = get_manifest(directory)
+    manifest.scan(recursive=recursive)
     
-    for file_path in glob_func('*'):
-        if file_path.is_file() and not is_ignored_file(file_path):
+    for entry in manifest.entries(recursive=recursive, base=Path(directory)):
+        file_path = entry['path']
+        if not is_ignored_file(file_path):
             # Update file count
             stats['total_files'] += 1
             
             # Get file metadata
-            file_stat = file_path.stat()
-            file_size = file_stat.st_size
-            file_mtime = file_stat.st_mtime
+            file_size = entry['size']
+            file_mtime = entry['mtime']
             
             # Update total size
             stats['total_size'] += file_size
@@ -345,12 +807,9 @@ def get_file_count_by_type(directory: Path, recursive: bool = True) -> Dict[str,
     counts = {category: 0 for category in type_categories}
     counts['other'] = 0  # For files that don't match any category
     
-    # Choose glob function based on recursion preference
-    glob_func = directory.rglob if recursive else directory.glob
-    
     # Count files by type
-    for file_path in glob_func('*'):
-        if file_path.is_file() and not is_ignored_file(file_path):
+    for file_path in scan_files(directory, recursive=recursive):
+        if not is_ignored_file(file_path):
             ext = file_path.suffix.lower()
             
             # Categorize the file
@@ -401,9 +860,19 @@ def get_image_dimensions(path: Path) -> Union[Tuple[int, int], None]:
 ###############################################################################
 # embed_alt_text_into_image
 # -------------------------
-# Embeds alt text into an image's metadata for accessibility.
+# Embeds alt text into an image's metadata for accessibility. JPEG and PNG
+# files get a metadata-only write that leaves the compressed image data
+# untouched; other formats are re-saved through Pillow.
 ###############################################################################
 def embed_alt_text_into_image(path: Path, alt_text: str) -> None:
+    if write_alt_text_metadata is not None:
+        try:
+            info = write_alt_text_metadata(path, alt_text)
+            if info is not None:
+                logger.info(f"Alt text embedded in {path} ({info['mode']}, {info['bytes_written']} bytes)")
+                return
+        except Exception as e:
+            logger.warning(f"Metadata-only alt text write failed for {path}, re-encoding instead: {e}")
     try:
         if not PILImage:
             logger.warning("PIL/Pillow not available for embedding alt text")
@@ -445,6 +914,11 @@ def read_alt_text(path: Path) -> Optional[str]:
     Returns:
         The alt text as a string if found, None otherwise
     """
+    if image_kind is not None and image_kind(path) is not None:
+        try:
+            return read_alt_text_metadata(path)
+        except Exception as e:
+            logger.debug(f"Header-only alt text read failed for {path}: {e}")
     try:
         if not PILImage:
             logger.warning("PIL/Pillow not available for reading alt text")
@@ -53,6 +53,11 @@ try:
 except ImportError:
     herd_config = None
 
+try:
+    from herd_ai.utils import sessions
+except ImportError:
+    import utils.sessions as sessions
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -139,7 +144,8 @@ def send_prompt_to_gemini(
 
             start_time = time.time()
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
+                # Retries are handled by the loop above; the session only pools connections
+                resp = sessions.post("gemini", url, headers=headers, json=payload, timeout=timeout, retries=0)
                 logger.debug(f"Response status code: {resp.status_code}")
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"Connection error - Is the Gemini API accessible? Error: {e}")
@@ -149,8 +155,8 @@ def send_prompt_to_gemini(
                 error_text = resp.text if len(resp.text) < 500 else f"{resp.text[:500]}..."
                 logger.error(f"Gemini HTTP error: {resp.status_code} - {error_text}")
                 if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = sessions.backoff_delay(attempt)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
                     continue
                 return None
@@ -189,8 +195,8 @@ def send_prompt_to_gemini(
         except requests.RequestException as e:
             logger.error(f"Gemini request error (attempt {attempt+1}/{max_retries+1}): {e}")
             if attempt < max_retries:
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
+                wait_time = sessions.backoff_delay(attempt)
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
             else:
                 return None
@@ -209,6 +215,7 @@ def send_prompt_to_gemini(
 #   prompt (str): The prompt to guide the model's image analysis (default: IMAGE_ALT_TEXT_TEMPLATE).
 #   max_retries (int): Maximum number of retry attempts (default: 2).
 #   timeout (int): Timeout in seconds for the request (default: 90).
+#   base64_image (str): Pre-encoded JPEG payload; when given the file is not re-read.
 #
 # Returns:
 #   Optional[Dict]: Dictionary with image description data or None if an error occurred.
@@ -218,7 +225,8 @@ def send_image_to_gemini(
     model: str = GEMINI_IMAGE_MODEL,
     prompt: str = IMAGE_ALT_TEXT_TEMPLATE,
     max_retries: int = 2,
-    timeout: int = 90
+    timeout: int = 90,
+    base64_image: Optional[str] = None
 ) -> Optional[Dict]:
     api_key = get_gemini_api_key()
     if not api_key:
@@ -226,18 +234,23 @@ def send_image_to_gemini(
         return None
 
     MAX_FILE_SIZE_MB = 20
-    file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
-        logger.error(f"Image too large ({file_size_mb:.1f} MB > {MAX_FILE_SIZE_MB} MB): {image_path}")
-        return None
+    if base64_image is None:
+        file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
+        if file_size_mb > MAX_FILE_SIZE_MB:
+            logger.error(f"Image too large ({file_size_mb:.1f} MB > {MAX_FILE_SIZE_MB} MB): {image_path}")
+            return None
+        # Encode once; retries resend the same payload
+        base64_image = encode_image(image_path)
+        if not base64_image:
+            logger.error(f"Failed to encode image: {image_path}")
+            return None
+        mime_type = "image/png"
+    else:
+        file_size_mb = len(base64_image) * 3 / 4 / (1024 * 1024)
+        mime_type = "image/jpeg"
 
     for attempt in range(max_retries + 1):
         try:
-            base64_image = encode_image(image_path)
-            if not base64_image:
-                logger.error(f"Failed to encode image: {image_path}")
-                return None
-
             headers = {
                 "Content-Type": "application/json"
             }
@@ -249,7 +262,7 @@ def send_image_to_gemini(
                             {"text": "Describe this image."},
                             {
                                 "inline_data": {
-                                    "mime_type": "image/png",
+                                    "mime_type": mime_type,
                                     "data": base64_image
                                 }
                             }
@@ -266,7 +279,8 @@ def send_image_to_gemini(
 
             start_time = time.time()
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
+                # Retries are handled by the loop above; the session only pools connections
+                resp = sessions.post("gemini", url, headers=headers, json=payload, timeout=timeout, retries=0)
                 logger.info(f"Response status code: {resp.status_code}")
             except requests.exceptions.ConnectionError as e:
                 logger.error(f"Connection error - Is the Gemini API accessible? Error: {e}")
@@ -276,8 +290,8 @@ def send_image_to_gemini(
                 error_text = resp.text if len(resp.text) < 500 else f"{resp.text[:500]}..."
                 logger.error(f"Gemini HTTP error: {resp.status_code} - {error_text}")
                 if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = sessions.backoff_delay(attempt)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
                     continue
                 return None
@@ -316,8 +330,8 @@ def send_image_to_gemini(
         except requests.RequestException as e:
             logger.error(f"Gemini request error (attempt {attempt+1}/{max_retries+1}): {e}")
             if attempt < max_retries:
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
+                wait_time = sessions.backoff_delay(attempt)
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
             else:
                 return None
@@ -351,7 +365,7 @@ def validate_gemini_api_key(api_key: str) -> bool:
 
     try:
         url = f"{GEMINI_API_URL}/models/gemini-2.0-flash:generateContent?key={api_key}"
-        resp = requests.post(url, headers=headers, json=payload, timeout=10)
+        resp = sessions.post("gemini", url, headers=headers, json=payload, timeout=10, retries=0)
         return resp.status_code == 200
     except Exception as e:
         logger.error(f"Error validating Gemini API key: {e}")
@@ -0,0 +1,379 @@
+###############################################################################
+# herd_ai.utils.image_metadata
+#
+# Lossless alt-text metadata for JPEG and PNG files.
+#
+# Alt text is stored the same way embed_alt_text_into_image always stored it:
+# an EXIF UserComment (tag 0x9286, "ASCII" prefixed), plus an XMP
+# dc:description and, for PNG, an iTXt "Description" chunk. Only the header
+# segments (JPEG markers before SOS, PNG chunks before IDAT) are parsed and
+# rewritten; the compressed image data is never decoded.
+#
+# When the rewritten header fits in the space of the old one, the difference
+# is absorbed by XMP packet padding and the header is overwritten in place,
+# so reprocessing a file writes a few kilobytes. Otherwise the new header is
+# written to a temporary file followed by a streamed copy of the untouched
+# compressed data, which then replaces the original.
+###############################################################################
+"""Metadata-only alt text reading and writing for JPEG and PNG images."""
+
+import logging
+import os
+import re
+import shutil
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape, unescape
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+JPEG_SOI = b"\xff\xd8"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+EXIF_HEADER = b"Exif\x00\x00"
+XMP_JPEG_HEADER = b"http://ns.adobe.com/xap/1.0/\x00"
+PNG_XMP_KEYWORD = b"XML:com.adobe.xmp"
+PNG_DESCRIPTION_KEYWORD = b"Description"
+USER_COMMENT_TAG = 0x9286
+USER_COMMENT_PREFIX = b"ASCII\x00\x00\x00"
+# Largest payload of a single JPEG marker segment.
+MAX_JPEG_SEGMENT = 65533
+# Spare bytes left in new XMP packets so later edits can be made in place.
+XMP_PADDING = 2048
+COPY_BLOCK_SIZE = 1024 * 1024
+
+_APP1 = 0xE1
+_APP0 = 0xE0
+_SOS = 0xDA
+_EOI = 0xD9
+
+_XMP_TEMPLATE = (
+    '<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>\n'
+    '<x:xmpmeta xmlns:x="adobe:ns:meta/">'
+    '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+    '{description}'
+    '</rdf:RDF></x:xmpmeta>\n'
+    '<?xpacket end="w"?>'
+)
+_XMP_DESCRIPTION = (
+    '<rdf:Description rdf:about="" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    '<dc:description>{alt}</dc:description>'
+    '</rdf:Description>'
+)
+_XMP_ALT = '<rdf:Alt><rdf:li xml:lang="x-default">{text}</rdf:li></rdf:Alt>'
+_DESCRIPTION_RE = re.compile(r'<dc:description\b[^>]*>(.*?)</dc:description>', re.S)
+_LI_RE = re.compile(r'<rdf:li\b[^>]*>(.*?)</rdf:li>', re.S)
+_TRAILER_RE = re.compile(r'(</x:xmpmeta>)\s*(<\?xpacket end=)')
+
+###############################################################################
+# Format detection and header parsing
+###############################################################################
+def image_kind(path: Union[str, Path]) -> Optional[str]:
+    """Return "jpeg" or "png" from the file's magic bytes, else None."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+    except OSError:
+        return None
+    if head.startswith(JPEG_SOI):
+        return "jpeg"
+    if head == PNG_SIGNATURE:
+        return "png"
+    return None
+
+def _read_jpeg_header(f: BinaryIO) -> Tuple[List[Tuple[int, Optional[bytes]]], int]:
+    """Return the marker segments before SOS and the offset of the SOS marker."""
+    if f.read(2) != JPEG_SOI:
+        raise ValueError("not a JPEG file")
+    segments = []
+    while True:
+        if f.read(1) != b"\xff":
+            raise ValueError("corrupt JPEG marker")
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            raise ValueError("truncated JPEG header")
+        code = marker[0]
+        if code in (_SOS, _EOI):
+            return segments, f.tell() - 2
+        if 0xD0 <= code <= 0xD7 or code == 0x01:
+            segments.append((code, None))
+            continue
+        (length,) = struct.unpack(">H", f.read(2))
+        payload = f.read(length - 2)
+        if len(payload) != length - 2:
+            raise ValueError("truncated JPEG segment")
+        segments.append((code, payload))
+
+def _read_png_header(f: BinaryIO) -> Tuple[List[Tuple[bytes, bytes]], int]:
+    """Return the chunks before the first IDAT and the offset of that IDAT."""
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+    chunks = []
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            raise ValueError("truncated PNG header")
+        length, ctype = struct.unpack(">I4s", head)
+        if ctype in (b"IDAT", b"IEND"):
+            return chunks, f.tell() - 8
+        data = f.read(length)
+        f.read(4)
+        chunks.append((ctype, data))
+
+def _png_text(ctype: bytes, data: bytes) -> Tuple[bytes, Optional[str]]:
+    """Return (keyword, text) for tEXt/zTXt/iTXt chunks."""
+    keyword, _, rest = data.partition(b"\x00")
+    try:
+        if ctype == b"tEXt":
+            return keyword, rest.decode("latin-1")
+        if ctype == b"zTXt":
+            return keyword, zlib.decompress(rest[1:]).decode("latin-1")
+        if ctype == b"iTXt":
+            compressed = rest[:1] == b"\x01"
+            _lang, _, rest = rest[2:].partition(b"\x00")
+            _translated, _, text = rest.partition(b"\x00")
+            if compressed:
+                text = zlib.decompress(text)
+            return keyword, text.decode("utf-8")
+    except (zlib.error, UnicodeDecodeError):
+        pass
+    return keyword, None
+
+def _itxt(keyword: bytes, text: str) -> bytes:
+    return keyword + b"\x00\x00\x00\x00\x00" + text.encode("utf-8")
+
+###############################################################################
+# EXIF and XMP payloads
+###############################################################################
+def _exif_with_comment(existing: Optional[bytes], alt_text: str) -> Optional[bytes]:
+    """EXIF payload ("Exif\\0\\0" + TIFF) with UserComment set, or None without Pillow."""
+    if Image is None:
+        return None
+    exif = Image.Exif()
+    if existing:
+        exif.load(existing)
+    exif[USER_COMMENT_TAG] = USER_COMMENT_PREFIX + alt_text.encode("utf-8")
+    return exif.tobytes()
+
+def _comment_from_exif(payload: bytes) -> Optional[str]:
+    if Image is None or not payload:
+        return None
+    exif = Image.Exif()
+    exif.load(payload)
+    value = exif.get(USER_COMMENT_TAG)
+    if isinstance(value, bytes):
+        if value.startswith(USER_COMMENT_PREFIX):
+            value = value[len(USER_COMMENT_PREFIX):]
+        return value.decode("utf-8", errors="ignore")
+    return str(value) if value else None
+
+def _xmp_with_description(existing: Optional[str], alt_text: str, pad: int) -> str:
+    """Patch dc:description into an XMP packet (or create one), padded by `pad` spaces."""
+    alt = _XMP_ALT.format(text=escape(alt_text))
+    if existing and _DESCRIPTION_RE.search(existing):
+        xmp = _DESCRIPTION_RE.sub(lambda m: f"<dc:description>{alt}</dc:description>", existing, count=1)
+    elif existing and "</rdf:RDF>" in existing:
+        xmp = existing.replace("</rdf:RDF>", _XMP_DESCRIPTION.format(alt=alt) + "</rdf:RDF>", 1)
+    else:
+        xmp = _XMP_TEMPLATE.format(description=_XMP_DESCRIPTION.format(alt=alt))
+    return _TRAILER_RE.sub(lambda m: f"{m.group(1)}\n{' ' * pad}{m.group(2)}", xmp, count=1)
+
+def _description_from_xmp(xmp: str) -> Optional[str]:
+    match = _DESCRIPTION_RE.search(xmp)
+    if not match:
+        return None
+    inner = match.group(1)
+    li = _LI_RE.search(inner)
+    return unescape((li.group(1) if li else inner).strip()) or None
+
+###############################################################################
+# Header rebuilding
+###############################################################################
+def _jpeg_header(segments: List[Tuple[int, Optional[bytes]]], alt_text: str, pad: int) -> bytes:
+    exif_old = xmp_old = None
+    kept = []
+    for code, payload in segments:
+        if code == _APP1 and payload is not None and payload.startswith(EXIF_HEADER) and exif_old is None:
+            exif_old = payload
+        elif code == _APP1 and payload is not None and payload.startswith(XMP_JPEG_HEADER) and xmp_old is None:
+            xmp_old = payload[len(XMP_JPEG_HEADER):].decode("utf-8", errors="replace")
+        else:
+            kept.append((code, payload))
+    exif = _exif_with_comment(exif_old, alt_text) or exif_old
+    xmp = XMP_JPEG_HEADER + _xmp_with_description(xmp_old, alt_text, pad).encode("utf-8")
+    ours = [(_APP1, p) for p in (exif, xmp) if p is not None]
+    if any(len(p) > MAX_JPEG_SEGMENT for _, p in ours):
+        raise ValueError("alt text too large for a JPEG metadata segment")
+    # JFIF/JFXX APP0 segments must stay first
+    split = 0
+    while split < len(kept) and kept[split][0] == _APP0:
+        split += 1
+    out = [JPEG_SOI]
+    for code, payload in kept[:split] + ours + kept[split:]:
+        out.append(bytes((0xFF, code)))
+        if payload is not None:
+            out.append(struct.pack(">H", len(payload) + 2) + payload)
+    return b"".join(out)
+
+def _png_header(chunks: List[Tuple[bytes, bytes]], alt_text: str, pad: int) -> bytes:
+    exif_old = xmp_old = None
+    kept = []
+    for ctype, data in chunks:
+        if ctype == b"eXIf" and exif_old is None:
+            exif_old = EXIF_HEADER + data
+            continue
+        if ctype in (b"tEXt", b"zTXt", b"iTXt"):
+            keyword, text = _png_text(ctype, data)
+            if keyword == PNG_XMP_KEYWORD and xmp_old is None and text is not None:
+                xmp_old = text
+                continue
+            if keyword == PNG_DESCRIPTION_KEYWORD:
+                continue
+        kept.append((ctype, data))
+    exif = _exif_with_comment(exif_old, alt_text) or exif_old
+    ours = []
+    if exif is not None:
+        ours.append((b"eXIf", exif[len(EXIF_HEADER):]))
+    ours.append((b"iTXt", _itxt(PNG_DESCRIPTION_KEYWORD, alt_text)))
+    ours.append((b"iTXt", _itxt(PNG_XMP_KEYWORD, _xmp_with_description(xmp_old, alt_text, pad))))
+    # IHDR must stay first; everything here precedes IDAT as eXIf requires
+    ordered = kept[:1] + ours + kept[1:]
+    out = [PNG_SIGNATURE]
+    for ctype, data in ordered:
+        out.append(struct.pack(">I", len(data)) + ctype + data)
+        out.append(struct.pack(">I", zlib.crc32(ctype + data) & 0xFFFFFFFF))
+    return b"".join(out)
+
+###############################################################################
+# write_alt_text_metadata
+# -----------------------
+# Writes alt text into a JPEG or PNG without re-encoding the image. Returns
+# {"mode": "in_place" | "copy", "bytes_written": n}, or None for other formats.
+###############################################################################
+def write_alt_text_metadata(path: Union[str, Path], alt_text: str) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    kind = image_kind(path)
+    if kind is None:
+        return None
+    with open(path, "rb") as f:
+        if kind == "jpeg":
+            parts, data_offset = _read_jpeg_header(f)
+            build = _jpeg_header
+        else:
+            parts, data_offset = _read_png_header(f)
+            build = _png_header
+    header = build(parts, alt_text, 0)
+    if len(header) <= data_offset:
+        # Grow the XMP padding until the header exactly fills the old one
+        try:
+            padded = build(parts, alt_text, data_offset - len(header))
+        except ValueError:
+            padded = b""
+        if len(padded) == data_offset:
+            with open(path, "r+b") as f:
+                f.write(padded)
+                f.flush()
+                os.fsync(f.fileno())
+            return {"mode": "in_place", "bytes_written": len(padded)}
+    header = build(parts, alt_text, XMP_PADDING)
+    tmp_path = path.with_name(f".{path.name}.herd-tmp")
+    try:
+        with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.write(header)
+            src.seek(data_offset)
+            shutil.copyfileobj(src, dst, COPY_BLOCK_SIZE)
+            written = dst.tell()
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return {"mode": "copy", "bytes_written": written}
+
+###############################################################################
+# read_alt_text_metadata
+# ----------------------
+# Reads alt text from a JPEG or PNG header (EXIF UserComment first, then XMP
+# dc:description, then a PNG Description chunk) without decoding the image.
+###############################################################################
+def read_alt_text_metadata(path: Union[str, Path]) -> Optional[str]:
+    kind = image_kind(path)
+    if kind is None:
+        return None
+    exif = None
+    texts: Dict[bytes, str] = {}
+    with open(path, "rb") as f:
+        if kind == "jpeg":
+            segments, _ = _read_jpeg_header(f)
+            for code, payload in segments:
+                if code != _APP1 or payload is None:
+                    continue
+                if payload.startswith(EXIF_HEADER) and exif is None:
+                    exif = payload
+                elif payload.startswith(XMP_JPEG_HEADER):
+                    texts.setdefault(PNG_XMP_KEYWORD, payload[len(XMP_JPEG_HEADER):].decode("utf-8", errors="replace"))
+        else:
+            chunks, _ = _read_png_header(f)
+            for ctype, data in chunks:
+                if ctype == b"eXIf" and exif is None:
+                    exif = EXIF_HEADER + data
+                elif ctype in (b"tEXt", b"zTXt", b"iTXt"):
+                    keyword, text = _png_text(ctype, data)
+                    if text is not None:
+                        texts.setdefault(keyword, text)
+    comment = _comment_from_exif(exif) if exif else None
+    if comment:
+        return comment
+    if PNG_XMP_KEYWORD in texts:
+        description = _description_from_xmp(texts[PNG_XMP_KEYWORD])
+        if description:
+            return description
+    return texts.get(PNG_DESCRIPTION_KEYWORD) or None
+
+###############################################################################
+# embed_alt_text_bulk
+# -------------------
+# Writes alt text into many images on a thread pool. Formats without a
+# metadata-only writer are passed to `fallback(path, alt_text)` if given.
+# Returns counts of in-place, copied, fallback and failed writes plus the
+# total bytes written by the metadata writer.
+###############################################################################
+def embed_alt_text_bulk(
+    items: Iterable[Tuple[Union[str, Path], str]],
+    workers: int = 4,
+    fallback: Optional[Callable[[Path, str], Any]] = None
+) -> Dict[str, Any]:
+    stats = {"files": 0, "in_place": 0, "copy": 0, "fallback": 0, "errors": 0, "bytes_written": 0}
+    lock = threading.Lock()
+
+    def embed(item: Tuple[Union[str, Path], str]) -> None:
+        path, alt_text = Path(item[0]), item[1]
+        outcome = "errors"
+        written = 0
+        try:
+            info = write_alt_text_metadata(path, alt_text)
+            if info is not None:
+                outcome, written = info["mode"], info["bytes_written"]
+            elif fallback is not None:
+                fallback(path, alt_text)
+                outcome = "fallback"
+        except Exception as e:
+            logger.error(f"Error embedding alt text in {path}: {e}")
+        with lock:
+            stats["files"] += 1
+            stats[outcome] += 1
+            stats["bytes_written"] += written
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(embed, items))
+    return stats
@@ -0,0 +1,166 @@
+###############################################################################
+# herd_ai.utils.imaging
+#
+# Decode-once image handling for the image pipeline.
+#
+# A DecodedImage wraps one image file for the duration of its processing.
+# Dimensions come from the file header, the full-resolution pixels are decoded
+# at most once, and the downscaled RGB thumbnail, its JPEG encoding and the
+# base64 payload sent to AI providers are derived lazily and cached. When the
+# full image has not been decoded, JPEG thumbnails use Pillow's draft mode so
+# libjpeg scales the image down by up to 8x while decoding.
+###############################################################################
+"""Lazily decoded image context shared by the image pipeline and providers."""
+
+import base64
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Images above this many pixels are downscaled before being sent to a provider.
+PAYLOAD_MAX_PIXELS = 4_000_000
+# Bounding box edge used when downscaling provider payloads.
+PAYLOAD_MAX_SIDE = 2000
+PAYLOAD_JPEG_QUALITY = 85
+
+class DecodedImage:
+    """
+    One image file, decoded at most once.
+
+    Use as a context manager, or call close() when done. Accessors are safe
+    to call from several threads; each derived value is computed once.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        if not PIL_AVAILABLE:
+            raise RuntimeError("PIL/Pillow is required for DecodedImage")
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._header = None
+        self._full = None
+        self._thumbnails: Dict[Optional[int], "Image.Image"] = {}
+        self._jpeg: Dict[Optional[int], bytes] = {}
+        self._base64: Dict[Optional[int], str] = {}
+
+    def __enter__(self) -> "DecodedImage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _open_header(self) -> "Image.Image":
+        if self._header is None:
+            self._header = Image.open(self.path)
+        return self._header
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """(width, height) read from the file header, or None if unreadable."""
+        with self._lock:
+            try:
+                return self._open_header().size
+            except Exception:
+                return None
+
+    @property
+    def format(self) -> Optional[str]:
+        with self._lock:
+            try:
+                return self._open_header().format
+            except Exception:
+                return None
+
+    @property
+    def full_image(self) -> "Image.Image":
+        """The full-resolution decoded image (decoded on first access)."""
+        with self._lock:
+            if self._full is None:
+                img = self._open_header()
+                img.load()
+                self._full = img
+            return self._full
+
+    def _target(self, max_side: Optional[int]) -> Optional[Tuple[int, int]]:
+        width, height = self._open_header().size
+        if max_side is None:
+            if width * height <= PAYLOAD_MAX_PIXELS:
+                return None
+            max_side = PAYLOAD_MAX_SIDE
+        elif max(width, height) <= max_side:
+            return None
+        return (max_side, max_side)
+
+    def thumbnail(self, max_side: Optional[int] = None) -> "Image.Image":
+        """
+        RGB (or L) copy bounded for sending to a provider, with transparency
+        flattened onto white. With max_side None, only images larger than
+        PAYLOAD_MAX_PIXELS are shrunk, to fit PAYLOAD_MAX_SIDE.
+        """
+        with self._lock:
+            if max_side in self._thumbnails:
+                return self._thumbnails[max_side]
+            target = self._target(max_side)
+            if self._full is None and target is not None and self.format == "JPEG":
+                # Decode straight to a reduced size; the header image is left untouched.
+                img = Image.open(self.path)
+                img.draft("RGB", target)
+                img.load()
+            else:
+                img = self.full_image
+            img = _flatten(img)
+            if target is not None:
+                if img is self._full:
+                    img = img.copy()
+                img.thumbnail(target, Image.Resampling.LANCZOS)
+            self._thumbnails[max_side] = img
+            return img
+
+    def jpeg_bytes(self, max_side: Optional[int] = None) -> bytes:
+        """JPEG encoding of thumbnail(max_side)."""
+        with self._lock:
+            data = self._jpeg.get(max_side)
+            if data is None:
+                buffer = io.BytesIO()
+                self.thumbnail(max_side).save(buffer, format="JPEG", quality=PAYLOAD_JPEG_QUALITY)
+                data = self._jpeg[max_side] = buffer.getvalue()
+            return data
+
+    def base64(self, max_side: Optional[int] = None) -> str:
+        """Base64 of jpeg_bytes(max_side), as sent in provider payloads."""
+        with self._lock:
+            data = self._base64.get(max_side)
+            if data is None:
+                data = self._base64[max_side] = base64.b64encode(self.jpeg_bytes(max_side)).decode("utf-8")
+            return data
+
+    def close(self) -> None:
+        """Release decoded pixels and the open file handle."""
+        with self._lock:
+            if self._header is not None:
+                self._header.close()
+            self._header = self._full = None
+            self._thumbnails.clear()
+            self._jpeg.clear()
+            self._base64.clear()
+
+def _flatten(img: "Image.Image") -> "Image.Image":
+    """Return img as RGB or L, compositing any alpha channel onto white."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[3])
+        return background
+    if img.mode not in ("RGB", "L"):
+        return img.convert("RGB")
+    return img
@@ -7,72 +7,71 @@
 #
 # Accessibility: All generated markdown is structured for screen readers.
 #                File renaming and metadata extraction are robust and logged.
+#
+# ffprobe results come from the persistent media index (media_index.py):
+# files are probed concurrently, once per (path, size, mtime), and batches of
+# files should be handed to get_media_info_many / MediaProcessor.process_many
+# so they are probed together.
 ###############################################################################
 
 import os
 import logging
-import subprocess
 import gc
-import json
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Union, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Union, Any
 from datetime import datetime
 
 from cleanupx.config import MEDIA_EXTENSIONS
 from cleanupx.utils.common import (
-    get_media_dimensions,
-    get_media_duration,
     format_duration,
     strip_media_suffixes
 )
 from cleanupx.processors.base import BaseProcessor
 from cleanupx.utils.cache import save_cache, ensure_metadata_dir, get_description_path
 
+try:
+    from herd_ai.utils.media_index import probe_many
+except ImportError:
+    try:
+        from llamacleaner.utils.media_index import probe_many
+    except ImportError:
+        from utils.media_index import probe_many
+
 logger = logging.getLogger(__name__)
 
 ###############################################################################
-# get_media_info
-# --------------
-# Uses ffprobe to extract duration, resolution, format, and size from a media
-# file. Returns a dictionary with the extracted metadata or error information.
+# get_media_info / get_media_info_many
+# ------------------------------------
+# Extract duration, resolution, format, and size from media files via the
+# media index, probing unindexed files with ffprobe concurrently. Each result
+# is a dictionary with the extracted metadata or error information.
 ###############################################################################
-def get_media_info(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
-    file_path = Path(file_path)
-    result = {
-        "duration": None,
-        "width": None,
-        "height": None,
-        "format": None,
-        "size": None,
-        "error": None
-    }
+def get_media_info_many(
+    file_paths: Iterable[Union[str, Path]],
+    workers: Optional[int] = None
+) -> Dict[Path, Dict[str, Any]]:
+    file_paths = [Path(p) for p in file_paths]
+    results = {}
     try:
-        result["size"] = file_path.stat().st_size
-        result["format"] = file_path.suffix.lower()
-        cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            str(file_path)
-        ]
-        process = subprocess.run(cmd, capture_output=True, text=True)
-        if process.returncode == 0:
-            info = json.loads(process.stdout)
-            if "format" in info and "duration" in info["format"]:
-                result["duration"] = format_duration(float(info["format"]["duration"]))
-            for stream in info.get("streams", []):
-                if stream.get("codec_type") == "video":
-                    result["width"] = stream.get("width")
-                    result["height"] = stream.get("height")
-                    break
-        else:
-            result["error"] = f"ffprobe failed: {process.stderr}"
+        probed = probe_many(file_paths, workers=workers)["results"]
     except Exception as e:
-        logger.error(f"Error analyzing media file {file_path}: {e}")
-        result["error"] = str(e)
-    return result
+        logger.error(f"Error analyzing media files: {e}")
+        probed = {p: {"error": str(e)} for p in file_paths}
+    for file_path in file_paths:
+        info = probed.get(file_path, {})
+        results[file_path] = {
+            "duration": format_duration(info["duration"]) if info.get("duration") is not None else None,
+            "width": info.get("width"),
+            "height": info.get("height"),
+            "format": file_path.suffix.lower(),
+            "size": info.get("size"),
+            "error": info.get("error")
+        }
+    return results
+
+def get_media_info(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    file_path = Path(file_path)
+    return get_media_info_many([file_path], workers=1)[file_path]
 
 ###############################################################################
 # format_duration
@@ -137,6 +136,35 @@ class MediaProcessor(BaseProcessor):
         super().__init__()
         self.supported_extensions = MEDIA_EXTENSIONS
         self.max_size_mb = 100.0
+        # ffprobe results for files prefetched by process_many, by path
+        self._probed: Dict[str, Dict[str, Any]] = {}
+
+    ###########################################################################
+    # process_many
+    # ------------
+    # Processes a batch of media files, probing all of them up front on a
+    # bounded pool (answered from the media index where possible) instead of
+    # spawning ffprobe file by file. Returns one process() result per file.
+    ###########################################################################
+    def process_many(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        cache: Dict[str, Any],
+        rename_log: Optional[Dict] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict]:
+        file_paths = [Path(p) for p in file_paths]
+        candidates = [p for p in file_paths if str(p) not in cache and self.can_process(p)]
+        if candidates:
+            try:
+                probed = probe_many(candidates, workers=workers)["results"]
+                self._probed.update((str(p), info) for p, info in probed.items())
+            except Exception as e:
+                logger.error(f"Error probing media files: {e}")
+        try:
+            return [self.process(p, cache, rename_log) for p in file_paths]
+        finally:
+            self._probed.clear()
 
     ###########################################################################
     # process
@@ -205,8 +233,13 @@ class MediaProcessor(BaseProcessor):
             if cache_key in cache:
                 logger.info(f"Using cached description for {file_path.name}")
                 return cache[cache_key]
-            dimensions = get_media_dimensions(file_path)
-            duration = get_media_duration(file_path)
+            info = self._probed.get(cache_key)
+            if info is None:
+                info = probe_many([file_path], workers=1)["results"][file_path]
+            if info.get("error"):
+                logger.warning(f"ffprobe could not read {file_path.name}: {info['error']}")
+            dimensions = f"{info['width']}x{info['height']}" if info.get("width") and info.get("height") else "Unknown"
+            duration = info.get("duration") or 0
             file_stats = file_path.stat()
             file_size_mb = file_stats.st_size / (1024 * 1024)
             modified_time = datetime.fromtimestamp(file_stats.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
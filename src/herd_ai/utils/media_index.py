@@ -0,0 +1,303 @@
+###############################################################################
+# herd_ai.utils.media_index
+#
+# Persistent, concurrently filled index of audio/video metadata.
+#
+# Media metadata comes from ffprobe, one process per file, which dominates the
+# cost of handling large media libraries. probe_many() answers every file
+# whose (path, size, mtime) is already in the index without spawning
+# anything, and probes the rest on a bounded pool of MEDIA_PROBE_WORKERS
+# threads (each waits on its own ffprobe process). Results are written back
+# to CACHE_DIR/media_index.sqlite3 every MEDIA_INDEX_FLUSH_EVERY probes, so an
+# interrupted run keeps what it finished. A file that is modified or
+# replaced no longer matches its entry and is probed again. Files ffprobe
+# cannot read are indexed too; failures to run ffprobe at all, and probes
+# that time out (e.g. on a slow network share), are not.
+###############################################################################
+"""ffprobe metadata for media files with a persistent (path, size, mtime) index."""
+
+import atexit
+import json
+import logging
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+try:
+    from herd_ai.config import (
+        CACHE_DIR, FFPROBE_PATH, MEDIA_PROBE_WORKERS, MEDIA_PROBE_TIMEOUT, MEDIA_INDEX_FLUSH_EVERY
+    )
+except ImportError:
+    try:
+        from llamacleaner.config import (
+            CACHE_DIR, FFPROBE_PATH, MEDIA_PROBE_WORKERS, MEDIA_PROBE_TIMEOUT, MEDIA_INDEX_FLUSH_EVERY
+        )
+    except ImportError:
+        from config import (
+            CACHE_DIR, FFPROBE_PATH, MEDIA_PROBE_WORKERS, MEDIA_PROBE_TIMEOUT, MEDIA_INDEX_FLUSH_EVERY
+        )
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "media_index.sqlite3"
+# Bump when probe() records different fields, so old entries are re-probed.
+PROBE_VERSION = 1
+# Host parameters per SELECT when looking up many paths at once.
+_LOOKUP_CHUNK = 500
+
+class MediaIndex:
+    """
+    Metadata for media files keyed by resolved path, valid while the file's
+    size and mtime are unchanged.
+
+    Use get_media_index() to share one instance per process. If the index
+    file cannot be created, the index is kept in memory for the life of the
+    instance.
+    """
+
+    def __init__(self, index_path: Union[str, Path]):
+        self.path = Path(index_path)
+        self._lock = threading.RLock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Media index unavailable at {self.path} ({e}); keeping it in memory")
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS media (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                probed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+
+    def lookup(self, keys: Dict[str, tuple]) -> Dict[str, Dict[str, Any]]:
+        """
+        Entries still valid for the given files.
+
+        Args:
+            keys: {resolved path: (size, mtime_ns)} as currently on disk.
+
+        Returns:
+            {resolved path: metadata} for the paths whose entry matches.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        paths = list(keys)
+        with self._lock:
+            for start in range(0, len(paths), _LOOKUP_CHUNK):
+                chunk = paths[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT path, size, mtime_ns, version, data FROM media "
+                    f"WHERE path IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for path, size, mtime_ns, version, data in rows:
+                    if (size, mtime_ns) == keys[path] and version == PROBE_VERSION:
+                        found[path] = json.loads(data)
+        return found
+
+    def store(self, entries: Iterable[tuple]) -> None:
+        """Write (resolved path, size, mtime_ns, metadata) entries in one transaction."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO media(path, size, mtime_ns, version, data, probed) VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, size, mtime_ns, PROBE_VERSION, json.dumps(data), now) for path, size, mtime_ns, data in entries],
+            )
+
+    def forget(self, paths: Iterable[Union[str, Path]]) -> int:
+        """Drop entries for the given paths. Returns the number removed."""
+        keys = [(str(Path(p).resolve()),) for p in paths]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM media WHERE path = ?", keys)
+            return self._conn.total_changes - before
+
+    def prune(self) -> int:
+        """Drop entries whose file no longer exists. Returns the number removed."""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM media")]
+        return self.forget(p for p in paths if not Path(p).exists())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_index: Optional[MediaIndex] = None
+_index_lock = threading.Lock()
+
+def get_media_index() -> MediaIndex:
+    """Shared MediaIndex in CACHE_DIR."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MediaIndex(Path(CACHE_DIR) / INDEX_FILE_NAME)
+            atexit.register(_index.close)
+        return _index
+
+def _number(value: Any, kind: type = float) -> Optional[Any]:
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+def probe(path: Union[str, Path], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run ffprobe on one file and summarize its output.
+
+    Returns a dictionary with duration (seconds), width, height, format_name,
+    video_codec, audio_codec, bit_rate, title and error (None on success).
+    Raises OSError if ffprobe itself cannot be run, and
+    subprocess.TimeoutExpired if it does not finish within `timeout`
+    (default MEDIA_PROBE_TIMEOUT).
+    """
+    info: Dict[str, Any] = {
+        "duration": None, "width": None, "height": None, "format_name": None,
+        "video_codec": None, "audio_codec": None, "bit_rate": None, "title": None, "error": None,
+    }
+    cmd = [FFPROBE_PATH, "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", str(path)]
+    process = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout or MEDIA_PROBE_TIMEOUT)
+    if process.returncode != 0:
+        info["error"] = f"ffprobe failed: {process.stderr.strip() or process.returncode}"
+        return info
+    try:
+        data = json.loads(process.stdout or "{}")
+    except ValueError as e:
+        info["error"] = f"invalid ffprobe output: {e}"
+        return info
+    fmt = data.get("format", {})
+    info["duration"] = _number(fmt.get("duration"))
+    info["format_name"] = fmt.get("format_name")
+    info["bit_rate"] = _number(fmt.get("bit_rate"), int)
+    info["title"] = (fmt.get("tags") or {}).get("title")
+    for stream in data.get("streams", []):
+        if stream.get("codec_type") == "video" and info["video_codec"] is None:
+            info["video_codec"] = stream.get("codec_name")
+            info["width"] = stream.get("width")
+            info["height"] = stream.get("height")
+            if info["duration"] is None:
+                info["duration"] = _number(stream.get("duration"))
+        elif stream.get("codec_type") == "audio" and info["audio_codec"] is None:
+            info["audio_codec"] = stream.get("codec_name")
+            if info["duration"] is None:
+                info["duration"] = _number(stream.get("duration"))
+    return info
+
+def probe_many(
+    paths: Iterable[Union[str, Path]],
+    workers: Optional[int] = None,
+    force: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Metadata for many media files, from the index where possible.
+
+    Files are keyed by resolved path, size and mtime; matching index entries
+    are returned without running ffprobe, and the remaining files are probed
+    on up to `workers` threads (default MEDIA_PROBE_WORKERS). `force`
+    re-probes every file. `progress(done, total)` is called as probes finish.
+    "failed" counts every file whose metadata has an error, indexed or not.
+
+    Returns:
+        {"results": {path as given: metadata (see probe) plus "size"},
+         "stats": {"files", "indexed", "probed", "failed", "missing"}}
+    """
+    paths = list(paths)
+    stats = {"files": len(paths), "indexed": 0, "probed": 0, "failed": 0, "missing": 0}
+    results: Dict[Any, Dict[str, Any]] = {}
+    keys: Dict[str, tuple] = {}
+    resolved: Dict[Any, str] = {}
+    for path in paths:
+        try:
+            key = str(Path(path).resolve())
+            st = Path(key).stat()
+        except OSError as e:
+            stats["missing"] += 1
+            results[path] = {"error": f"not found: {e}", "size": None}
+            continue
+        resolved[path] = key
+        keys[key] = (st.st_size, st.st_mtime_ns)
+
+    index = get_media_index()
+    known = {} if force else index.lookup(keys)
+    stats["indexed"] = len(known)
+    stats["failed"] = sum(info.get("error") is not None for info in known.values())
+    pending = [key for key in keys if key not in known]
+
+    if pending:
+        workers = max(1, min(workers or MEDIA_PROBE_WORKERS, len(pending)))
+        unbuffered: List[tuple] = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(probe, key): key for key in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                try:
+                    info = future.result()
+                except OSError as e:
+                    # ffprobe missing or not runnable: report, but do not index
+                    stats["failed"] += 1
+                    known[key] = {"error": f"could not run {FFPROBE_PATH}: {e}"}
+                except subprocess.TimeoutExpired:
+                    # Possibly transient (slow or busy storage): retry next run
+                    stats["failed"] += 1
+                    known[key] = {"error": "ffprobe timed out"}
+                else:
+                    stats["probed"] += 1
+                    stats["failed"] += info["error"] is not None
+                    known[key] = info
+                    unbuffered.append((key, *keys[key], info))
+                    if len(unbuffered) >= MEDIA_INDEX_FLUSH_EVERY:
+                        index.store(unbuffered)
+                        unbuffered = []
+                if progress:
+                    progress(done, len(pending))
+        if unbuffered:
+            index.store(unbuffered)
+
+    for path, key in resolved.items():
+        results[path] = dict(known[key], size=keys[key][0])
+    return {"results": {path: results[path] for path in paths}, "stats": stats}
+
+def format_duration(seconds: Optional[float]) -> str:
+    """HH:MM:SS, or MM:SS under an hour; "" when unknown."""
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    hours, minutes = divmod(seconds // 60, 60)
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds % 60:02d}"
+    return f"{minutes:02d}:{seconds % 60:02d}"
+
+def describe_media(path: Union[str, Path], info: Dict[str, Any]) -> str:
+    """Short plain-text description of a media file's metadata, e.g. as a rename sample."""
+    lines = [f"Media file: {Path(path).name}"]
+    if info.get("title"):
+        lines.append(f"Title: {info['title']}")
+    if info.get("duration") is not None:
+        lines.append(f"Duration: {format_duration(info['duration'])}")
+    if info.get("width") and info.get("height"):
+        lines.append(f"Resolution: {info['width']}x{info['height']}")
+    if info.get("video_codec"):
+        lines.append(f"Video codec: {info['video_codec']}")
+    if info.get("audio_codec"):
+        lines.append(f"Audio codec: {info['audio_codec']}")
+    if info.get("format_name"):
+        lines.append(f"Container: {info['format_name']}")
+    return "\n".join(lines)
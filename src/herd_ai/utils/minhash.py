@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+===============================================================================
+ Herd AI MinHash / LSH Utilities
+===============================================================================
+
+Near-duplicate candidate search for text. Each document is reduced to a set
+of word shingles over normalized text, summarized by a fixed-size MinHash
+signature, and bucketed with banded locality-sensitive hashing so that pairs
+likely to exceed a Jaccard threshold are found without comparing every pair.
+
+Candidates are only likely matches; callers verify them with their own scorer.
+NumPy is used for signatures when installed, with a pure Python fallback that
+produces identical values.
+
+===============================================================================
+"""
+
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Prime just above 2**32; shingle hashes are 32-bit so a * h + b stays below 2**64.
+_PRIME = (1 << 32) + 15
+_MAX_COEFFICIENT = (1 << 32) - 1
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+
+def normalize_text(text: str) -> str:
+    """
+    ============================================================================
+    Normalize Text for Shingling
+    ============================================================================
+    Lowercases, strips markdown punctuation and collapses whitespace, matching
+    the normalization used for dedupe content hashes.
+    """
+    normalized = re.sub(r'[#*_`\[\]\(\)\{\}]', '', text.lower())
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+def shingle_hashes(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[int]:
+    """
+    ============================================================================
+    Hash Word Shingles
+    ============================================================================
+    Returns 32-bit CRC hashes of every run of `size` consecutive words in the
+    normalized text. Texts shorter than one shingle hash as a single shingle.
+    """
+    words = normalize_text(text).split(' ')
+    if len(words) < size:
+        joined = ' '.join(words)
+        return {zlib.crc32(joined.encode('utf-8'))} if joined else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+class MinHasher:
+    """
+    ===========================================================================
+    MinHash Signature Generator
+    ===========================================================================
+    Produces `num_perm` minimum hash values per document from a fixed, seeded
+    family of universal hash functions, so signatures are stable across runs
+    and processes.
+    """
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._a = [rng.randint(1, _MAX_COEFFICIENT - 1) for _ in range(num_perm)]
+        self._b = [rng.randint(0, _MAX_COEFFICIENT - 1) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._np_a = np.array(self._a, dtype=np.uint64)
+            self._np_b = np.array(self._b, dtype=np.uint64)
+
+    def signature_from_hashes(self, hashes: Iterable[int]) -> Tuple[int, ...]:
+        hashes = list(hashes)
+        if not hashes:
+            return tuple([_PRIME] * self.num_perm)
+        if NUMPY_AVAILABLE:
+            result = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+            # Chunk to bound the (shingles x num_perm) intermediate array.
+            for start in range(0, len(hashes), 4096):
+                hv = np.array(hashes[start:start + 4096], dtype=np.uint64)[:, None]
+                values = (hv * self._np_a + self._np_b) % np.uint64(_PRIME)
+                result = np.minimum(result, values.min(axis=0))
+            return tuple(int(v) for v in result)
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        return self.signature_from_hashes(shingle_hashes(text, self.shingle_size))
+
+def estimate_jaccard(sig1: Sequence[int], sig2: Sequence[int]) -> float:
+    """
+    ============================================================================
+    Estimate Jaccard Similarity
+    ============================================================================
+    Returns the fraction of signature positions on which two MinHash
+    signatures agree.
+    """
+    if not sig1 or len(sig1) != len(sig2):
+        return 0.0
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    ============================================================================
+    Choose LSH Band Layout
+    ============================================================================
+    Picks (bands, rows) with bands * rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to the requested threshold.
+    """
+    best = (num_perm, 1)
+    best_error = float('inf')
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+class LSHIndex:
+    """
+    ===========================================================================
+    Banded LSH Index
+    ===========================================================================
+    Buckets MinHash signatures by band. Any two keys sharing a bucket in at
+    least one band are candidate near-duplicates.
+    """
+    def __init__(self, threshold: float = 0.5, num_perm: int = DEFAULT_NUM_PERM):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: Sequence[int]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, tuple(signature[start:start + self.rows])
+
+    def add(self, key: Hashable, signature: Sequence[int]) -> None:
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Signature has {len(signature)} values, expected {self.num_perm}")
+        self._signatures[key] = tuple(signature)
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: Sequence[int]) -> Set[Hashable]:
+        """Return keys sharing at least one band bucket with the signature."""
+        found: Set[Hashable] = set()
+        for band, band_key in self._band_keys(signature):
+            found.update(self._buckets[band].get(band_key, ()))
+        return found
+
+    def candidate_pairs(self, max_bucket: Optional[int] = None) -> Set[Tuple[Any, Any]]:
+        """
+        Return all candidate pairs as (a, b) with a < b. Buckets larger than
+        max_bucket (if set) are skipped to bound the output on degenerate data.
+        """
+        pairs: Set[Tuple[Any, Any]] = set()
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                if len(keys) < 2 or (max_bucket and len(keys) > max_bucket):
+                    continue
+                ordered = sorted(keys)
+                for i, a in enumerate(ordered):
+                    for b in ordered[i + 1:]:
+                        pairs.add((a, b))
+        return pairs
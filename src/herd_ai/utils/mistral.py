@@ -18,6 +18,11 @@ from rich.console import Console
 import io
 from PIL import Image
 
+try:
+    from herd_ai.utils import sessions
+except ImportError:
+    import utils.sessions as sessions
+
 # Initialize console for rich output
 console = Console()
 
@@ -94,7 +99,7 @@ def process_with_mistral(
         payload["max_tokens"] = max_tokens
 
     try:
-        response = requests.post(api_url, headers=headers, json=payload)
+        response = sessions.post("mistral", api_url, headers=headers, json=payload)
         response.raise_for_status()
         result = response.json()
         
@@ -126,7 +131,8 @@ def process_image_with_mistral(
     model: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: Optional[int] = None,
-    top_p: float = 1.0
+    top_p: float = 1.0,
+    base64_image: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Process an image with Mistral AI API.
@@ -138,6 +144,8 @@ def process_image_with_mistral(
         temperature: Controls randomness (0.0 to 1.0)
         max_tokens: Maximum number of tokens to generate
         top_p: Controls diversity via nucleus sampling
+        base64_image: Pre-encoded JPEG payload (at most 1024px per side);
+            when given the file is not re-read
 
     Returns:
         Dict with text response and metadata
@@ -156,30 +164,31 @@ def process_image_with_mistral(
         "Content-Type": "application/json"
     }
 
-    # Load and encode the image
-    try:
-        image_path = Path(image_path)
-        if not image_path.exists():
-            return {"text": f"Error: Image file not found: {image_path}", "error": True}
-
-        # Encode image to base64
-        with Image.open(image_path) as img:
-            # Resize image if it's too large (Mistral might have size limits)
-            if img.width > 1024 or img.height > 1024:
-                ratio = min(1024/img.width, 1024/img.height)
-                new_size = (int(img.width * ratio), int(img.height * ratio))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
+    # Load and encode the image unless the caller already has a payload
+    if base64_image is None:
+        try:
+            image_path = Path(image_path)
+            if not image_path.exists():
+                return {"text": f"Error: Image file not found: {image_path}", "error": True}
+
+            # Encode image to base64
+            with Image.open(image_path) as img:
+                # Resize image if it's too large (Mistral might have size limits)
+                if img.width > 1024 or img.height > 1024:
+                    ratio = min(1024/img.width, 1024/img.height)
+                    new_size = (int(img.width * ratio), int(img.height * ratio))
+                    img = img.resize(new_size, Image.Resampling.LANCZOS)
             
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+                # Convert to RGB if needed
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
             
-            # Encode to base64
-            buffer = io.BytesIO()
-            img.save(buffer, format="JPEG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    except Exception as e:
-        return {"text": f"Error processing image: {str(e)}", "error": True}
+                # Encode to base64
+                buffer = io.BytesIO()
+                img.save(buffer, format="JPEG")
+                base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        except Exception as e:
+            return {"text": f"Error processing image: {str(e)}", "error": True}
 
     # Prepare the content with image
     content = [
@@ -200,7 +209,7 @@ def process_image_with_mistral(
         payload["max_tokens"] = max_tokens
 
     try:
-        response = requests.post(api_url, headers=headers, json=payload)
+        response = sessions.post("mistral", api_url, headers=headers, json=payload)
         response.raise_for_status()
         result = response.json()
         
@@ -321,7 +330,7 @@ def list_mistral_models() -> List[Dict[str, Any]]:
     }
 
     try:
-        response = requests.get(api_url, headers=headers)
+        response = sessions.get("mistral", api_url, headers=headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
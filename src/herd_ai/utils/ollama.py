@@ -15,6 +15,11 @@ import psutil
 import requests
 from typing import Dict, List, Optional, Tuple, Union, Any
 
+try:
+    from herd_ai.utils import sessions
+except ImportError:
+    import utils.sessions as sessions
+
 logger = logging.getLogger(__name__)
 
 # Default Ollama API endpoint
@@ -51,7 +56,7 @@ def get_ollama_url() -> str:
 def check_ollama_running() -> bool:
     """Check if Ollama is running by pinging the API endpoint."""
     try:
-        response = requests.get(f"{OLLAMA_API_URL}", timeout=2)
+        response = sessions.get("ollama", f"{OLLAMA_API_URL}", timeout=2, retries=0)
         return response.status_code == 200
     except requests.RequestException:
         return False
@@ -64,7 +69,7 @@ def get_available_models() -> List[Dict[str, Any]]:
         List of dictionaries containing model information
     """
     try:
-        response = requests.get(f"{OLLAMA_API_URL}/api/tags", timeout=5)
+        response = sessions.get("ollama", f"{OLLAMA_API_URL}/api/tags", timeout=5, retries=0)
         if response.status_code == 200:
             data = response.json()
             return data.get("models", [])
@@ -87,8 +92,9 @@ def get_model_details(model_name: str) -> Optional[Dict[str, Any]]:
     """
     try:
         payload = {"name": model_name}
-        response = requests.post(
-            f"{OLLAMA_API_URL}/api/show", 
+        response = sessions.post(
+            "ollama",
+            f"{OLLAMA_API_URL}/api/show",
             json=payload,
             timeout=5
         )
@@ -150,10 +156,11 @@ def send_prompt_to_ollama(
             payload["messages"].insert(0, {"role": "system", "content": system_prompt})
             
         # Send request to Ollama API
-        response = requests.post(
-            f"{OLLAMA_API_URL}/api/chat", 
+        response = sessions.post(
+            "ollama",
+            f"{OLLAMA_API_URL}/api/chat",
             json=payload,
-            timeout=60 if not stream else None,
+            timeout=60 if not stream else (10, None),
             stream=stream
         )
         
@@ -194,7 +201,8 @@ def send_image_prompt_to_ollama(
     model: Optional[str] = None,
     max_tokens: int = 2048,
     temperature: float = 0.7,
-    system_prompt: Optional[str] = None
+    system_prompt: Optional[str] = None,
+    base64_image: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Send an image and prompt to Ollama API and get a response.
@@ -206,6 +214,7 @@ def send_image_prompt_to_ollama(
         max_tokens: Maximum number of tokens to generate
         temperature: Sampling temperature (0.0 to 1.0)
         system_prompt: Optional system instructions for the model
+        base64_image: Pre-encoded image payload; when given the file is not re-read
         
     Returns:
         Dictionary with model response data
@@ -224,13 +233,14 @@ def send_image_prompt_to_ollama(
             return {"text": f"Error: Image file not found: {image_path}", "error": True, "as_text": True}
             
         # Read the image file and encode it as base64
-        import base64
-        try:
-            with open(image_path, "rb") as img_file:
-                base64_image = base64.b64encode(img_file.read()).decode("utf-8")
-        except Exception as e:
-            logger.error(f"Error reading image file: {e}")
-            return {"text": f"Error reading image file: {str(e)}", "error": True, "as_text": True}
+        if base64_image is None:
+            import base64
+            try:
+                with open(image_path, "rb") as img_file:
+                    base64_image = base64.b64encode(img_file.read()).decode("utf-8")
+            except Exception as e:
+                logger.error(f"Error reading image file: {e}")
+                return {"text": f"Error reading image file: {str(e)}", "error": True, "as_text": True}
             
         # First try using the chat endpoint with the proper format (recommended in Ollama docs)
         try:
@@ -252,8 +262,9 @@ def send_image_prompt_to_ollama(
                 chat_payload["messages"].insert(0, {"role": "system", "content": system_prompt})
             
             logger.info(f"Sending image to Ollama via chat API: {model}")
-            response = requests.post(
-                f"{OLLAMA_API_URL}/api/chat", 
+            response = sessions.post(
+                "ollama",
+                f"{OLLAMA_API_URL}/api/chat",
                 json=chat_payload,
                 timeout=90  # Images may take longer to process
             )
@@ -293,8 +304,9 @@ def send_image_prompt_to_ollama(
             generate_payload["system"] = system_prompt
             
         logger.info(f"Sending image to Ollama via generate API: {model}")
-        response = requests.post(
-            f"{OLLAMA_API_URL}/api/generate", 
+        response = sessions.post(
+            "ollama",
+            f"{OLLAMA_API_URL}/api/generate",
             json=generate_payload,
             timeout=90  # Images may take longer to process
         )
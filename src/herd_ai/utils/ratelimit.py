@@ -0,0 +1,119 @@
+###############################################################################
+# herd_ai.utils.ratelimit
+#
+# Thread-safe request and token rate limiting for AI provider calls.
+#
+# A RateLimiter holds two token buckets, one counting requests per minute and
+# one counting estimated tokens per minute. Worker threads call acquire()
+# before each request and block until both buckets have room, so a pool of
+# concurrent workers stays within a provider's published limits.
+###############################################################################
+"""Rate limiting for concurrent AI provider requests."""
+
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from herd_ai.config import PROVIDER_RATE_LIMITS, PROVIDER_TOKEN_BUDGETS
+except ImportError:
+    try:
+        from llamacleaner.config import PROVIDER_RATE_LIMITS, PROVIDER_TOKEN_BUDGETS
+    except ImportError:
+        PROVIDER_RATE_LIMITS = {}
+        PROVIDER_TOKEN_BUDGETS = {}
+
+# Rough characters-per-token ratio used when no tokenizer is available.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a prompt from its length."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+class _Bucket:
+    """Token bucket refilled continuously at `per_minute / 60` units a second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # Requests larger than the whole budget are let through once the bucket is full.
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+class RateLimiter:
+    """
+    Blocking limiter for requests per minute and tokens per minute.
+
+    Either limit may be zero or None to disable it. The limiter is shared by
+    all worker threads talking to one provider.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute or 0
+        self.tokens_per_minute = tokens_per_minute or 0
+        self._requests = _Bucket(self.requests_per_minute) if self.requests_per_minute > 0 else None
+        self._tokens = _Bucket(self.tokens_per_minute) if self.tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests is not None or self._tokens is not None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request of `tokens` estimated tokens may be sent.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = 0.0
+                if self._requests is not None:
+                    delay = max(delay, self._requests.wait_time(1, now))
+                if self._tokens is not None and tokens:
+                    delay = max(delay, self._tokens.wait_time(tokens, now))
+                if delay <= 0:
+                    if self._requests is not None:
+                        self._requests.take(1)
+                    if self._tokens is not None and tokens:
+                        self._tokens.take(tokens)
+                    self.waited += waited
+                    return waited
+            time.sleep(delay)
+            waited += delay
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """Return the shared limiter for a provider, configured from herd_ai.config."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = RateLimiter(
+                PROVIDER_RATE_LIMITS.get(provider, 0),
+                PROVIDER_TOKEN_BUDGETS.get(provider, 0)
+            )
+            _limiters[provider] = limiter
+        return limiter
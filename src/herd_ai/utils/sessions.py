@@ -0,0 +1,217 @@
+###############################################################################
+# herd_ai.utils.sessions
+#
+# Pooled HTTP sessions for AI provider clients.
+#
+# Each provider gets one requests.Session with a keep-alive connection pool,
+# so repeated prompts reuse TCP/TLS connections instead of opening a new one
+# per request. request() adds default timeouts, retries transient failures
+# (connection errors, timeouts, 429 and 5xx responses) with jittered
+# exponential backoff, and records per-provider request, retry, latency and
+# connection reuse statistics.
+###############################################################################
+"""Shared HTTP sessions with pooling, retries and stats for provider clients."""
+
+import atexit
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from herd_ai.config import (
+        HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+        HTTP_MAX_RETRIES, HTTP_BACKOFF_SECONDS
+    )
+except ImportError:
+    try:
+        from llamacleaner.config import (
+            HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+            HTTP_MAX_RETRIES, HTTP_BACKOFF_SECONDS
+        )
+    except ImportError:
+        HTTP_POOL_SIZE = 16
+        HTTP_CONNECT_TIMEOUT = 10.0
+        HTTP_READ_TIMEOUT = 120.0
+        HTTP_MAX_RETRIES = 2
+        HTTP_BACKOFF_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Upper bound on a single backoff sleep, including server Retry-After hints.
+MAX_BACKOFF_SECONDS = 60.0
+
+Timeout = Union[float, Tuple[float, float], None]
+
+class _ProviderStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+_sessions: Dict[str, requests.Session] = {}
+_stats: Dict[str, _ProviderStats] = {}
+_lock = threading.Lock()
+
+def get_session(provider: str) -> requests.Session:
+    """Return the pooled session for a provider, creating it on first use."""
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Connection": "keep-alive"})
+            _sessions[provider] = session
+            _stats[provider] = _ProviderStats()
+        return session
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF_SECONDS) -> float:
+    """Full-jitter exponential backoff: a random delay in [0, base * 2**attempt]."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base * (2 ** attempt)))
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(MAX_BACKOFF_SECONDS, max(0.0, float(value)))
+    except ValueError:
+        return None
+
+def request(
+    provider: str,
+    method: str,
+    url: str,
+    timeout: Timeout = None,
+    retries: Optional[int] = None,
+    **kwargs: Any
+) -> requests.Response:
+    """
+    Send an HTTP request through the provider's pooled session.
+
+    Args:
+        provider: Provider name used to select the session and stats bucket
+        method: HTTP method, e.g. "GET" or "POST"
+        url: Request URL
+        timeout: Seconds or a (connect, read) tuple; defaults to the
+            configured connect/read timeouts
+        retries: Retries for transient failures (default: HTTP_MAX_RETRIES)
+        **kwargs: Passed through to requests.Session.request
+
+    Returns:
+        The final response. Non-retryable error statuses are returned as-is;
+        a retryable status is returned once retries are exhausted.
+
+    Raises:
+        requests.RequestException: If the last attempt failed to connect or
+        timed out.
+    """
+    session = get_session(provider)
+    stats = _stats[provider]
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    retries = HTTP_MAX_RETRIES if retries is None else max(0, retries)
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _record(stats, time.perf_counter() - start, failed=True)
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{provider} request failed ({e}); retrying in {delay:.1f}s")
+        else:
+            _record(stats, time.perf_counter() - start, failed=response.status_code >= 400)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            logger.warning(f"{provider} returned HTTP {response.status_code}; retrying in {delay:.1f}s")
+            response.close()
+        with _lock:
+            stats.retries += 1
+        time.sleep(delay)
+
+def get(provider: str, url: str, **kwargs: Any) -> requests.Response:
+    return request(provider, "GET", url, **kwargs)
+
+def post(provider: str, url: str, **kwargs: Any) -> requests.Response:
+    return request(provider, "POST", url, **kwargs)
+
+def _record(stats: _ProviderStats, latency: float, failed: bool) -> None:
+    with _lock:
+        stats.requests += 1
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        if failed:
+            stats.failures += 1
+
+def _connection_counts(session: requests.Session) -> Tuple[int, int]:
+    """Return (connections opened, requests sent) across the session's pools."""
+    opened = sent = 0
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            opened += getattr(pool, "num_connections", 0)
+            sent += getattr(pool, "num_requests", 0)
+    return opened, sent
+
+def get_http_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get per-provider HTTP statistics for this process.
+
+    Returns:
+        Dictionary keyed by provider with requests, failures, retries,
+        connections opened, connections reused, reuse_rate, and average and
+        maximum latency in seconds.
+    """
+    result = {}
+    with _lock:
+        items = list(_sessions.items())
+    for provider, session in items:
+        opened, sent = _connection_counts(session)
+        with _lock:
+            stats = _stats[provider]
+            reused = max(0, sent - opened)
+            result[provider] = {
+                'requests': stats.requests,
+                'failures': stats.failures,
+                'retries': stats.retries,
+                'connections_opened': opened,
+                'connections_reused': reused,
+                'reuse_rate': (reused / sent) if sent else 0.0,
+                'avg_latency': (stats.total_latency / stats.requests) if stats.requests else 0.0,
+                'max_latency': stats.max_latency,
+            }
+    return result
+
+def close_sessions() -> None:
+    """Close all pooled sessions and their connections."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _stats.clear()
+    for session in sessions:
+        session.close()
+
+atexit.register(close_sessions)
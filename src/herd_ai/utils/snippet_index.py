@@ -0,0 +1,266 @@
+###############################################################################
+# herd_ai.utils.snippet_index
+#
+# Persistent inverted index over the snippet store.
+#
+# The index lives next to the snippets in <snippets_dir>/snippet_index.sqlite3
+# and is kept up to date by the code that writes snippets (process_snippets,
+# import_snippet) rather than by rescanning the store. It is an SQLite FTS5
+# table with one column per searchable field (code tokens, tags, category,
+# language, imports); queries are ranked with FTS5's BM25, weighted towards
+# the metadata fields, and a trailing '*' turns a term into a prefix query.
+#
+# Code is indexed as identifiers: each identifier is stored whole and split on
+# underscores and camelCase boundaries, so "getUserName" is found by
+# "getusername", "user" or "get*".
+###############################################################################
+"""Ranked, prefix-capable full-text search over stored code snippets."""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "snippet_index.sqlite3"
+
+# BM25 weight per FTS column, in table order (hash is unindexed).
+FIELD_WEIGHTS = {
+    "hash": 0.0,
+    "body": 1.0,
+    "tags": 3.0,
+    "category": 2.0,
+    "language": 2.0,
+    "imports": 2.5,
+}
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+def code_tokens(text: str) -> List[str]:
+    """
+    Lowercased index terms for a piece of code: every identifier, followed by
+    its underscore and camelCase parts when it has more than one.
+    """
+    tokens = []
+    for match in _IDENTIFIER_RE.finditer(text):
+        word = match.group(0)
+        tokens.append(word.lower())
+        parts = [p.lower() for piece in word.split("_") for p in _CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+def _fts_query(query: str, conjunction: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for a user query: each whitespace-separated word is
+    quoted (so punctuation cannot inject FTS syntax), a trailing '*' makes it
+    a prefix term, and words are joined with AND or OR.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").lower()
+        if not re.search(r"[a-z0-9_]", word):
+            continue
+        term = '"' + word.replace('"', '""') + '"'
+        terms.append(term + "*" if prefix else term)
+    if not terms:
+        return None
+    return f" {conjunction} ".join(terms)
+
+class SnippetIndex:
+    """
+    Inverted index for one snippet directory.
+
+    Use get_snippet_index() to share one instance per directory within a
+    process. If the index file cannot be created, the index is kept in memory
+    for the life of the instance.
+    """
+
+    def __init__(self, snippets_dir: Union[str, Path], index_path: Optional[Union[str, Path]] = None):
+        self.root = Path(snippets_dir).resolve()
+        self.path = Path(index_path) if index_path else self.root / INDEX_FILE_NAME
+        self._lock = threading.RLock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Snippet index unavailable at {self.path} ({e}); keeping it in memory")
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snippets (
+                rowid INTEGER PRIMARY KEY,
+                hash TEXT UNIQUE NOT NULL,
+                source TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snippets_source ON snippets(source);
+            CREATE VIRTUAL TABLE IF NOT EXISTS snippet_terms USING fts5(
+                hash UNINDEXED, body, tags, category, language, imports,
+                content='',
+                tokenize="unicode61 remove_diacritics 2 tokenchars '_:-'",
+                prefix='2 3'
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        self._conn.commit()
+        self._weights = ", ".join(str(w) for w in FIELD_WEIGHTS.values())
+
+    @property
+    def seeded(self) -> bool:
+        """True once the index has been populated from the store at least once."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'seeded'").fetchone()
+            return row is not None
+
+    def mark_seeded(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('seeded', '1')")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+
+    def _delete_rows(self, rows: Iterable[tuple]) -> None:
+        # Contentless FTS tables need the original values to delete a row.
+        for rowid, data in rows:
+            snippet = json.loads(data)
+            self._conn.execute(
+                "INSERT INTO snippet_terms(snippet_terms, rowid, hash, body, tags, category, language, imports) "
+                "VALUES ('delete', ?, ?, ?, ?, ?, ?, ?)",
+                (rowid, *self._fields(snippet, snippet.get("_imports", ()))),
+            )
+            self._conn.execute("DELETE FROM snippets WHERE rowid = ?", (rowid,))
+
+    @staticmethod
+    def _fields(snippet: Dict[str, Any], imports: Iterable[str]) -> tuple:
+        return (
+            snippet["hash"],
+            " ".join(code_tokens(snippet.get("content", ""))),
+            " ".join(str(t).lower() for t in snippet.get("tags", [])),
+            str(snippet.get("category") or "").lower(),
+            str(snippet.get("language") or "").lower(),
+            " ".join(sorted(str(i).lower() for i in imports)),
+        )
+
+    def add(self, snippet: Dict[str, Any], source: Optional[str] = None, imports: Iterable[str] = ()) -> None:
+        """Index one snippet dictionary (CodeSnippet.to_dict()), replacing any entry with the same hash."""
+        self.add_many([snippet], source, {snippet["hash"]: imports})
+
+    def add_many(
+        self,
+        snippets: List[Dict[str, Any]],
+        source: Optional[str] = None,
+        imports: Optional[Dict[str, Iterable[str]]] = None,
+        replace_source: bool = False
+    ) -> int:
+        """
+        Index several snippets in one transaction.
+
+        Args:
+            snippets: Snippet dictionaries; each needs at least hash and content.
+            source: Source file the snippets were extracted from, if any.
+            imports: Imported module names keyed by snippet hash.
+            replace_source: First drop every snippet previously indexed for
+                `source`, so re-extracting a file removes stale snippets.
+
+        Returns:
+            Number of snippets indexed.
+        """
+        imports = imports or {}
+        with self._lock, self._conn:
+            if replace_source and source is not None:
+                self._delete_rows(self._conn.execute(
+                    "SELECT rowid, data FROM snippets WHERE source = ?", (source,)
+                ).fetchall())
+            for snippet in snippets:
+                self._delete_rows(self._conn.execute(
+                    "SELECT rowid, data FROM snippets WHERE hash = ?", (snippet["hash"],)
+                ).fetchall())
+                snippet_imports = sorted(set(imports.get(snippet["hash"], ())))
+                stored = dict(snippet, _imports=snippet_imports)
+                cursor = self._conn.execute(
+                    "INSERT INTO snippets(hash, source, data) VALUES (?, ?, ?)",
+                    (snippet["hash"], source, json.dumps(stored)),
+                )
+                self._conn.execute(
+                    "INSERT INTO snippet_terms(rowid, hash, body, tags, category, language, imports) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cursor.lastrowid, *self._fields(snippet, snippet_imports)),
+                )
+        return len(snippets)
+
+    def remove(self, snippet_hash: str) -> bool:
+        """Drop a snippet from the index. Returns True if it was present."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT rowid, data FROM snippets WHERE hash = ?", (snippet_hash,)
+            ).fetchall()
+            self._delete_rows(rows)
+            return bool(rows)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranked search. Snippets containing every query term come first; if
+        there are fewer than `limit` of those, snippets matching any term fill
+        the remaining places. Each result is the stored snippet dictionary
+        with a "score" key (higher is better).
+        """
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        with self._lock:
+            for conjunction in ("AND", "OR"):
+                expression = _fts_query(query, conjunction)
+                if expression is None or len(results) >= limit:
+                    break
+                try:
+                    # Rank inside the FTS table first so only the top rows are joined
+                    rows = self._conn.execute(
+                        "SELECT s.rowid, s.data, ranked.score FROM ("
+                        f"SELECT rowid, bm25(snippet_terms, {self._weights}) AS score "
+                        "FROM snippet_terms WHERE snippet_terms MATCH ? ORDER BY score LIMIT ?"
+                        ") ranked JOIN snippets s ON s.rowid = ranked.rowid ORDER BY ranked.score",
+                        (expression, limit + len(seen)),
+                    ).fetchall()
+                except sqlite3.OperationalError as e:
+                    logger.debug(f"Snippet index query {expression!r} failed: {e}")
+                    break
+                for rowid, data, rank in rows:
+                    if rowid in seen:
+                        continue
+                    seen.add(rowid)
+                    snippet = json.loads(data)
+                    snippet.pop("_imports", None)
+                    snippet["score"] = -rank
+                    results.append(snippet)
+                    if len(results) >= limit:
+                        break
+                if len(query.split()) < 2:
+                    break
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_indexes: Dict[Path, SnippetIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_snippet_index(snippets_dir: Union[str, Path]) -> SnippetIndex:
+    """Shared SnippetIndex for a snippet directory."""
+    root = Path(snippets_dir).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = SnippetIndex(root)
+            _indexes[root] = index
+        return index
@@ -53,6 +53,11 @@ try:
 except ImportError:
     herd_config = None
 
+try:
+    from herd_ai.utils import sessions
+except ImportError:
+    import utils.sessions as sessions
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -140,11 +145,14 @@ def send_prompt_to_xai(
             logger.debug(f"Content length: {len(description)}")
             start_time = time.time()
             try:
-                resp = requests.post(
+                # Retries are handled by the loop above; the session only pools connections
+                resp = sessions.post(
+                    "xai",
                     f"{XAI_API_URL}/chat/completions",
                     headers=headers,
                     json=payload,
-                    timeout=timeout
+                    timeout=timeout,
+                    retries=0
                 )
                 logger.debug(f"Response status code: {resp.status_code}")
             except requests.exceptions.ConnectionError as e:
@@ -155,8 +163,8 @@ def send_prompt_to_xai(
                 error_text = resp.text if len(resp.text) < 500 else f"{resp.text[:500]}..."
                 logger.error(f"X.AI HTTP error: {resp.status_code} - {error_text}")
                 if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = sessions.backoff_delay(attempt)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
                     continue
                 return None
@@ -186,8 +194,8 @@ def send_prompt_to_xai(
         except requests.RequestException as e:
             logger.error(f"X.AI request error (attempt {attempt+1}/{max_retries+1}): {e}")
             if attempt < max_retries:
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
+                wait_time = sessions.backoff_delay(attempt)
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
             else:
                 return None
@@ -206,6 +214,7 @@ def send_prompt_to_xai(
 #   prompt (str): Prompt to guide the model's image analysis (default: IMAGE_ALT_TEXT_TEMPLATE).
 #   max_retries (int): Maximum number of retry attempts (default: 2).
 #   timeout (int): Timeout in seconds for the request (default: 90).
+#   base64_image (str): Pre-encoded JPEG payload; when given the file is not re-read.
 #
 # Returns:
 #   dict | None: Dictionary with image description data, or None if an error occurred.
@@ -218,7 +227,8 @@ def send_image_to_xai(
     model: str = XAI_IMAGE_MODEL,
     prompt: str = IMAGE_ALT_TEXT_TEMPLATE,
     max_retries: int = 2,
-    timeout: int = 90
+    timeout: int = 90,
+    base64_image: Optional[str] = None
 ) -> Optional[Dict]:
     api_key = get_xai_api_key()
     if not api_key:
@@ -226,18 +236,21 @@ def send_image_to_xai(
         return None
 
     MAX_FILE_SIZE_MB = 20
-    file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
-        logger.error(f"Image too large ({file_size_mb:.1f} MB > {MAX_FILE_SIZE_MB} MB): {image_path}")
-        return None
+    if base64_image is None:
+        file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
+        if file_size_mb > MAX_FILE_SIZE_MB:
+            logger.error(f"Image too large ({file_size_mb:.1f} MB > {MAX_FILE_SIZE_MB} MB): {image_path}")
+            return None
+        # Encode once; retries resend the same payload
+        base64_image = encode_image(image_path)
+        if not base64_image:
+            logger.error(f"Failed to encode image: {image_path}")
+            return None
+    else:
+        file_size_mb = len(base64_image) * 3 / 4 / (1024 * 1024)
 
     for attempt in range(max_retries + 1):
         try:
-            base64_image = encode_image(image_path)
-            if not base64_image:
-                logger.error(f"Failed to encode image: {image_path}")
-                return None
-
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {api_key}"
@@ -271,11 +284,14 @@ def send_image_to_xai(
             logger.info(f"Image size: {file_size_mb:.2f} MB, Base64 length: {len(base64_image[:20])}...{len(base64_image)} chars")
             start_time = time.time()
             try:
-                resp = requests.post(
+                # Retries are handled by the loop above; the session only pools connections
+                resp = sessions.post(
+                    "xai",
                     f"{XAI_API_URL}/chat/completions",
                     headers=headers,
                     json=payload,
-                    timeout=timeout
+                    timeout=timeout,
+                    retries=0
                 )
                 logger.info(f"Response status code: {resp.status_code}")
             except requests.exceptions.ConnectionError as e:
@@ -296,8 +312,8 @@ def send_image_to_xai(
                     }
 
                 if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = sessions.backoff_delay(attempt)
+                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
                     time.sleep(wait_time)
                     continue
                 return None
@@ -336,8 +352,8 @@ def send_image_to_xai(
         except requests.RequestException as e:
             logger.error(f"X.AI image request error (attempt {attempt+1}/{max_retries+1}): {e}")
             if attempt < max_retries:
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
+                wait_time = sessions.backoff_delay(attempt)
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
             else:
                 return None
@@ -365,7 +381,7 @@ def validate_xai_api_key(api_key: str) -> bool:
         "Content-Type": "application/json"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = sessions.get("xai", url, headers=headers, timeout=10, retries=0)
         if resp.status_code == 200:
             return True
         else:
@@ -0,0 +1,94 @@
+"""
+Shared test setup: import herd_ai from src/ and keep its base and cache
+directories in a throwaway location instead of ~/.herd.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+# herd_ai.config reads these (and creates the directories) on import
+_BASE = tempfile.mkdtemp(prefix="herd-tests-")
+os.environ.setdefault("LLAMACLEANER_BASE_DIR", _BASE)
+os.environ.setdefault("LLAMACLEANER_CACHE_DIR", str(Path(_BASE) / "cache"))
+
+class CrossrefStandIn(ThreadingHTTPServer):
+    """
+    Local stand-in for the CrossRef works API. GET /works/<doi> answers 200
+    with a "message" for DOIs in `works`, 404 otherwise, after `delay`
+    seconds. Records the DOIs requested and the peak number of requests
+    handled at once.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _CrossrefHandler)
+        self.works = {}
+        self.delay = 0.0
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/works"
+
+    def reset(self):
+        with self.lock:
+            self.works, self.delay, self.requests, self.active, self.peak = {}, 0.0, [], 0, 0
+
+class _CrossrefHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        doi = unquote(self.path.split("/works/", 1)[-1]).lower()
+        with server.lock:
+            server.requests.append(doi)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.delay)
+            message = server.works.get(doi)
+            body = json.dumps({"status": "ok", "message": message} if message else {"status": "not found"})
+            self.send_response(200 if message else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="session")
+def _crossref_stand_in():
+    server = CrossrefStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def crossref_server(_crossref_stand_in, monkeypatch):
+    """The CrossRef stand-in, emptied, with herd_ai's DOI lookups pointed at it."""
+    from herd_ai.utils import crossref
+
+    _crossref_stand_in.reset()
+    monkeypatch.setattr(crossref, "CROSSREF_API_URL", _crossref_stand_in.url)
+    yield _crossref_stand_in
+    _crossref_stand_in.reset()
@@ -0,0 +1,98 @@
+"""Tests for citation deduplication."""
+
+import random
+
+from herd_ai import citations
+from herd_ai.citations import TITLE_SIMILARITY_THRESHOLD, dedupe_citations, title_shingles
+
+TITLE = "Deep learning for citation matching in scholarly archives"
+
+def record(raw, doi=None, title=TITLE):
+    citation = {"type": "reference", "style": "apa", "authors": "Smith, J.", "year": "2020",
+                "title": title, "raw": raw}
+    if doi:
+        citation["doi"] = doi
+    return citation
+
+def test_near_duplicates_are_merged():
+    merged = dedupe_citations([
+        record("Smith, J. (2020). Deep learning for citation matching in scholarly archives."),
+        record("Smith J (2020) Deep learning for citation matching in scholarly archives", doi="10.1/aaa"),
+    ])
+    assert len(merged) == 1
+    assert merged[0]["doi"] == "10.1/aaa"
+
+def test_different_dois_are_never_merged():
+    a = record("Smith, J. (2020). Deep learning for citation matching. A", doi="10.1/aaa")
+    c = record("Smith, J. (2020). Deep learning for citation matching. C", doi="10.1/ccc")
+    assert len(dedupe_citations([a, c])) == 2
+
+def test_record_without_doi_does_not_bridge_different_dois():
+    a = record("Smith, J. (2020). Deep learning for citation matching. A", doi="10.1/aaa")
+    b = record("Smith, J. (2020). Deep learning for citation matching. B")
+    c = record("Smith, J. (2020). Deep learning for citation matching. C", doi="10.1/ccc")
+    merged = dedupe_citations([a, b, c])
+    assert len(merged) == 2
+    assert sorted(m.get("doi") for m in merged) == ["10.1/aaa", "10.1/ccc"]
+
+def random_block(rng, n, vocab):
+    """n titled records in one (year, author) block, many of them edits of earlier titles."""
+    records = []
+    for i in range(n):
+        if records and rng.random() < 0.5:
+            words = rng.choice(records)["title"].split()
+            for _ in range(rng.randint(0, 2)):
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+        else:
+            words = rng.sample(vocab, rng.randint(4, 12))
+        records.append(record(f"raw {i}", title=" ".join(words)))
+    return records
+
+def similarity_components(records):
+    """Connected components of the title similarity graph, by comparing every pair."""
+    shingles = [title_shingles(r["title"]) for r in records]
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for a in range(len(records)):
+        for b in range(a + 1, len(records)):
+            union = len(shingles[a] | shingles[b])
+            if union and len(shingles[a] & shingles[b]) / union >= TITLE_SIMILARITY_THRESHOLD:
+                parent[find(b)] = find(a)
+    return {frozenset(r["raw"] for i, r in enumerate(records) if find(i) == root) for root in set(map(find, parent))}
+
+def test_candidate_pairs_miss_no_similar_titles():
+    rng = random.Random(7)
+    for _ in range(5):
+        records = random_block(rng, 300, [f"w{i}" for i in range(40)])
+        expected = similarity_components(records)
+        component = {raw: members for members in expected for raw in members}
+        merged = dedupe_citations(records)
+        assert len(merged) == len(expected)
+        assert {component[m["raw"]] for m in merged} == expected
+
+def test_large_block_compares_few_pairs(monkeypatch):
+    compared = []
+    candidate_pairs = citations._candidate_pairs
+
+    def counting(sets, threshold):
+        pairs = candidate_pairs(sets, threshold)
+        compared.append(len(pairs))
+        return pairs
+
+    monkeypatch.setattr(citations, "_candidate_pairs", counting)
+    rng = random.Random(3)
+    vocab = [f"word{i}" for i in range(20000)]
+    distinct = [" ".join(rng.sample(vocab, 10)) for _ in range(3000)]
+    # 3000 distinct titles, each cited twice more with different raw text,
+    # plus 2000 citations of one popular work, all in a single block
+    records = [record(f"raw {i} {k}", title=title) for k in range(3) for i, title in enumerate(distinct)]
+    records += [record(f"popular {i}") for i in range(2000)]
+
+    merged = dedupe_citations(records)
+    assert len(merged) == len(distinct) + 1
+    assert len(compared) == 1 and compared[0] < 10 * len(distinct)
@@ -0,0 +1,15 @@
+"""Tests for the incremental term-count matrix."""
+
+from herd_ai.utils.corpus import CorpusMatrix
+
+def test_vocabulary_follows_first_appearance(tmp_path):
+    words = [f"term{i}" for i in range(100)]
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(" ".join(words))
+
+    matrix = CorpusMatrix()
+    matrix.update(sorted(tmp_path.iterdir()))
+
+    # Every term ties, so ties are broken by term id, i.e. first appearance
+    assert matrix.vocab == words
+    assert [term for term, _ in matrix.top_terms(5)] == words[:5]
@@ -0,0 +1,62 @@
+"""Tests for cached, concurrent CrossRef DOI lookups against a local stand-in."""
+
+import time
+import uuid
+
+from herd_ai.utils import crossref
+
+def new_doi():
+    return f"10.5555/{uuid.uuid4().hex[:12]}"
+
+def test_found_doi_is_fetched_once_and_then_cached(crossref_server):
+    doi = new_doi()
+    crossref_server.works[doi] = {"DOI": doi, "title": ["A cached work"]}
+
+    first = crossref.fetch_many([doi, doi.upper(), f"https://doi.org/{doi}"])
+    assert crossref_server.requests == [doi]
+    assert first["stats"]["unique"] == 1
+    assert first["stats"]["fetched"] == 1
+    assert all(m["title"] == ["A cached work"] for m in first["results"].values())
+
+    second = crossref.fetch_many([doi])
+    assert crossref_server.requests == [doi]
+    assert second["stats"]["cached"] == 1
+    assert second["results"][doi]["DOI"] == doi
+
+def test_missing_doi_is_negatively_cached(crossref_server):
+    doi = new_doi()
+    first = crossref.fetch_many([doi])
+    assert first["results"][doi] is None
+    assert first["stats"]["missing"] == 1
+
+    second = crossref.fetch_many([doi])
+    assert second["stats"]["cached_missing"] == 1
+    assert crossref_server.requests == [doi]
+
+def test_negative_cache_entries_expire(crossref_server, monkeypatch):
+    doi = new_doi()
+    crossref.fetch_many([doi])
+    crossref_server.works[doi] = {"DOI": doi, "title": ["Registered later"]}
+
+    monkeypatch.setattr(crossref, "DOI_NEGATIVE_CACHE_DAYS", 0)
+    time.sleep(0.01)
+    again = crossref.fetch_many([doi])
+    assert crossref_server.requests == [doi, doi]
+    assert again["stats"]["fetched"] == 1
+    assert again["results"][doi]["title"] == ["Registered later"]
+
+def test_uncached_dois_are_fetched_concurrently(crossref_server):
+    dois = [new_doi() for _ in range(8)]
+    for doi in dois:
+        crossref_server.works[doi] = {"DOI": doi}
+    crossref_server.delay = 0.2
+
+    start = time.perf_counter()
+    result = crossref.fetch_many(dois + dois[:3], workers=4)
+    elapsed = time.perf_counter() - start
+
+    assert result["stats"]["fetched"] == 8
+    assert sorted(crossref_server.requests) == sorted(dois)
+    assert crossref_server.peak > 1
+    assert elapsed < 8 * 0.2
+    assert all(result["results"][doi]["DOI"] == doi for doi in dois)
@@ -0,0 +1,36 @@
+"""Tests for text similarity grouping in the duplicate detector."""
+
+from pathlib import Path
+
+from herd_ai.utils.dedupe import DuplicateDetector
+
+ARTICLE = "\n".join(f"sentence number {i} talks about river deltas and sediment transport" for i in range(40))
+
+def detector(directory):
+    return DuplicateDetector(directory, recursive=False, use_hash_store=False)
+
+def test_empty_and_identical_files_stay_linear(tmp_path):
+    for i in range(300):
+        (tmp_path / f"empty{i}.txt").write_text("", encoding="utf-8")
+        (tmp_path / f"blank{i}.txt").write_text(" " * (i % 7) + "\n" * (i % 3), encoding="utf-8")
+    for i in range(50):
+        (tmp_path / f"copy{i}.txt").write_text(ARTICLE + " " * i, encoding="utf-8")
+    scanner = detector(tmp_path)
+    files = [scanner.text_processor.process(p) for p in sorted(tmp_path.iterdir())]
+    text_files = [f for f in files if not f.get('error')]
+    pairs = scanner._find_candidate_pairs(text_files)
+    # Empty files are skipped; the 50 copies share one shingle set
+    assert len(pairs) == 49
+
+def test_exact_duplicates_are_not_reported_as_similar(tmp_path):
+    for i in range(5):
+        (tmp_path / f"empty{i}.txt").write_text("", encoding="utf-8")
+        (tmp_path / f"same{i}.txt").write_text(ARTICLE, encoding="utf-8")
+    (tmp_path / "edited.txt").write_text(ARTICLE.replace("number 3 ", "number three "), encoding="utf-8")
+    results = detector(tmp_path).scan_directory()
+    assert len(results["exact_duplicates"]) == 2
+    similar = results["similar_text_groups"]
+    assert len(similar) == 1
+    names = sorted(Path(p).name for p in similar[0]["files"])
+    assert len(names) == 2
+    assert names[0] == "edited.txt" and names[1].startswith("same")
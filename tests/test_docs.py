@@ -0,0 +1,29 @@
+"""Tests for README generation with cached map-reduce summaries."""
+
+import uuid
+
+import herd_ai.docs as docs
+
+def test_unchanged_tree_makes_no_requests(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_process_with_ai(path, prompt, provider=None, custom_system_prompt=None, use_cache=True):
+        calls.append(prompt)
+        return f"Summary {len(calls)}"
+
+    monkeypatch.setattr(docs, "process_with_ai", fake_process_with_ai)
+    marker = uuid.uuid4().hex  # keeps summaries cached by other tests out of this tree
+    (tmp_path / "app.py").write_text(f"def main():\n    return '{marker}'\n", encoding="utf-8")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "util.py").write_text(f"VALUE = '{marker}'\n", encoding="utf-8")
+
+    first = docs.generate_docs(tmp_path, recursive=True, provider="ollama", log_callback=lambda msg: None)
+    assert first["success"]
+    assert calls
+    assert (tmp_path / "README.md").exists()
+
+    calls.clear()
+    second = docs.generate_docs(tmp_path, recursive=True, provider="ollama", log_callback=lambda msg: None)
+    assert second["success"]
+    assert calls == []
+    assert second["readme_cached"]
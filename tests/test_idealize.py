@@ -0,0 +1,69 @@
+"""Tests for splitting long documents and idealizing them piece by piece."""
+
+import random
+import threading
+import uuid
+from pathlib import Path
+
+import pytest
+
+from herd_ai import idealize
+from herd_ai.idealize import idealize_text, split_sections
+
+def random_document(rng, paragraphs):
+    parts = []
+    for i in range(paragraphs):
+        if rng.random() < 0.2:
+            parts.append(f"## Heading {i}")
+        words = " ".join(rng.choice(["alpha", "beta", "gamma", "delta"]) for _ in range(rng.randint(1, 120)))
+        parts.append(words.replace(" delta ", "\n", 2))
+    text = ""
+    for part in parts:
+        text += part + "\n" * rng.randint(1, 4) + " " * rng.randint(0, 2)
+    return "\n" * rng.randint(0, 6) + text
+
+def check_sections(text, max_chars):
+    pieces = split_sections(text, max_chars)
+    assert "".join(pieces) == text
+    assert all(len(piece) <= max_chars for piece in pieces)
+    assert all(piece.strip() for piece in pieces)
+    return pieces
+
+@pytest.mark.parametrize("seed", range(30))
+def test_split_sections_round_trips_within_limit(seed):
+    rng = random.Random(seed)
+    check_sections(random_document(rng, rng.randint(5, 80)), rng.choice([80, 200, 500, 2000]))
+
+def test_leading_blank_lines_stay_with_the_first_paragraph():
+    text = "\n\n\n" + "x" * 100 + "\n\nsecond paragraph\n"
+    pieces = check_sections(text, 100)
+    assert pieces[0].startswith("\n\n\nx")
+
+def test_short_text_is_one_piece():
+    assert split_sections("\n\nshort\n", 100) == ["\n\nshort\n"]
+
+def test_sections_are_cached_and_blank_text_is_never_sent(monkeypatch):
+    prompts = []
+    lock = threading.Lock()
+
+    def fake_ai(file_path, prompt, **kwargs):
+        body = prompt.split("```\n", 1)[1].rsplit("\n```", 1)[0]
+        with lock:
+            prompts.append(body)
+        return body.strip() and body.upper()
+
+    monkeypatch.setattr(idealize, "process_with_ai", fake_ai)
+    monkeypatch.setattr(idealize, "IDEALIZE_CHUNK_CHARS", 300)
+    marker = uuid.uuid4().hex
+    content = "\n\n\n" + f"{marker} " * 30 + "\n\n" + "\n\n".join(f"{marker} paragraph {i} " * 8 for i in range(12))
+
+    first = idealize_text(content, Path("notes.md"), "ollama", workers=4)
+    assert first["failed"] == 0
+    assert first["chunks"] == len(prompts) > 1
+    assert all(body.strip() for body in prompts)
+    assert marker.upper() in first["text"]
+
+    second = idealize_text(content, Path("notes.md"), "ollama", workers=4)
+    assert second["cached"] == second["chunks"] == first["chunks"]
+    assert second["text"] == first["text"]
+    assert len(prompts) == first["chunks"]
@@ -0,0 +1,36 @@
+"""Cold-start budgets from scripts/benchmark_import.py, checked under pytest."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "benchmark_import.py"
+_spec = importlib.util.spec_from_file_location("benchmark_import", SCRIPT)
+benchmark_import = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(benchmark_import)
+
+# Budgets are multiplied by this, for slow or busy machines
+SCALE = float(os.environ.get("HERD_IMPORT_BUDGET_SCALE", "1.0"))
+RUNS = 3
+
+@pytest.fixture(scope="module")
+def baseline():
+    return benchmark_import.importtime(["-c", "pass"])[1]
+
+@pytest.mark.parametrize(
+    "label, args, budget", benchmark_import.TARGETS, ids=[t[0] for t in benchmark_import.TARGETS]
+)
+def test_import_within_budget(label, args, budget, baseline):
+    total, counted, _ = benchmark_import.measure(args, baseline, RUNS)
+    heaviest = sorted(counted.items(), key=lambda item: -item[1])[:5]
+    assert total <= budget * SCALE, f"{label} took {total:.1f} ms (budget {budget * SCALE:.0f} ms); heaviest: {heaviest}"
+
+@pytest.mark.parametrize("label", list(benchmark_import.DEFERRED))
+def test_import_defers_heavy_modules(label, baseline):
+    args = next(args for name, args, _ in benchmark_import.TARGETS if name == label)
+    _, _, loaded = benchmark_import.measure(args, baseline, 1)
+    assert loaded, "python -X importtime produced no output"
+    eager = [name for name in benchmark_import.DEFERRED[label] if name in loaded]
+    assert not eager, f"{label} loaded " + ", ".join(eager)
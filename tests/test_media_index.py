@@ -0,0 +1,64 @@
+"""Tests for the persistent ffprobe metadata index, using a fake ffprobe."""
+
+import sys
+import textwrap
+
+import pytest
+
+from herd_ai.utils import media_index
+
+FAKE_FFPROBE = """\
+#!{python}
+import json, sys, time
+from pathlib import Path
+path = Path(sys.argv[-1])
+with open(path.parent / "calls.log", "a") as log:
+    log.write(path.name + "\\n")
+if "slow" in path.name and not (path.parent / "fast").exists():
+    time.sleep(5)
+if "bad" in path.name:
+    sys.exit(1)
+print(json.dumps({{"format": {{"duration": "61.5", "format_name": "mp4"}},
+                   "streams": [{{"codec_type": "audio", "codec_name": "aac"}}]}}))
+"""
+
+@pytest.fixture
+def media(tmp_path, monkeypatch):
+    ffprobe = tmp_path / "ffprobe"
+    ffprobe.write_text(textwrap.dedent(FAKE_FFPROBE.format(python=sys.executable)))
+    ffprobe.chmod(0o755)
+    monkeypatch.setattr(media_index, "FFPROBE_PATH", str(ffprobe))
+    monkeypatch.setattr(media_index, "MEDIA_PROBE_TIMEOUT", 0.5)
+    for name in ("good.mp4", "bad.mp4", "slow.mp4"):
+        (tmp_path / name).write_bytes(name.encode())
+    return tmp_path
+
+def calls(directory):
+    log = directory / "calls.log"
+    return sorted(log.read_text().split()) if log.exists() else []
+
+def test_unreadable_files_are_indexed_and_still_count_as_failed(media):
+    paths = [media / "good.mp4", media / "bad.mp4"]
+    first = media_index.probe_many(paths)
+    assert first["stats"]["probed"] == 2
+    assert first["stats"]["failed"] == 1
+    assert first["results"][paths[0]]["duration"] == 61.5
+
+    second = media_index.probe_many(paths)
+    assert calls(media) == ["bad.mp4", "good.mp4"]
+    assert second["stats"]["indexed"] == 2
+    assert second["stats"]["failed"] == 1
+    assert second["results"][paths[1]]["error"]
+
+def test_timed_out_probes_are_retried(media):
+    path = media / "slow.mp4"
+    first = media_index.probe_many([path])
+    assert first["results"][path]["error"] == "ffprobe timed out"
+    assert first["stats"]["failed"] == 1
+
+    (media / "fast").touch()
+    second = media_index.probe_many([path])
+    assert calls(media) == ["slow.mp4", "slow.mp4"]
+    assert second["stats"]["indexed"] == 0
+    assert second["stats"]["failed"] == 0
+    assert second["results"][path]["format_name"] == "mp4"
@@ -0,0 +1,36 @@
+"""Tests for snippet extraction and the credential scan that runs alongside it."""
+
+from herd_ai.snippets import extract_file_snippets, scan_for_api_credentials
+
+API_CLIENT = '''def fetch_user(name):
+    url = "https://api.github.com/users/" + name
+    response = requests.get(url)
+    return response.json()
+'''
+
+def test_credential_scan_handles_urls_without_subdomain():
+    creds = scan_for_api_credentials('fetch("https://api.github.com/users")')
+    assert "https://api.github.com/users" in creds["endpoints"]
+
+def test_api_url_does_not_cost_snippets(tmp_path):
+    source = tmp_path / "client.py"
+    source.write_text(API_CLIENT, encoding="utf-8")
+    result = extract_file_snippets(source)
+    assert result["error"] is None
+    assert result["creds_error"] is None
+    assert len(result["blocks"]) == 1
+    assert "https://api.github.com/users/" in result["api_creds"]["endpoints"]
+
+def test_failing_credential_scan_keeps_blocks(tmp_path, monkeypatch):
+    import herd_ai.snippets as snippets
+
+    def broken(content):
+        raise ValueError("scan failed")
+
+    monkeypatch.setattr(snippets, "scan_for_api_credentials", broken)
+    source = tmp_path / "client.py"
+    source.write_text(API_CLIENT, encoding="utf-8")
+    result = snippets.extract_file_snippets(source)
+    assert result["error"] is None
+    assert result["creds_error"] == "scan failed"
+    assert len(result["blocks"]) == 1